@@ -12,28 +12,61 @@ from pathlib import Path
 # Add the parent directory to the path so we can import the package
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from github_repo_analyzer import analyze_repository_simple
+from github_repo_analyzer import analyze_repository_simple, install_event_loop_policy
 from github_repo_analyzer.types import OutputFormat
 
 
+# Upper bound for each analysis so one stuck Claude call doesn't hold up the rest
+ANALYSIS_TIMEOUT = 120
+
+
 async def main():
     """Main function demonstrating the analyzer."""
     
     print("🚀 GitHub Repository Analyzer - Quick Start Example")
     print("=" * 60)
     
+    # The three analyses are independent, so run them concurrently
+    basic, focused, markdown = await asyncio.gather(
+        asyncio.wait_for(
+            analyze_repository_simple(
+                repo_owner="facebook",
+                repo_name="react",
+                max_stories=3,
+                output_format=OutputFormat.TEXT
+            ),
+            timeout=ANALYSIS_TIMEOUT
+        ),
+        asyncio.wait_for(
+            analyze_repository_simple(
+                repo_owner="microsoft",
+                repo_name="vscode",
+                focus_area="developer productivity",
+                max_stories=2,
+                output_format=OutputFormat.JSON
+            ),
+            timeout=ANALYSIS_TIMEOUT
+        ),
+        asyncio.wait_for(
+            analyze_repository_simple(
+                repo_owner="django",
+                repo_name="django",
+                max_stories=2,
+                output_format=OutputFormat.MARKDOWN
+            ),
+            timeout=ANALYSIS_TIMEOUT
+        ),
+        return_exceptions=True
+    )
+    
     # Example 1: Basic analysis
     print("\n📋 Example 1: Basic Repository Analysis")
     print("-" * 40)
     
-    try:
-        result = await analyze_repository_simple(
-            repo_owner="facebook",
-            repo_name="react",
-            max_stories=3,
-            output_format=OutputFormat.TEXT
-        )
-        
+    if isinstance(basic, BaseException):
+        print(f"❌ Analysis failed: {basic!r}")
+    else:
+        result = basic
         print(f"✅ Successfully analyzed {result.repository.full_name}")
         print(f"📊 Generated {len(result.user_stories)} user stories")
         print(f"🔧 Technology stack: {', '.join(result.tech_stack)}")
@@ -46,55 +79,40 @@ async def main():
             print(f"   Description: {story.description}")
             print(f"   Priority: {story.priority.value}")
             print(f"   Effort: {story.effort.value}")
-        
-    except Exception as e:
-        print(f"❌ Analysis failed: {e}")
     
     # Example 2: Focused analysis
     print("\n\n📋 Example 2: Focused Analysis")
     print("-" * 40)
     
-    try:
-        result = await analyze_repository_simple(
-            repo_owner="microsoft",
-            repo_name="vscode",
-            focus_area="developer productivity",
-            max_stories=2,
-            output_format=OutputFormat.JSON
-        )
-        
+    if isinstance(focused, BaseException):
+        print(f"❌ Analysis failed: {focused!r}")
+    else:
+        result = focused
         print(f"✅ Successfully analyzed {result.repository.full_name}")
         print(f"📊 Generated {len(result.user_stories)} user stories")
         print(f"🎯 Focus area: {result.focus_area}")
-        
-    except Exception as e:
-        print(f"❌ Analysis failed: {e}")
     
     # Example 3: Markdown output
     print("\n\n📋 Example 3: Markdown Output")
     print("-" * 40)
     
-    try:
-        result = await analyze_repository_simple(
-            repo_owner="django",
-            repo_name="django",
-            max_stories=2,
-            output_format=OutputFormat.MARKDOWN
-        )
-        
+    if isinstance(markdown, BaseException):
+        print(f"❌ Analysis failed: {markdown!r}")
+    else:
+        result = markdown
         print(f"✅ Successfully analyzed {result.repository.full_name}")
         print(f"📊 Generated {len(result.user_stories)} user stories")
-        print(f"📝 Output format: {result.output_format}")
-        
-        # Save to file
-        output_file = Path("django-user-stories.md")
-        from github_repo_analyzer.output_formatter import OutputFormatter
-        formatter = OutputFormatter(OutputFormat.MARKDOWN)
-        formatter.save_to_file(result, output_file)
-        print(f"💾 Results saved to: {output_file}")
+        print(f"📝 Output format: {OutputFormat.MARKDOWN.value}")
         
-    except Exception as e:
-        print(f"❌ Analysis failed: {e}")
+        try:
+            # Save to file
+            output_file = Path("django-user-stories.md")
+            from github_repo_analyzer.output_formatter import OutputFormatter
+            formatter = OutputFormatter(OutputFormat.MARKDOWN)
+            formatter.save_to_file(result, output_file)
+            print(f"💾 Results saved to: {output_file}")
+        except Exception as e:
+            print(f"❌ Saving failed: {e}")
     
     print("\n🎉 Quick start examples completed!")
     print("\n💡 Tips:")
@@ -104,4 +122,5 @@ async def main():
 
 
 if __name__ == "__main__":
+    install_event_loop_policy()
     asyncio.run(main())
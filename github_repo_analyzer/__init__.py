@@ -8,7 +8,28 @@ __version__ = "0.1.0"
 __author__ = "Your Name"
 __email__ = "your.email@example.com"
 
-from .analyzer import GitHubRepoAnalyzer
-from .cli import main
+__all__ = ["GitHubRepoAnalyzer", "analyze_repository_simple", "install_event_loop_policy", "main"]
 
-__all__ = ["GitHubRepoAnalyzer", "main"]
+# Public names are resolved on first access (PEP 562) so that importing the
+# package doesn't pull in the analyzer and CLI dependencies up front.
+_LAZY_ATTRS = {
+    "GitHubRepoAnalyzer": ".analyzer",
+    "analyze_repository_simple": ".analyzer",
+    "install_event_loop_policy": ".analyzer",
+    "main": ".cli",
+}
+
+
+def __getattr__(name):
+    if name in _LAZY_ATTRS:
+        import importlib
+        
+        module = importlib.import_module(_LAZY_ATTRS[name], __name__)
+        value = getattr(module, name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted(list(globals()) + __all__)
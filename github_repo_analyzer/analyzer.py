@@ -3,87 +3,247 @@ Main analyzer module that orchestrates the repository analysis process.
 """
 
 import asyncio
-from typing import Optional
+import dataclasses
+import functools
+import os
+from typing import Optional, Dict, Any
 from pathlib import Path
 
 from .types import (
     AnalyzerConfig, RepositoryInfo, AnalysisResult, OutputFormat,
     GitHubConfig, ClaudeConfig
 )
-from .github_client import GitHubClient
-from .web_researcher import WebResearcher
-from .claude_analyzer import ClaudeAnalyzer
-from .output_formatter import OutputFormatter
+from .cache import AnalysisCache, TTLCache
+from .rate_limiter import TokenBucket
 from .exceptions import (
-    GitHubRepoAnalyzerError, RepositoryNotFoundError, ClaudeAnalysisError,
-    WebResearchError, ConfigurationError
+    ClaudeAnalysisError, ConfigurationError, RateLimitError, FileOperationError
 )
 
 
+_OUTPUT_FORMATS = {output_format.value: output_format for output_format in OutputFormat}
+
+# Longest wait, in seconds, _call_github will sit out before retrying a
+# rate-limited call; anything longer fails straight away
+_MAX_RATE_LIMIT_WAIT = 60.0
+
+# Keys copied verbatim from the "github" and "claude" sections of a config file
+_GITHUB_CONFIG_KEYS = (
+    "token", "base_url", "timeout", "max_concurrent_requests", "max_retries",
+    "cache_dir", "cache_ttl", "reuse_session"
+)
+_CLAUDE_CONFIG_KEYS = ("system_prompt", "max_turns", "allowed_tools", "permission_mode")
+_ANALYZER_CONFIG_KEYS = ("max_stories", "focus_area", "include_metadata", "analysis_cache_dir")
+
+
+@functools.lru_cache(maxsize=8)
+def _load_config_data(config_path: str, mtime: float) -> Dict[str, Any]:
+    """Parse a YAML config file; cached until the file's mtime changes."""
+    import yaml
+    
+    # libyaml's C loader is much faster than the pure-Python one
+    loader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+    with open(config_path, 'r') as f:
+        return yaml.load(f, Loader=loader) or {}
+
+
 class GitHubRepoAnalyzer:
     """Main analyzer class that orchestrates the repository analysis process."""
     
+    # Shared across instances so repeated analyses of the same repository
+    # within a process skip the GitHub and web research round-trips.
+    # Repository entries are keyed on the GitHub host and token as well,
+    # so one analyzer never sees what another fetched with other credentials.
+    _repo_info_cache = TTLCache(maxsize=512, ttl=900)
+    _web_research_cache = TTLCache(maxsize=512, ttl=900)
+    
     def __init__(self, config: AnalyzerConfig):
+        # Imported here so that importing the package (e.g. for CLI --help)
+        # doesn't load requests and the Claude SDK up front
+        from .github_client import GitHubClient
+        from .web_researcher import WebResearcher
+        from .claude_analyzer import ClaudeAnalyzer
+        from .output_formatter import OutputFormatter
+        
         self.config = config
         self.github_client = GitHubClient(config.github)
         self.web_researcher = WebResearcher()
         self.claude_analyzer = ClaudeAnalyzer(config.claude)
         self.output_formatter = OutputFormatter(config.output_format)
+        self.analysis_cache = (
+            AnalysisCache(Path(config.analysis_cache_dir)) if config.analysis_cache_dir else None
+        )
+        self._github_semaphore = asyncio.Semaphore(config.github.max_concurrent_requests)
+        # GitHub allows 5000 requests/hour with a token and 60 without
+        requests_per_hour = 5000 if config.github.token else 60
+        self._github_bucket = TokenBucket(
+            rate=requests_per_hour / 3600, capacity=min(100, requests_per_hour)
+        )
     
     async def analyze_repository(self, repo_owner: str, repo_name: str) -> AnalysisResult:
-        """Analyze a GitHub repository and generate user stories."""
+        """Analyze a GitHub repository and generate user stories.
         
-        try:
-            # Step 1: Fetch repository information
-            repo_info = await self._fetch_repository_info(repo_owner, repo_name)
-            
-            # Step 2: Conduct web research for additional context
-            web_results = await self._conduct_web_research(repo_info)
-            
-            # Step 3: Analyze with Claude and generate user stories
-            analysis_result = await self._analyze_with_claude(repo_info, web_results)
-            
-            # Step 4: Save output if specified
-            if self.config.output_file:
-                await self._save_output(analysis_result)
-            
-            return analysis_result
-            
-        except Exception as e:
-            raise GitHubRepoAnalyzerError(f"Analysis failed: {e}")
+        Each step raises a GitHubRepoAnalyzerError subclass on failure, so
+        callers can tell e.g. a missing repository from a Claude failure.
+        """
+        
+        # Steps 1-2: Fetch repository information and conduct web research
+        repo_info, web_results = await self._fetch_repository_and_research(
+            repo_owner, repo_name
+        )
+
+        # Step 3: Analyze with Claude and generate user stories
+        analysis_result = await self._analyze_with_claude(repo_info, web_results)
+        
+        # Step 4: Save output if specified
+        if self.config.output_file:
+            await self._save_output(analysis_result)
+        
+        return analysis_result
+    
+    def _repo_cache_key(self, repo_owner: str, repo_name: str) -> tuple:
+        """Key for _repo_info_cache, scoped to this analyzer's GitHub host and token."""
+        github = self.config.github
+        return (github.base_url, github.token, repo_owner, repo_name)
     
     async def _fetch_repository_info(self, repo_owner: str, repo_name: str) -> RepositoryInfo:
         """Fetch repository information from GitHub."""
-        try:
-            repo_info = self.github_client.get_repository_info(repo_owner, repo_name)
-            return repo_info
-        except RepositoryNotFoundError:
-            raise
-        except Exception as e:
-            raise GitHubRepoAnalyzerError(f"Failed to fetch repository info: {e}")
+        cache_key = self._repo_cache_key(repo_owner, repo_name)
+        cached = self._repo_info_cache.get(cache_key)
+        if cached is not None:
+            return cached
+        
+        # GitHubClient already reports failures as GitHubAPIError subclasses
+        repo_info = await self._call_github(
+            self.github_client.get_repository_info, repo_owner, repo_name
+        )
+        self._repo_info_cache.set(cache_key, repo_info)
+        return repo_info
+    
+    async def _fetch_repository_and_research(
+        self,
+        repo_owner: str,
+        repo_name: str
+    ) -> tuple[RepositoryInfo, list]:
+        """Fetch repository information and conduct web research concurrently.
+        
+        Web research only needs the core metadata, so it starts as soon as
+        that arrives and overlaps with the README download. With a token,
+        metadata and README arrive together from a single GraphQL request.
+        """
+        cache_key = self._repo_cache_key(repo_owner, repo_name)
+        repo_info = self._repo_info_cache.get(cache_key)
+        if repo_info is None and self.github_client.uses_graphql:
+            repo_info = await self._fetch_repository_info(repo_owner, repo_name)
+        if repo_info is not None:
+            return repo_info, await self._conduct_web_research(repo_info)
+        
+        repo_info = await self._call_github(
+            self.github_client.get_repository_core, repo_owner, repo_name
+        )
+        readme_content, web_results = await asyncio.gather(
+            self._call_github(self.github_client.get_readme, repo_owner, repo_name),
+            self._conduct_web_research(repo_info)
+        )
+        repo_info.readme_content = readme_content
+        self._repo_info_cache.set(cache_key, repo_info)
+        return repo_info, web_results
+    
+    async def _fetch_repository_overview(
+        self,
+        repo_owner: str,
+        repo_name: str,
+        readme_bytes: int = 4096
+    ) -> tuple[RepositoryInfo, Optional[str]]:
+        """Fetch repository metadata and a README preview for display.
+        
+        Only the first readme_bytes of the README are downloaded, and both
+        requests run concurrently. The returned RepositoryInfo has no README.
+        """
+        cached = self._repo_info_cache.get(self._repo_cache_key(repo_owner, repo_name))
+        if cached is not None:
+            # Same shape as a fresh fetch: a README-less copy and a preview
+            readme_preview = None
+            if cached.readme_content is not None:
+                readme_preview = cached.readme_content.encode("utf-8")[:readme_bytes].decode(
+                    "utf-8", errors="ignore"
+                )
+            return dataclasses.replace(cached, readme_content=None), readme_preview
+        
+        repo_info, readme_preview = await asyncio.gather(
+            self._call_github(self.github_client.get_repository_core, repo_owner, repo_name),
+            self._call_github(
+                self.github_client.get_readme_preview, repo_owner, repo_name, readme_bytes
+            )
+        )
+        return repo_info, readme_preview
+    
+    async def _call_github(self, func, *args):
+        """Run a blocking GitHub client call under the concurrency and rate limits.
+        
+        Calls rejected by a secondary rate limit are retried, up to
+        config.github.max_retries times, after the wait GitHub asked for or
+        with exponential backoff if it didn't say. An exhausted primary quota
+        only resets up to an hour later, so that fails immediately.
+        """
+        delay = 1.0
+        for attempt in range(self.config.github.max_retries + 1):
+            async with self._github_semaphore:
+                await self._github_bucket.acquire()
+                try:
+                    return await asyncio.to_thread(func, *args)
+                except RateLimitError as e:
+                    wait = delay if e.retry_after is None else e.retry_after
+                    if (
+                        e.exhausted
+                        or wait > _MAX_RATE_LIMIT_WAIT
+                        or attempt == self.config.github.max_retries
+                    ):
+                        raise
+            await asyncio.sleep(wait)
+            delay *= 2
     
     async def _conduct_web_research(self, repo_info: RepositoryInfo) -> list:
         """Conduct web research for additional context."""
-        try:
-            web_results = self.web_researcher.research_repository_context(
-                repo_name=repo_info.name,
-                description=repo_info.description or "",
-                topics=repo_info.topics,
-                language=repo_info.language
-            )
-            return web_results
-        except Exception as e:
-            # Web research is not critical, so we log the error but continue
-            if self.config.verbose:
-                print(f"Warning: Web research failed: {e}")
-            return []
+        cache_key = (
+            repo_info.name,
+            repo_info.description or "",
+            tuple(repo_info.topics),
+            repo_info.language
+        )
+        cached = self._web_research_cache.get(cache_key)
+        if cached is not None:
+            return cached
+        
+        # WebResearcher handles its own search failures and returns whatever
+        # results it could gather, possibly none
+        web_results = await asyncio.to_thread(
+            self.web_researcher.research_repository_context,
+            repo_name=repo_info.name,
+            description=repo_info.description or "",
+            topics=repo_info.topics,
+            language=repo_info.language
+        )
+        self._web_research_cache.set(cache_key, web_results)
+        return web_results
     
     async def _analyze_with_claude(
         self,
         repo_info: RepositoryInfo,
         web_results: list
     ) -> AnalysisResult:
-        """Analyze the repository with Claude and generate user stories."""
+        """Analyze the repository with Claude and generate user stories.
+        
+        With an analysis cache, an unchanged repository analyzed with the
+        same settings is served from disk instead of querying Claude.
+        """
+        cache_key = None
+        if self.analysis_cache is not None:
+            cache_key = AnalysisCache.key(repo_info, self.config)
+            if cache_key is not None:
+                cached = self.analysis_cache.get(cache_key, repo_info)
+                if cached is not None:
+                    return cached
+        
         try:
             analysis_result = await self.claude_analyzer.analyze_repository(
                 repo_info=repo_info,
@@ -91,16 +251,22 @@ class GitHubRepoAnalyzer:
                 focus_area=self.config.focus_area,
                 max_stories=self.config.max_stories
             )
-            return analysis_result
         except Exception as e:
             raise ClaudeAnalysisError(f"Claude analysis failed: {e}")
+        
+        # Fallback stories are a stand-in for a failed query, not a result
+        if cache_key is not None and not analysis_result.metadata.get("fallback_stories"):
+            self.analysis_cache.set(cache_key, analysis_result)
+        return analysis_result
     
     async def _save_output(self, analysis_result: AnalysisResult) -> None:
         """Save the analysis result to the specified output file."""
         try:
-            self.output_formatter.save_to_file(analysis_result, self.config.output_file)
-        except Exception as e:
-            raise GitHubRepoAnalyzerError(f"Failed to save output: {e}")
+            await self.output_formatter.save_to_file_async(
+                analysis_result, self.config.output_file
+            )
+        except OSError as e:
+            raise FileOperationError(f"Failed to save output: {e}")
     
     def get_output_content(self, analysis_result: AnalysisResult) -> str:
         """Get the formatted output content without saving to file."""
@@ -124,8 +290,6 @@ class AnalyzerFactory:
     @staticmethod
     def create_from_env() -> AnalyzerConfig:
         """Create configuration from environment variables."""
-        import os
-        
         config = AnalyzerConfig()
         
         # GitHub configuration
@@ -137,11 +301,11 @@ class AnalyzerFactory:
             config.claude.system_prompt = os.getenv("CLAUDE_SYSTEM_PROMPT")
         
         # Output configuration
-        if os.getenv("OUTPUT_FORMAT"):
-            try:
-                config.output_format = OutputFormat(os.getenv("OUTPUT_FORMAT").lower())
-            except ValueError:
-                pass
+        output_format = os.getenv("OUTPUT_FORMAT")
+        if output_format:
+            config.output_format = _OUTPUT_FORMATS.get(
+                output_format.lower(), config.output_format
+            )
         
         return config
     
@@ -149,47 +313,33 @@ class AnalyzerFactory:
     def create_from_file(config_path: Path) -> AnalyzerConfig:
         """Create configuration from a YAML file."""
         try:
-            import yaml
-            
-            with open(config_path, 'r') as f:
-                config_data = yaml.safe_load(f)
+            config_data = _load_config_data(str(config_path), os.path.getmtime(config_path))
             
             config = AnalyzerConfig()
             
             # Parse GitHub config
-            if "github" in config_data:
-                github_data = config_data["github"]
-                if "token" in github_data:
-                    config.github.token = github_data["token"]
-                if "base_url" in github_data:
-                    config.github.base_url = github_data["base_url"]
-                if "timeout" in github_data:
-                    config.github.timeout = github_data["timeout"]
+            github_data = config_data.get("github") or {}
+            for key in _GITHUB_CONFIG_KEYS:
+                if key in github_data:
+                    setattr(config.github, key, github_data[key])
             
             # Parse Claude config
-            if "claude" in config_data:
-                claude_data = config_data["claude"]
-                if "system_prompt" in claude_data:
-                    config.claude.system_prompt = claude_data["system_prompt"]
-                if "max_turns" in claude_data:
-                    config.claude.max_turns = claude_data["max_turns"]
-                if "allowed_tools" in claude_data:
-                    config.claude.allowed_tools = claude_data["allowed_tools"]
-                if "permission_mode" in claude_data:
-                    config.claude.permission_mode = claude_data["permission_mode"]
+            claude_data = config_data.get("claude") or {}
+            for key in _CLAUDE_CONFIG_KEYS:
+                if key in claude_data:
+                    setattr(config.claude, key, claude_data[key])
+            if "allowed_tools" in claude_data:
+                # The parsed data is cached, so don't share its list
+                config.claude.allowed_tools = list(claude_data["allowed_tools"])
             
             # Parse analyzer config
-            if "max_stories" in config_data:
-                config.max_stories = config_data["max_stories"]
-            if "focus_area" in config_data:
-                config.focus_area = config_data["focus_area"]
+            for key in _ANALYZER_CONFIG_KEYS:
+                if key in config_data:
+                    setattr(config, key, config_data[key])
             if "output_format" in config_data:
-                try:
-                    config.output_format = OutputFormat(config_data["output_format"].lower())
-                except ValueError:
-                    pass
-            if "include_metadata" in config_data:
-                config.include_metadata = config_data["include_metadata"]
+                config.output_format = _OUTPUT_FORMATS.get(
+                    config_data["output_format"].lower(), config.output_format
+                )
             
             return config
             
@@ -202,6 +352,22 @@ class AnalyzerFactory:
         return AnalyzerConfig()
 
 
+def install_event_loop_policy() -> bool:
+    """Use uvloop for new event loops when it is installed.
+    
+    The analyzer is dominated by network I/O, which uvloop handles with
+    fewer syscalls than the default asyncio loop. Call this before
+    asyncio.run(). Returns True if uvloop was installed.
+    """
+    try:
+        import uvloop
+    except ImportError:
+        return False
+    
+    asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+    return True
+
+
 async def analyze_repository_simple(
     repo_owner: str,
     repo_name: str,
@@ -0,0 +1,183 @@
+"""
+In-memory and on-disk caching utilities for the GitHub Repository Analyzer.
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+import time
+from collections import OrderedDict
+from dataclasses import asdict
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Hashable, Optional
+
+from .types import (
+    AnalysisResult, AnalyzerConfig, RepositoryInfo, UserStory, AcceptanceCriterion,
+    StoryPriority, StoryEffort
+)
+
+
+# Root of the analyzer's on-disk caches
+CACHE_ROOT = Path(os.environ.get("XDG_CACHE_HOME", "~/.cache")).expanduser() / "gh-repo-analyzer"
+DEFAULT_ANALYSIS_CACHE_DIR = CACHE_ROOT / "results"
+
+
+def write_private_file(path: Path, data: bytes) -> None:
+    """Atomically replace path with data, readable only by the current user.
+    
+    Cached entries may come from private repositories, so the directory is
+    created with mode 0o700 and the file with 0o600. The data goes to a
+    uniquely named temporary file that is moved into place with os.replace,
+    so readers never see a partial entry.
+    """
+    path.parent.mkdir(mode=0o700, parents=True, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=f".{path.stem}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
+class TTLCache:
+    """A small LRU cache whose entries expire after a fixed time-to-live."""
+
+    def __init__(self, maxsize: int = 512, ttl: float = 900.0):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: "OrderedDict[Hashable, tuple[float, Any]]" = OrderedDict()
+
+    def get(self, key: Hashable, default: Optional[Any] = None) -> Any:
+        """Return the cached value for key, or default if missing or expired."""
+        entry = self._data.get(key)
+        if entry is None:
+            return default
+
+        expires_at, value = entry
+        if expires_at < time.monotonic():
+            del self._data[key]
+            return default
+
+        self._data.move_to_end(key)
+        return value
+
+    def set(self, key: Hashable, value: Any) -> None:
+        """Store value under key, evicting the least recently used entry if full."""
+        self._data[key] = (time.monotonic() + self.ttl, value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def clear(self) -> None:
+        """Remove all entries from the cache."""
+        self._data.clear()
+
+    def __contains__(self, key: Hashable) -> bool:
+        return self.get(key, _MISSING) is not _MISSING
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+_MISSING = object()
+
+
+class AnalysisCache:
+    """On-disk cache of Claude analysis results.
+    
+    Results are keyed by repository revision and the settings that shape
+    the analysis, so a repository is only re-analyzed after it changes or
+    the settings do. Only the Claude-derived fields are stored; repository
+    information always comes from the current fetch.
+    """
+    
+    def __init__(self, cache_dir: Path):
+        self.cache_dir = Path(cache_dir)
+    
+    @staticmethod
+    def key(repo_info: RepositoryInfo, config: AnalyzerConfig) -> Optional[str]:
+        """Build the cache key, or None if the repository revision is unknown."""
+        if not repo_info.revision:
+            return None
+        
+        claude = asdict(config.claude)
+        # How many analyses run at once has no effect on their results
+        del claude["max_concurrent_analyses"]
+        settings = json.dumps(
+            [repo_info.revision, config.focus_area, config.max_stories, claude],
+            sort_keys=True
+        )
+        digest = hashlib.blake2b(settings.encode("utf-8"), digest_size=8).hexdigest()
+        return f"{repo_info.owner}_{repo_info.name}_{digest}"
+    
+    def get(self, key: str, repo_info: RepositoryInfo) -> Optional[AnalysisResult]:
+        """Return the cached result for key, attached to repo_info, or None."""
+        try:
+            with open(self.cache_dir / f"{key}.json", "r", encoding="utf-8") as f:
+                data = json.load(f)
+            return _result_from_dict(data, repo_info)
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+    
+    def set(self, key: str, result: AnalysisResult) -> None:
+        """Store a result under key; failures are ignored."""
+        data = json.dumps(_result_to_dict(result)).encode("utf-8")
+        try:
+            write_private_file(self.cache_dir / f"{key}.json", data)
+        except OSError:
+            pass
+
+
+def _result_to_dict(result: AnalysisResult) -> Dict[str, Any]:
+    """Serialize the Claude-derived fields of a result."""
+    return {
+        "analysis_date": result.analysis_date.isoformat(),
+        "focus_area": result.focus_area,
+        "tech_stack": result.tech_stack,
+        "key_features": result.key_features,
+        "target_users": result.target_users,
+        "user_stories": [
+            {
+                "id": story.id,
+                "title": story.title,
+                "description": story.description,
+                "acceptance_criteria": [c.description for c in story.acceptance_criteria],
+                "priority": story.priority.value,
+                "effort": story.effort.value,
+                "tags": story.tags
+            }
+            for story in result.user_stories
+        ]
+    }
+
+
+def _result_from_dict(data: Dict[str, Any], repo_info: RepositoryInfo) -> AnalysisResult:
+    """Rebuild a result serialized by _result_to_dict."""
+    return AnalysisResult(
+        repository=repo_info,
+        user_stories=[
+            UserStory(
+                id=story["id"],
+                title=story["title"],
+                description=story["description"],
+                acceptance_criteria=list(map(AcceptanceCriterion, story["acceptance_criteria"])),
+                priority=StoryPriority(story["priority"]),
+                effort=StoryEffort(story["effort"]),
+                tags=story["tags"]
+            )
+            for story in data["user_stories"]
+        ],
+        analysis_date=datetime.fromisoformat(data["analysis_date"]),
+        focus_area=data["focus_area"],
+        tech_stack=data["tech_stack"],
+        key_features=data["key_features"],
+        target_users=data["target_users"],
+        metadata={"cached": True}
+    )
@@ -2,26 +2,208 @@
 Claude Code SDK integration for analyzing repositories and generating user stories.
 """
 
+import functools
 import json
-import anyio
-from typing import List, Optional, Dict, Any
+import re
+from typing import TYPE_CHECKING, List, Optional, Dict, Any
 from pathlib import Path
 from datetime import datetime
 
-from claude_code_sdk import query, ClaudeCodeOptions, AssistantMessage, TextBlock, ToolUseBlock, ToolResultBlock
-from claude_code_sdk.types import Message
-
 from .types import (
     RepositoryInfo, UserStory, AcceptanceCriterion, StoryPriority, StoryEffort,
     AnalysisResult, ClaudeConfig, WebSearchResult
 )
 
+if TYPE_CHECKING:
+    from claude_code_sdk import ClaudeCodeOptions
+
+try:
+    import orjson
+    _json_loads = orjson.loads
+    _JSON_DECODE_ERRORS = (orjson.JSONDecodeError, ValueError)
+except ImportError:
+    _json_loads = json.loads
+    _JSON_DECODE_ERRORS = (json.JSONDecodeError, ValueError)
+
+# Case-insensitive lookups for the enum values Claude returns
+_PRIORITY_MAP = {priority.value.lower(): priority for priority in StoryPriority}
+_EFFORT_MAP = {effort.value.lower(): effort for effort in StoryEffort}
+
+# Story tags that are reported as part of the technology stack
+_TECH_TAGS = frozenset({"api", "database", "frontend", "backend", "mobile", "web"})
+
+# Text between "As a" and the next comma names the story's user
+_USER_TYPE_RE = re.compile(r"As a([^,]*)")
+
+# README lines that carry no product context: badges, images, raw HTML
+# layout tags and link reference definitions
+_README_BOILERPLATE_RE = re.compile(
+    r"^\s*(?:\[?!\[|</?(?:p|div|img|a|br|hr|picture|source|h\d)\b|\[[^\]]+\]:\s)",
+    re.IGNORECASE
+)
+
+# Multiple of the summary limit scanned by _summarize_readme; leaves room
+# for boilerplate at the top of the README
+_README_SCAN_FACTOR = 4
+
+# Characters that affect brace depth or string state while scanning for JSON
+_JSON_TOKEN_RE = re.compile(r'[{}"\\]')
+
+
+def _find_json_object(text: str, start: int = 0) -> Optional[str]:
+    """Return the first balanced {...} span in text at or after start.
+    
+    Braces inside JSON strings are ignored, so trailing prose containing
+    '}' does not extend the match.
+    """
+    start = text.find('{', start)
+    if start == -1:
+        return None
+    
+    depth = 0
+    in_string = False
+    escaped_pos = -1
+    for match in _JSON_TOKEN_RE.finditer(text, start):
+        pos = match.start()
+        char = match.group()
+        if in_string:
+            if pos == escaped_pos:
+                continue
+            if char == '\\':
+                escaped_pos = pos + 1
+            elif char == '"':
+                in_string = False
+        elif char == '"':
+            in_string = True
+        elif char == '{':
+            depth += 1
+        elif char == '}':
+            depth -= 1
+            if depth == 0:
+                return text[start:pos + 1]
+    
+    return None
+
+
+def _summarize_readme(readme: str, limit: int = 2000) -> str:
+    """Drop boilerplate lines from a README and truncate it to limit characters.
+    
+    Badges and HTML banners often fill the start of a README, so removing
+    them first keeps more of the actual description within the limit. Only
+    the first _README_SCAN_FACTOR * limit characters are looked at, so the
+    cost does not grow with the size of the README.
+    """
+    window = readme[:limit * _README_SCAN_FACTOR]
+    return _summarize_readme_window(window, limit, len(window) < len(readme))
+
+
+@functools.lru_cache(maxsize=256)
+def _summarize_readme_window(window: str, limit: int, cut: bool) -> str:
+    """Summarize the start of a README; cut says whether more text followed it."""
+    lines = []
+    # Length of the summary so far, not counting stripped whitespace
+    length = 0
+    previous_blank = True
+    for line in window.splitlines():
+        if _README_BOILERPLATE_RE.match(line):
+            continue
+        blank = not line.strip()
+        if blank and previous_blank:
+            continue
+        length += len(line) + 1 if lines else len(line.lstrip())
+        lines.append(line)
+        previous_blank = blank
+        if not blank and length - (len(line) - len(line.rstrip())) > limit:
+            # The summary already runs past limit, so the rest is cut anyway
+            break
+    
+    summary = "\n".join(lines).strip() or window
+    if len(summary) > limit:
+        summary = summary[:limit] + "..."
+    elif cut:
+        summary += "..."
+    return summary
+
+
+# Dynamic head of the user story prompt. The optional README, focus and
+# research sections are rendered separately and substituted in whole.
+_ANALYSIS_PROMPT_TEMPLATE = """\
+Analyze the GitHub repository '{full_name}' and generate {max_stories} comprehensive user stories.
+
+Repository Information:
+- Name: {full_name}
+- Description: {description}
+- Primary Language: {language}
+- Topics: {topics}
+- Stars: {stars}
+- Forks: {forks}
+- License: {license}
+- Created: {created}
+- Last Updated: {updated}
+
+{readme_section}{focus_section}{research_section}"""
+
+# The rest of the prompt never varies, so it is appended as-is rather than
+# being run through str.format on every call
+_PROMPT_REQUIREMENTS = """\
+Requirements for User Stories:
+1. Each user story should follow the format: 'The user [user type], is able to [feature/functionality], So that [benefit/value]'
+2. Include 3-5 acceptance criteria for each story
+3. Assign appropriate priority (Low, Medium, High, Critical) and effort (Small, Medium, Large, Extra Large)
+4. Focus on actionable, implementable features
+5. Consider the technology stack and project context
+6. Make stories specific to this repository's purpose and domain
+
+"""
+
+_PROMPT_SCHEMA_FOOTER = """\
+Output Format:
+Return a JSON object with the following structure:
+{
+  "user_stories": [
+    {
+      "title": "Story title",
+      "description": "As a [user type], I want [feature], So that [benefit]",
+      "acceptance_criteria": ["criterion 1", "criterion 2", "criterion 3"],
+      "priority": "High",
+      "effort": "Medium",
+      "tags": ["tag1", "tag2"]
+    }
+  ]
+}
+
+Ensure the JSON is valid and properly formatted."""
+
+_PROMPT_STATIC_TAIL = _PROMPT_REQUIREMENTS + _PROMPT_SCHEMA_FOOTER
+
+_FOCUS_SECTION_TEMPLATE = """\
+Focus Area: {focus_area}
+Generate user stories that specifically address this focus area.
+
+"""
+
+_RESEARCH_SECTION_HEADER = """\
+Additional Research Context:
+Use this information to better understand the project context and user needs:
+"""
+
 
 class ClaudeAnalyzer:
     """Uses Claude Code SDK to analyze repositories and generate user stories."""
     
     def __init__(self, config: ClaudeConfig):
+        # The SDK is slow to import, so it is only loaded once Claude is used
+        from claude_code_sdk import ClaudeCodeOptions
+        
         self.config = config
+        # Options only depend on the config, so build them once and share
+        # them across analyses; the SDK copies rather than mutates them.
+        self._options = ClaudeCodeOptions(
+            system_prompt=config.system_prompt,
+            max_turns=config.max_turns,
+            allowed_tools=config.allowed_tools,
+            permission_mode=config.permission_mode
+        )
     
     async def analyze_repository(
         self,
@@ -35,16 +217,14 @@ class ClaudeAnalyzer:
         # Prepare the analysis prompt
         prompt = self._build_analysis_prompt(repo_info, web_results, focus_area, max_stories)
         
-        # Configure Claude options
-        options = ClaudeCodeOptions(
-            system_prompt=self.config.system_prompt,
-            max_turns=self.config.max_turns,
-            allowed_tools=self.config.allowed_tools,
-            permission_mode=self.config.permission_mode
-        )
-        
-        # Generate user stories
-        user_stories = await self._generate_user_stories(prompt, options, max_stories)
+        # Generate user stories, falling back to generic ones if Claude fails;
+        # the metadata flag lets callers avoid caching a fallback result
+        metadata = {}
+        try:
+            user_stories = await self._query_user_stories(prompt, self._options, max_stories)
+        except Exception:
+            user_stories = self._generate_fallback_stories(max_stories)
+            metadata["fallback_stories"] = True
         
         # Extract additional analysis information
         tech_stack, key_features, target_users = self._extract_analysis_info(user_stories)
@@ -56,7 +236,8 @@ class ClaudeAnalyzer:
             focus_area=focus_area,
             tech_stack=tech_stack,
             key_features=key_features,
-            target_users=target_users
+            target_users=target_users,
+            metadata=metadata
         )
     
     def _build_analysis_prompt(
@@ -68,92 +249,56 @@ class ClaudeAnalyzer:
     ) -> str:
         """Build a comprehensive prompt for Claude analysis."""
         
-        prompt_parts = [
-            f"Analyze the GitHub repository '{repo_info.full_name}' and generate {max_stories} comprehensive user stories.",
-            "",
-            "Repository Information:",
-            f"- Name: {repo_info.full_name}",
-            f"- Description: {repo_info.description or 'No description available'}",
-            f"- Primary Language: {repo_info.language or 'Not specified'}",
-            f"- Topics: {', '.join(repo_info.topics) if repo_info.topics else 'None'}",
-            f"- Stars: {repo_info.stars}",
-            f"- Forks: {repo_info.forks}",
-            f"- License: {repo_info.license or 'Not specified'}",
-            f"- Created: {repo_info.created_at.strftime('%Y-%m-%d')}",
-            f"- Last Updated: {repo_info.updated_at.strftime('%Y-%m-%d')}",
-            ""
-        ]
-        
+        readme_section = ""
         if repo_info.readme_content:
-            prompt_parts.extend([
-                "README Content:",
-                repo_info.readme_content[:2000] + "..." if len(repo_info.readme_content) > 2000 else repo_info.readme_content,
-                ""
-            ])
+            readme = _summarize_readme(repo_info.readme_content)
+            readme_section = f"README Content:\n{readme}\n\n"
         
+        focus_section = ""
         if focus_area:
-            prompt_parts.extend([
-                f"Focus Area: {focus_area}",
-                "Generate user stories that specifically address this focus area.",
-                ""
-            ])
+            focus_section = _FOCUS_SECTION_TEMPLATE.format(focus_area=focus_area)
         
+        research_section = ""
         if web_results:
-            prompt_parts.extend([
-                "Additional Research Context:",
-                "Use this information to better understand the project context and user needs:"
-            ])
-            
-            for i, result in enumerate(web_results[:5], 1):
-                prompt_parts.extend([
-                    f"{i}. {result.title}",
-                    f"   URL: {result.url}",
-                    f"   Context: {result.snippet[:300]}...",
-                    ""
-                ])
-        
-        prompt_parts.extend([
-            "Requirements for User Stories:",
-            "1. Each user story should follow the format: 'The user [user type], is able to [feature/functionality], So that [benefit/value]'",
-            "2. Include 3-5 acceptance criteria for each story",
-            "3. Assign appropriate priority (Low, Medium, High, Critical) and effort (Small, Medium, Large, Extra Large)",
-            "4. Focus on actionable, implementable features",
-            "5. Consider the technology stack and project context",
-            "6. Make stories specific to this repository's purpose and domain",
-            "",
-            "Output Format:",
-            "Return a JSON object with the following structure:",
-            "{",
-            '  "user_stories": [',
-            '    {',
-            '      "title": "Story title",',
-            '      "description": "As a [user type], I want [feature], So that [benefit]",',
-            '      "acceptance_criteria": ["criterion 1", "criterion 2", "criterion 3"],',
-            '      "priority": "High",',
-            '      "effort": "Medium",',
-            '      "tags": ["tag1", "tag2"]',
-            '    }',
-            '  ]',
-            "}",
-            "",
-            "Ensure the JSON is valid and properly formatted."
-        ])
+            # Results are cached alongside the web research, so their
+            # formatted text is reused across analyses of the same repository
+            research_section = _RESEARCH_SECTION_HEADER + "".join(
+                f"{i}. {result.prompt_snippet}"
+                for i, result in enumerate(web_results[:5], 1)
+            )
         
-        return "\n".join(prompt_parts)
+        header = _ANALYSIS_PROMPT_TEMPLATE.format(
+            full_name=repo_info.full_name,
+            max_stories=max_stories,
+            description=repo_info.description or 'No description available',
+            language=repo_info.language or 'Not specified',
+            topics=', '.join(repo_info.topics) if repo_info.topics else 'None',
+            stars=repo_info.stars,
+            forks=repo_info.forks,
+            license=repo_info.license or 'Not specified',
+            created=repo_info.created_date,
+            updated=repo_info.updated_date,
+            readme_section=readme_section,
+            focus_section=focus_section,
+            research_section=research_section
+        )
+        return header + _PROMPT_STATIC_TAIL
     
-    async def _generate_user_stories(
+    async def _query_user_stories(
         self,
         prompt: str,
-        options: ClaudeCodeOptions,
+        options: "ClaudeCodeOptions",
         max_stories: int
     ) -> List[UserStory]:
-        """Generate user stories using Claude Code SDK."""
+        """Generate user stories using Claude Code SDK; errors from the SDK propagate."""
+        from claude_code_sdk import query, AssistantMessage, TextBlock, ToolUseBlock, ToolResultBlock
         
         user_stories = []
         story_id = 1
         
+        messages = query(prompt=prompt, options=options)
         try:
-            async for message in query(prompt=prompt, options=options):
+            async for message in messages:
                 if isinstance(message, AssistantMessage):
                     for block in message.content:
                         if isinstance(block, TextBlock):
@@ -161,7 +306,8 @@ class ClaudeAnalyzer:
                             json_content = self._extract_json_from_text(block.text)
                             if json_content and "user_stories" in json_content:
                                 stories_data = json_content["user_stories"]
-                                for story_data in stories_data[:max_stories]:
+                                remaining = max_stories - len(user_stories)
+                                for story_data in stories_data[:remaining]:
                                     try:
                                         user_story = self._parse_user_story(story_data, story_id)
                                         if user_story:
@@ -178,30 +324,29 @@ class ClaudeAnalyzer:
                         elif isinstance(block, ToolResultBlock):
                             # Handle tool results if needed
                             pass
+                        
+                        # Stop reading blocks once we have enough stories
+                        if len(user_stories) >= max_stories:
+                            break
                 
                 # Break if we have enough stories
                 if len(user_stories) >= max_stories:
                     break
-        
-        except Exception as e:
-            # If Claude fails, generate fallback stories
-            user_stories = self._generate_fallback_stories(max_stories)
+        finally:
+            # Closing the stream tells the SDK to stop generating
+            await messages.aclose()
         
         return user_stories[:max_stories]
     
     def _extract_json_from_text(self, text: str) -> Optional[Dict[str, Any]]:
         """Extract JSON content from Claude's response text."""
-        try:
-            # Look for JSON content in the text
-            start_idx = text.find('{')
-            end_idx = text.rfind('}')
-            
-            if start_idx != -1 and end_idx != -1 and end_idx > start_idx:
-                json_str = text[start_idx:end_idx + 1]
-                return json.loads(json_str)
-            
+        json_str = _find_json_object(text)
+        if json_str is None:
             return None
-        except (json.JSONDecodeError, ValueError):
+        
+        try:
+            return _json_loads(json_str)
+        except _JSON_DECODE_ERRORS:
             return None
     
     def _parse_user_story(self, story_data: Dict[str, Any], story_id: int) -> Optional[UserStory]:
@@ -212,26 +357,23 @@ class ClaudeAnalyzer:
             description = story_data.get("description", "")
             
             # Parse acceptance criteria
-            criteria_data = story_data.get("acceptance_criteria", [])
-            acceptance_criteria = [
-                AcceptanceCriterion(description=criterion)
-                for criterion in criteria_data
-                if isinstance(criterion, str)
-            ]
+            criteria_data = story_data.get("acceptance_criteria", ())
+            acceptance_criteria = list(map(
+                AcceptanceCriterion,
+                [criterion for criterion in criteria_data if isinstance(criterion, str)]
+            ))
             
             # Parse priority and effort
             priority_str = story_data.get("priority", "Medium")
             effort_str = story_data.get("effort", "Medium")
             
-            try:
-                priority = StoryPriority(priority_str)
-            except ValueError:
-                priority = StoryPriority.MEDIUM
+            priority = StoryPriority.MEDIUM
+            if isinstance(priority_str, str):
+                priority = _PRIORITY_MAP.get(priority_str.lower(), StoryPriority.MEDIUM)
             
-            try:
-                effort = StoryEffort(effort_str)
-            except ValueError:
-                effort = StoryEffort.MEDIUM
+            effort = StoryEffort.MEDIUM
+            if isinstance(effort_str, str):
+                effort = _EFFORT_MAP.get(effort_str.lower(), StoryEffort.MEDIUM)
             
             # Extract tags
             tags = story_data.get("tags", [])
@@ -301,24 +443,23 @@ class ClaudeAnalyzer:
     
     def _extract_analysis_info(self, user_stories: List[UserStory]) -> tuple[List[str], List[str], List[str]]:
         """Extract technology stack, key features, and target users from user stories."""
-        tech_stack = []
+        # dicts give O(1) de-duplication while keeping first-seen order
+        tech_stack = {}
         key_features = []
-        target_users = []
+        target_users = {}
         
         for story in user_stories:
             # Extract key features from story titles
             key_features.append(story.title)
             
             # Extract target users from descriptions
-            if "As a" in story.description:
-                user_part = story.description.split("As a")[1].split(",")[0].strip()
-                if user_part not in target_users:
-                    target_users.append(user_part)
+            match = _USER_TYPE_RE.search(story.description)
+            if match:
+                target_users[match.group(1).strip()] = None
             
             # Extract tags that might indicate technology
             for tag in story.tags:
-                if tag.lower() in ["api", "database", "frontend", "backend", "mobile", "web"]:
-                    if tag not in tech_stack:
-                        tech_stack.append(tag)
+                if tag.lower() in _TECH_TAGS:
+                    tech_stack[tag] = None
         
-        return tech_stack, key_features, target_users
+        return list(tech_stack), key_features, list(target_users)
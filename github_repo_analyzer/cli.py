@@ -3,62 +3,261 @@ Command-line interface for the GitHub Repository Analyzer.
 """
 
 import sys
-import asyncio
+import contextlib
+import functools
+import hashlib
+import itertools
+import re
+from dataclasses import replace
+from datetime import datetime
 from pathlib import Path
 from typing import Optional
 
 import click
-from rich.console import Console
-from rich.progress import Progress, SpinnerColumn, TextColumn
-from rich.panel import Panel
-from rich.text import Text
-from rich.table import Table
-
-from .analyzer import GitHubRepoAnalyzer, AnalyzerFactory
-from .enhanced_analyzer import EnhancedClaudeAnalyzer
-from .test_generator import TestGenerator
+
+from .analyzer import (
+    GitHubRepoAnalyzer, AnalyzerFactory, install_event_loop_policy, _OUTPUT_FORMATS
+)
 from .types import OutputFormat, AnalyzerConfig, TestGenerationConfig
+from .cache import DEFAULT_ANALYSIS_CACHE_DIR
+from .http_cache import DEFAULT_CACHE_DIR
 from .exceptions import (
     GitHubRepoAnalyzerError, RepositoryNotFoundError, ClaudeAnalysisError,
     ConfigurationError
 )
 
-console = Console()
 
+@functools.lru_cache(maxsize=None)
+def _console():
+    """Return the shared Rich console.
+    
+    Rich is imported on first use, so --help and --version don't pay for it.
+    Automatic highlighting is off: output is styled explicitly, and the
+    highlighter would otherwise run its regexes over every printed string.
+    """
+    from rich.console import Console
+    
+    return Console(highlight=False)
+
+
+class RepoType(click.ParamType):
+    """Repository argument in owner/repo-name format, converted to (owner, name)."""
+    
+    name = "repo"
+    
+    def convert(self, value, param, ctx):
+        if isinstance(value, tuple):
+            return value
+        
+        # Both the owner and the name must be non-empty
+        slash = value.find('/')
+        if slash <= 0 or slash == len(value) - 1:
+            self.fail('Repository must be in format "owner/repo-name"', param, ctx)
+        return value[:slash], value[slash + 1:]
+
+
+class OutputFormatChoice(click.Choice):
+    """Case-insensitive choice of output format, converted to OutputFormat."""
+    
+    def __init__(self):
+        super().__init__(list(_OUTPUT_FORMATS), case_sensitive=False)
+    
+    def convert(self, value, param, ctx):
+        if isinstance(value, OutputFormat):
+            return value
+        # Valid values map straight to the enum; Choice only handles errors
+        output_format = _OUTPUT_FORMATS.get(value.lower())
+        if output_format is not None:
+            return output_format
+        return _OUTPUT_FORMATS[super().convert(value, param, ctx)]
+
+
+REPO = RepoType()
+OUTPUT_FORMAT = OutputFormatChoice()
+
+# Characters of the README shown by the info command
+_README_PREVIEW_CHARS = 500
+
+# Rate limit resources shown by the rate-limit command, in display order
+_RATE_LIMIT_RESOURCES = (
+    ("core", "Core API"),
+    ("search", "Search API"),
+)
+
+# Shared pieces of the result displays
+_BULLET = "   • "
+_EQ100 = "=" * 100
+_EQ80 = "=" * 80
+_EQ60 = "=" * 60
+_DASH80 = "-" * 80
+_DASH60 = "-" * 60
+_STORY_RULE = "   " + _DASH80
+_SUITE_RULE = "   " + _DASH60
+
+# Diagrams shown by the result displays, in display order, as
+# (SystemArchitecture attribute, icon, title, caption)
+_COMPREHENSIVE_DIAGRAMS = (
+    ("system_diagram", "📐", "System Architecture Diagram", None),
+    ("api_flow_diagram", "🔄", "API Flow Diagram", None),
+    ("data_flow_diagram", "💾", "Data Flow Diagram", None),
+    ("component_diagram", "🧩", "Component Architecture", None),
+)
+_ARCHITECTURE_DIAGRAMS = (
+    ("system_diagram", "📐", "Overall System Architecture", "Copy this Mermaid code to visualize the diagram:"),
+    ("api_flow_diagram", "🔄", "API & Data Flow", "API request/response flow and data processing:"),
+    ("component_diagram", "🧩", "Component Architecture", "Internal component structure and relationships:"),
+    ("data_flow_diagram", "💾", "Data Flow Architecture", "How data moves through the system:"),
+)
+
+# Parsed Mermaid blocks keyed by a hash of their markup, see _emit_mermaid
+_MERMAID_BLOCKS: dict = {}
+_MERMAID_BLOCKS_MAX = 64
 
-def validate_repo_format(ctx, param, value):
-    """Validate repository format (owner/repo-name)."""
-    if value and '/' not in value:
-        raise click.BadParameter('Repository must be in format "owner/repo-name"')
-    return value
+# Start of a Markdown header line in a technical report
+_HEADER_RE = re.compile(r'^#', re.M)
 
 
-def validate_output_format(ctx, param, value):
-    """Validate output format."""
-    if value:
+def _print_exception(console) -> None:
+    """Print the traceback of the exception being handled.
+    
+    Rich's highlighted rendering is only worth its cost on a terminal;
+    redirected output, e.g. a CI log, gets the plain traceback.
+    """
+    if sys.stderr.isatty():
+        console.print_exception()
+    else:
+        import traceback
+        
+        traceback.print_exc()
+
+
+def handle_cli_errors(command):
+    """Report a command's unexpected errors and exit with status 1.
+    
+    Apply below @click.pass_context. Click's own usage errors pass through
+    so Click can print them with the command's usage line.
+    """
+    @functools.wraps(command)
+    def wrapper(ctx, *args, **kwargs):
         try:
-            return OutputFormat(value.lower())
-        except ValueError:
-            raise click.BadParameter(f'Invalid output format. Choose from: {", ".join([f.value for f in OutputFormat])}')
-    return OutputFormat.TEXT
+            return command(ctx, *args, **kwargs)
+        except click.ClickException:
+            raise
+        except Exception as e:
+            console = _console()
+            console.print(f"[red]Error: {e}[/red]")
+            if ctx.obj.get('verbose'):
+                _print_exception(console)
+            sys.exit(1)
+    
+    return wrapper
 
 
 @click.group()
 @click.version_option(version="0.1.0", prog_name="GitHub Repository Analyzer")
 @click.option('--verbose', '-v', is_flag=True, help='Enable verbose logging')
+@click.option('--no-cache', is_flag=True, help='Do not cache GitHub API responses on disk')
+@click.option('--cache-ttl', type=float, default=None, help='Seconds to reuse cached GitHub responses before revalidating')
+@click.option('--no-analysis-cache', is_flag=True, help='Always query Claude, even for unchanged repositories')
 @click.pass_context
-def cli(ctx, verbose):
+def cli(ctx, verbose, no_cache, cache_ttl, no_analysis_cache):
     """GitHub Repository Analyzer - Generate user stories from GitHub repositories using Claude Code SDK."""
     ctx.ensure_object(dict)
     ctx.obj['verbose'] = verbose
+    ctx.obj['no_cache'] = no_cache
+    ctx.obj['cache_ttl'] = cache_ttl
+    ctx.obj['no_analysis_cache'] = no_analysis_cache
+
+
+class _CliExit(Exception):
+    """Raised by command coroutines to end the command with an error.
+    
+    Unlike sys.exit() inside the coroutine, this lets every async context
+    manager close its connections before the event loop shuts down; _run
+    prints the message and exits afterwards.
+    """
+    
+    def __init__(self, message: Optional[str] = None, code: int = 1):
+        super().__init__(message)
+        self.message = message
+        self.code = code
+
+
+@functools.lru_cache(maxsize=None)
+def _runner():
+    """Return the event loop runner shared by all commands in this process.
+    
+    Scripts that invoke several commands in one process (e.g. through
+    main(standalone_mode=False)) reuse a single loop instead of creating
+    and tearing one down per command. The loop is closed at exit.
+    """
+    import asyncio
+    import atexit
+    
+    install_event_loop_policy()
+    runner = asyncio.Runner()
+    atexit.register(runner.close)
+    return runner
+
+
+def _run(coro):
+    """Run a command's coroutine to completion.
+    
+    All commands go through here so loop setup lives in one place: uvloop
+    is used when installed, and on Python 3.11+ every command runs on the
+    same shared loop.
+    """
+    import asyncio
+    
+    try:
+        if sys.version_info < (3, 11):
+            install_event_loop_policy()
+            return asyncio.run(coro)
+        return _runner().run(coro)
+    except _CliExit as e:
+        if e.message:
+            _console().print(e.message)
+        sys.exit(e.code)
+
+
+def _apply_cache_options(ctx, config: AnalyzerConfig) -> AnalyzerConfig:
+    """Return config with the on-disk caches enabled unless disabled by --no-cache/--no-analysis-cache.
+    
+    GitHub connections are also shared, so commands run in the same
+    process reuse them.
+    """
+    github = replace(config.github, reuse_session=True)
+    if ctx.obj.get('no_cache'):
+        github = replace(github, cache_dir=None)
+    else:
+        github = replace(
+            github,
+            cache_dir=github.cache_dir or str(DEFAULT_CACHE_DIR),
+            cache_ttl=ctx.obj['cache_ttl'] if ctx.obj.get('cache_ttl') is not None else github.cache_ttl
+        )
+    analysis_cache_dir = config.analysis_cache_dir
+    if ctx.obj.get('no_analysis_cache'):
+        analysis_cache_dir = None
+    elif analysis_cache_dir is None:
+        analysis_cache_dir = str(DEFAULT_ANALYSIS_CACHE_DIR)
+    return replace(config, github=github, analysis_cache_dir=analysis_cache_dir)
+
+
+def _default_config(ctx, token: Optional[str] = None, **overrides) -> AnalyzerConfig:
+    """Build a command's configuration from the defaults."""
+    base = AnalyzerFactory.create_default()
+    config = replace(
+        base, github=replace(base.github, token=token or base.github.token), **overrides
+    )
+    return _apply_cache_options(ctx, config)
 
 
 @cli.command()
-@click.argument('repo', callback=validate_repo_format, required=True)
+@click.argument('repo', type=REPO, required=True)
 @click.option('--token', '-t', help='GitHub personal access token')
 @click.option('--focus', '-f', help='Focus area for user stories (e.g., "security", "performance")')
 @click.option('--max-stories', '-m', type=int, default=5, help='Maximum number of user stories to generate')
-@click.option('--format', 'output_format', callback=validate_output_format, default='text', help='Output format (text, json, markdown)')
+@click.option('--format', 'output_format', type=OUTPUT_FORMAT, default='text', help='Output format (text, json, markdown)')
 @click.option('--output-file', '-o', type=click.Path(path_type=Path), help='Save output to file')
 @click.option('--system-prompt', help='Custom system prompt for Claude')
 @click.option('--config-file', type=click.Path(exists=True, path_type=Path), help='Configuration file path')
@@ -66,180 +265,143 @@ def cli(ctx, verbose):
 @click.option('--include-api-analysis', is_flag=True, default=True, help='Include API endpoint analysis')
 @click.option('--include-architecture', is_flag=True, default=True, help='Include system architecture diagrams')
 @click.pass_context
+@handle_cli_errors
 def analyze(ctx, repo, token, focus, max_stories, output_format, output_file, system_prompt, config_file, comprehensive, include_api_analysis, include_architecture):
     """Analyze a GitHub repository and generate user stories."""
     
-    try:
-        # Parse repository owner and name
-        owner, repo_name = repo.split('/', 1)
-        
-        # Create configuration
-        if config_file:
-            config = AnalyzerFactory.create_from_file(config_file)
-        else:
-            config = AnalyzerFactory.create_from_env()
-        
-        # Override with command line options
-        if token:
-            config.github.token = token
-        if focus:
-            config.focus_area = focus
-        if max_stories:
-            config.max_stories = max_stories
-        if output_format:
-            config.output_format = output_format
-        if output_file:
-            config.output_file = output_file
-        if system_prompt:
-            config.claude.system_prompt = system_prompt
-        if ctx.obj.get('verbose'):
-            config.verbose = True
-        
-        # Store comprehensive analysis flags in config metadata
-        config.metadata = getattr(config, 'metadata', {})
-        config.metadata['comprehensive'] = comprehensive
-        config.metadata['include_api_analysis'] = include_api_analysis
-        config.metadata['include_architecture'] = include_architecture
-        
-        # Run analysis (comprehensive or basic)
-        if comprehensive:
-            asyncio.run(_run_comprehensive_analysis(owner, repo_name, config))
-        else:
-            asyncio.run(_run_analysis(owner, repo_name, config))
-        
-    except Exception as e:
-        console.print(f"[red]Error: {e}[/red]")
-        if ctx.obj.get('verbose'):
-            console.print_exception()
-        sys.exit(1)
+    # Parse repository owner and name
+    owner, repo_name = repo
+    
+    # Create configuration
+    if config_file:
+        config = AnalyzerFactory.create_from_file(config_file)
+    else:
+        config = AnalyzerFactory.create_from_env()
+    
+    # Override with command line options
+    if token:
+        config.github.token = token
+    if focus:
+        config.focus_area = focus
+    if max_stories:
+        config.max_stories = max_stories
+    if output_format:
+        config.output_format = output_format
+    if output_file:
+        config.output_file = output_file
+    if system_prompt:
+        config.claude.system_prompt = system_prompt
+    if ctx.obj.get('verbose'):
+        config.verbose = True
+    config = _apply_cache_options(ctx, config)
+    
+    # Store comprehensive analysis flags in config metadata
+    config.metadata['comprehensive'] = comprehensive
+    config.metadata['include_api_analysis'] = include_api_analysis
+    config.metadata['include_architecture'] = include_architecture
+    
+    # Run analysis (comprehensive or basic)
+    if comprehensive:
+        _run(_run_comprehensive_analysis(owner, repo_name, config))
+    else:
+        _run(_run_analysis(owner, repo_name, config))
 
 
 @cli.command()
-@click.argument('repo', callback=validate_repo_format, required=True)
+@click.argument('repo', type=REPO, required=True)
 @click.option('--token', '-t', help='GitHub personal access token')
 @click.option('--focus', '-f', help='Focus area for user stories')
 @click.option('--max-stories', '-m', type=int, default=5, help='Maximum number of user stories')
-@click.option('--format', 'output_format', callback=validate_output_format, default='markdown', help='Output format')
+@click.option('--format', 'output_format', type=OUTPUT_FORMAT, default='markdown', help='Output format')
 @click.option('--output-file', '-o', type=click.Path(path_type=Path), help='Output file path')
 @click.pass_context
+@handle_cli_errors
 def quick(ctx, repo, token, focus, max_stories, output_format, output_file):
     """Quick analysis with default settings."""
     
-    try:
-        owner, repo_name = repo.split('/', 1)
-        
-        # Use default configuration
-        config = AnalyzerFactory.create_default()
-        config.github.token = token
-        config.focus_area = focus
-        config.max_stories = max_stories
-        config.output_format = output_format
-        
-        if output_file:
-            config.output_file = output_file
-        else:
-            # Generate default filename
-            default_filename = f"{owner}-{repo_name}-user-stories{config.output_format.get_file_extension()}"
-            config.output_file = Path(default_filename)
-        
-        # Run analysis
-        asyncio.run(_run_analysis(owner, repo_name, config))
-        
-    except Exception as e:
-        console.print(f"[red]Error: {e}[/red]")
-        if ctx.obj.get('verbose'):
-            console.print_exception()
-        sys.exit(1)
+    owner, repo_name = repo
+    
+    # Use default configuration
+    config = _default_config(
+        ctx, token, focus_area=focus, max_stories=max_stories, output_format=output_format
+    )
+    
+    if output_file:
+        config.output_file = output_file
+    else:
+        # Generate default filename
+        default_filename = f"{owner}-{repo_name}-user-stories{config.output_format.get_file_extension()}"
+        config.output_file = Path(default_filename)
+    
+    # Run analysis
+    _run(_run_analysis(owner, repo_name, config))
 
 
 @cli.command()
-@click.argument('repo', callback=validate_repo_format, required=True)
+@click.argument('repo', type=REPO, required=True)
 @click.option('--token', '-t', help='GitHub personal access token')
 @click.option('--output-file', '-o', type=click.Path(path_type=Path), help='Save architecture diagrams to file')
 @click.option('--focus', '-f', help='Focus area for architecture analysis')
 @click.pass_context
+@handle_cli_errors
 def architecture(ctx, repo, token, output_file, focus):
     """Generate system architecture diagrams and API analysis for a repository."""
     
-    try:
-        owner, repo_name = repo.split('/', 1)
-        
-        config = AnalyzerFactory.create_default()
-        if token:
-            config.github.token = token
-        config.focus_area = focus
-        config.max_stories = 0  # Skip user stories for architecture-only analysis
-        config.output_format = OutputFormat.MARKDOWN
-        
-        if output_file:
-            config.output_file = output_file
-        else:
-            # Generate default filename for architecture analysis
-            default_filename = f"{owner}-{repo_name}-architecture.md"
-            config.output_file = Path(default_filename)
-        
-        # Store flags for architecture-only analysis
-        config.metadata = getattr(config, 'metadata', {})
-        config.metadata['comprehensive'] = True
-        config.metadata['include_api_analysis'] = True
-        config.metadata['include_architecture'] = True
-        config.metadata['architecture_only'] = True
-        
-        # Run architecture analysis
-        asyncio.run(_run_architecture_analysis(owner, repo_name, config))
-        
-    except Exception as e:
-        console.print(f"[red]Error: {e}[/red]")
-        if ctx.obj.get('verbose'):
-            console.print_exception()
-        sys.exit(1)
+    owner, repo_name = repo
+    
+    config = _default_config(
+        ctx, token,
+        focus_area=focus,
+        max_stories=0,  # Skip user stories for architecture-only analysis
+        output_format=OutputFormat.MARKDOWN
+    )
+    
+    if output_file:
+        config.output_file = output_file
+    else:
+        # Generate default filename for architecture analysis
+        default_filename = f"{owner}-{repo_name}-architecture.md"
+        config.output_file = Path(default_filename)
+    
+    # Store flags for architecture-only analysis
+    config.metadata['comprehensive'] = True
+    config.metadata['include_api_analysis'] = True
+    config.metadata['include_architecture'] = True
+    config.metadata['architecture_only'] = True
+    
+    # Run architecture analysis
+    _run(_run_architecture_analysis(owner, repo_name, config))
 
 
 @cli.command()
 @click.option('--token', '-t', help='GitHub personal access token')
 @click.pass_context
+@handle_cli_errors
 def rate_limit(ctx, token):
     """Check GitHub API rate limit status."""
     
-    try:
-        config = AnalyzerFactory.create_default()
-        if token:
-            config.github.token = token
-        
-        asyncio.run(_check_rate_limit(config))
-        
-    except Exception as e:
-        console.print(f"[red]Error: {e}[/red]")
-        if ctx.obj.get('verbose'):
-            console.print_exception()
-        sys.exit(1)
+    config = _default_config(ctx, token)
+    
+    _run(_check_rate_limit(config))
 
 
 @cli.command()
-@click.argument('repo', callback=validate_repo_format, required=True)
+@click.argument('repo', type=REPO, required=True)
 @click.option('--token', '-t', help='GitHub personal access token')
 @click.pass_context
+@handle_cli_errors
 def info(ctx, repo, token):
     """Get basic information about a repository without generating user stories."""
     
-    try:
-        owner, repo_name = repo.split('/', 1)
-        
-        config = AnalyzerFactory.create_default()
-        if token:
-            config.github.token = token
-        
-        asyncio.run(_get_repo_info(owner, repo_name, config))
-        
-    except Exception as e:
-        console.print(f"[red]Error: {e}[/red]")
-        if ctx.obj.get('verbose'):
-            console.print_exception()
-        sys.exit(1)
+    owner, repo_name = repo
+    
+    config = _default_config(ctx, token)
+    
+    _run(_get_repo_info(owner, repo_name, config))
 
 
 @cli.command()
-@click.argument('repo', callback=validate_repo_format, required=True)
+@click.argument('repo', type=REPO, required=True)
 @click.option('--token', '-t', help='GitHub personal access token')
 @click.option('--focus', '-f', help='Focus area for test generation')
 @click.option('--max-tests', '-m', type=int, default=5, help='Maximum tests per user story')
@@ -247,64 +409,107 @@ def info(ctx, repo, token):
 @click.option('--include-integration', is_flag=True, default=True, help='Include integration tests')
 @click.option('--include-e2e', is_flag=True, default=True, help='Include end-to-end tests')
 @click.option('--include-api', is_flag=True, default=True, help='Include API tests')
-@click.option('--format', 'output_format', callback=validate_output_format, default='markdown', help='Output format')
+@click.option('--format', 'output_format', type=OUTPUT_FORMAT, default='markdown', help='Output format')
 @click.option('--output-file', '-o', type=click.Path(path_type=Path), help='Save test documentation to file')
 @click.pass_context
+@handle_cli_errors
 def tests(ctx, repo, token, focus, max_tests, include_unit, include_integration, include_e2e, include_api, output_format, output_file):
     """Generate comprehensive test cases and documentation from user stories."""
     
-    try:
-        owner, repo_name = repo.split('/', 1)
-        
-        config = AnalyzerFactory.create_default()
-        if token:
-            config.github.token = token
-        config.focus_area = focus
-        config.output_format = output_format
-        
-        if output_file:
-            config.output_file = output_file
-        else:
-            # Generate default filename for test documentation
-            default_filename = f"{owner}-{repo_name}-tests{output_format.get_file_extension()}"
-            config.output_file = Path(default_filename)
-        
-        # Run test generation
-        asyncio.run(_run_test_generation(owner, repo_name, config, max_tests, include_unit, include_integration, include_e2e, include_api))
-        
-    except Exception as e:
-        console.print(f"[red]Error: {e}[/red]")
-        if ctx.obj.get('verbose'):
-            console.print_exception()
-        sys.exit(1)
+    owner, repo_name = repo
+    
+    config = _default_config(ctx, token, focus_area=focus, output_format=output_format)
+    
+    if output_file:
+        config.output_file = output_file
+    else:
+        # Generate default filename for test documentation
+        default_filename = f"{owner}-{repo_name}-tests{output_format.get_file_extension()}"
+        config.output_file = Path(default_filename)
+    
+    # Run test generation
+    _run(_run_test_generation(owner, repo_name, config, max_tests, include_unit, include_integration, include_e2e, include_api))
 
 
-async def _run_comprehensive_analysis(owner: str, repo_name: str, config: AnalyzerConfig):
-    """Run comprehensive repository analysis with architecture diagrams."""
+@cli.command('analyze-batch')
+@click.argument('repolist', type=click.File('r'), required=True)
+@click.option('--token', '-t', help='GitHub personal access token')
+@click.option('--focus', '-f', help='Focus area for user stories')
+@click.option('--max-stories', '-m', type=int, default=5, help='Maximum number of user stories per repository')
+@click.option('--format', 'output_format', type=OUTPUT_FORMAT, default='markdown', help='Output format')
+@click.option('--output-dir', '-d', type=click.Path(file_okay=False, path_type=Path), default='.', help='Directory for the output files')
+@click.option('--concurrency', type=click.IntRange(min=1), default=4, help='Maximum number of repositories analyzed at once')
+@click.pass_context
+@handle_cli_errors
+def analyze_batch(ctx, repolist, token, focus, max_stories, output_format, output_dir, concurrency):
+    """Analyze every repository listed in REPOLIST, one owner/repo-name per line."""
     
-    console.print(Panel(f"🔍 Comprehensive Analysis: [bold blue]{owner}/{repo_name}[/bold blue]", style="blue"))
+    repos = _read_repo_list(repolist, ctx)
     
+    config = _default_config(
+        ctx, token, focus_area=focus, max_stories=max_stories, output_format=output_format
+    )
+    output_dir.mkdir(parents=True, exist_ok=True)
+    
+    _run(_run_batch_analysis(repos, config, output_dir, concurrency))
+
+
+def _read_repo_list(lines, ctx) -> list:
+    """Parse owner/repo-name lines, skipping blank lines and # comments."""
+    repos = []
+    for line_number, line in enumerate(lines, 1):
+        line = line.strip()
+        if not line or line.startswith('#'):
+            continue
+        try:
+            repos.append(REPO.convert(line, None, ctx))
+        except click.BadParameter as e:
+            raise click.BadParameter(f"line {line_number}: {e.message}", ctx, param_hint="REPOLIST")
+    return repos
+
+
+@contextlib.asynccontextmanager
+async def _progress_ctx(title: str, style: str = "blue"):
+    """Print a command's title panel and yield a spinner progress display.
+    
+    The spinner only needs a few redraws per second while waiting on the
+    network.
+    """
+    from rich.panel import Panel
+    from rich.progress import Progress, SpinnerColumn, TextColumn
+    
+    console = _console()
+    console.print(Panel(title, style=style))
     with Progress(
         SpinnerColumn(),
         TextColumn("[progress.description]{task.description}"),
-        console=console
+        console=console,
+        refresh_per_second=4
     ) as progress:
+        yield progress
+
+
+async def _run_comprehensive_analysis(owner: str, repo_name: str, config: AnalyzerConfig):
+    """Run comprehensive repository analysis with architecture diagrams."""
+    from .enhanced_analyzer import EnhancedClaudeAnalyzer
+    
+    console = _console()
+    
+    async with _progress_ctx(f"🔍 Comprehensive Analysis: [bold blue]{owner}/{repo_name}[/bold blue]") as progress:
         
-        task1 = progress.add_task("Fetching repository information...", total=None)
+        task1 = progress.add_task("Fetching repository information and conducting web research...", total=None)
         
         async with GitHubRepoAnalyzer(config) as analyzer:
             try:
-                # Fetch repository info
-                repo_info = await analyzer._fetch_repository_info(owner, repo_name)
-                progress.update(task1, completed=True, description="✅ Repository information fetched")
-                
-                # Task 2: Conduct web research
-                task2 = progress.add_task("Conducting web research...", total=None)
-                web_results = await analyzer._conduct_web_research(repo_info)
-                progress.update(task2, completed=True, description="✅ Web research completed")
+                # Fetch repository info and conduct web research; the research
+                # overlaps with the README download
+                repo_info, web_results = await analyzer._fetch_repository_and_research(
+                    owner, repo_name
+                )
+                progress.update(task1, completed=True, description="✅ Repository information fetched and web research completed")
                 
-                # Task 3: Enhanced analysis with Claude
-                task3 = progress.add_task("Performing comprehensive technical analysis...", total=None)
+                # Task 2: Enhanced analysis with Claude
+                task2 = progress.add_task("Performing comprehensive technical analysis...", total=None)
                 
                 enhanced_analyzer = EnhancedClaudeAnalyzer(config.claude)
                 analysis_result = await enhanced_analyzer.analyze_repository_comprehensive(
@@ -316,42 +521,36 @@ async def _run_comprehensive_analysis(owner: str, repo_name: str, config: Analyz
                     include_api_analysis=config.metadata.get('include_api_analysis', True)
                 )
                 
-                progress.update(task3, completed=True, description="✅ Comprehensive analysis completed")
+                progress.update(task2, completed=True, description="✅ Comprehensive analysis completed")
                 
-                # Task 4: Format and display results
-                task4 = progress.add_task("Formatting comprehensive results...", total=None)
+                # Task 3: Format and display results
+                task3 = progress.add_task("Formatting comprehensive results...", total=None)
                 
                 # Display comprehensive results
                 _display_comprehensive_results(analysis_result, config)
                 
                 # Save to file if specified
                 if config.output_file:
-                    analyzer.output_formatter.save_to_file(analysis_result, config.output_file)
+                    await analyzer.output_formatter.save_to_file_async(analysis_result, config.output_file)
                     console.print(f"\n💾 Results saved to: [bold green]{config.output_file}[/bold green]")
                 
-                progress.update(task4, completed=True, description="✅ Comprehensive analysis complete")
+                progress.update(task3, completed=True, description="✅ Comprehensive analysis complete")
                 
             except RepositoryNotFoundError:
-                console.print(f"[red]❌ Repository {owner}/{repo_name} not found[/red]")
-                sys.exit(1)
+                raise _CliExit(f"[red]❌ Repository {owner}/{repo_name} not found[/red]")
             except ClaudeAnalysisError as e:
-                console.print(f"[red]❌ Enhanced analysis failed: {e}[/red]")
-                sys.exit(1)
+                raise _CliExit(f"[red]❌ Enhanced analysis failed: {e}[/red]")
             except Exception as e:
-                console.print(f"[red]❌ Comprehensive analysis failed: {e}[/red]")
-                sys.exit(1)
+                raise _CliExit(f"[red]❌ Comprehensive analysis failed: {e}[/red]")
 
 
 async def _run_architecture_analysis(owner: str, repo_name: str, config: AnalyzerConfig):
     """Run architecture-focused analysis of a repository."""
+    from .enhanced_analyzer import EnhancedClaudeAnalyzer
     
-    console.print(Panel(f"🏗️ Architecture Analysis: [bold blue]{owner}/{repo_name}[/bold blue]", style="blue"))
+    console = _console()
     
-    with Progress(
-        SpinnerColumn(),
-        TextColumn("[progress.description]{task.description}"),
-        console=console
-    ) as progress:
+    async with _progress_ctx(f"🏗️ Architecture Analysis: [bold blue]{owner}/{repo_name}[/bold blue]") as progress:
         
         task1 = progress.add_task("Fetching repository information...", total=None)
         
@@ -384,85 +583,138 @@ async def _run_architecture_analysis(owner: str, repo_name: str, config: Analyze
                 
                 # Save to file
                 if config.output_file:
-                    analyzer.output_formatter.save_to_file(analysis_result, config.output_file)
+                    await analyzer.output_formatter.save_to_file_async(analysis_result, config.output_file)
                     console.print(f"\n💾 Architecture report saved to: [bold green]{config.output_file}[/bold green]")
                 
                 progress.update(task3, completed=True, description="✅ Architecture report generated")
                 
             except RepositoryNotFoundError:
-                console.print(f"[red]❌ Repository {owner}/{repo_name} not found[/red]")
-                sys.exit(1)
+                raise _CliExit(f"[red]❌ Repository {owner}/{repo_name} not found[/red]")
             except Exception as e:
-                console.print(f"[red]❌ Architecture analysis failed: {e}[/red]")
-                sys.exit(1)
+                raise _CliExit(f"[red]❌ Architecture analysis failed: {e}[/red]")
 
 
 async def _run_analysis(owner: str, repo_name: str, config: AnalyzerConfig):
     """Run the repository analysis."""
+    import asyncio
     
-    console.print(Panel(f"🔍 Analyzing repository: [bold blue]{owner}/{repo_name}[/bold blue]", style="blue"))
+    console = _console()
     
-    with Progress(
-        SpinnerColumn(),
-        TextColumn("[progress.description]{task.description}"),
-        console=console
-    ) as progress:
+    # One task whose description follows the current stage
+    async with _progress_ctx(f"🔍 Analyzing repository: [bold blue]{owner}/{repo_name}[/bold blue]") as progress:
         
-        # Task 1: Fetch repository information
-        task1 = progress.add_task("Fetching repository information...", total=None)
+        # Stage 1: Fetch repository information and conduct web research;
+        # the research overlaps with the README download
+        task = progress.add_task("Fetching repository information and conducting web research...", total=3)
         
         async with GitHubRepoAnalyzer(config) as analyzer:
             try:
-                # Fetch repository info
-                repo_info = await analyzer._fetch_repository_info(owner, repo_name)
-                progress.update(task1, completed=True, description="✅ Repository information fetched")
-                
-                # Task 2: Conduct web research
-                task2 = progress.add_task("Conducting web research...", total=None)
-                web_results = await analyzer._conduct_web_research(repo_info)
-                progress.update(task2, completed=True, description="✅ Web research completed")
+                repo_info, web_results = await analyzer._fetch_repository_and_research(
+                    owner, repo_name
+                )
                 
-                # Task 3: Analyze with Claude
-                task3 = progress.add_task("Generating user stories with Claude...", total=None)
+                # Stage 2: Analyze with Claude
+                progress.update(task, advance=1, description="Generating user stories with Claude...")
                 analysis_result = await analyzer._analyze_with_claude(repo_info, web_results)
-                progress.update(task3, completed=True, description="✅ User stories generated")
-                
-                # Task 4: Format and display results
-                task4 = progress.add_task("Formatting results...", total=None)
                 
-                # Display results
-                _display_analysis_results(analysis_result, config)
+                # Stage 3: Format and display results
+                progress.update(task, advance=1, description="Formatting results...")
                 
-                # Save to file if specified
+                # Save to file if specified, while the results are displayed;
+                # rendering runs in a thread so a slow terminal doesn't hold
+                # up the event loop
+                save_task = None
                 if config.output_file:
-                    await analyzer._save_output(analysis_result)
+                    save_task = asyncio.create_task(analyzer._save_output(analysis_result))
+                
+                # Display results; the save is awaited even if display fails,
+                # so it never outlives this run or loses its error
+                try:
+                    await asyncio.to_thread(_display_analysis_results, analysis_result, config)
+                finally:
+                    if save_task is not None:
+                        await save_task
+                
+                if save_task is not None:
                     console.print(f"\n💾 Results saved to: [bold green]{config.output_file}[/bold green]")
                 
-                progress.update(task4, completed=True, description="✅ Analysis complete")
+                progress.update(task, advance=1, description="✅ Analysis complete")
                 
             except RepositoryNotFoundError:
-                console.print(f"[red]❌ Repository {owner}/{repo_name} not found[/red]")
-                sys.exit(1)
+                raise _CliExit(f"[red]❌ Repository {owner}/{repo_name} not found[/red]")
             except ClaudeAnalysisError as e:
-                console.print(f"[red]❌ Claude analysis failed: {e}[/red]")
-                sys.exit(1)
+                raise _CliExit(f"[red]❌ Claude analysis failed: {e}[/red]")
             except Exception as e:
-                console.print(f"[red]❌ Analysis failed: {e}[/red]")
-                sys.exit(1)
+                raise _CliExit(f"[red]❌ Analysis failed: {e}[/red]")
+
+
+async def _run_batch_analysis(repos: list, config: AnalyzerConfig, output_dir: Path, concurrency: int):
+    """Analyze several repositories with one analyzer, a few at a time.
+    
+    Sharing the analyzer reuses its HTTP connection pools, caches and rate
+    limiter across repositories; the semaphore bounds concurrent Claude
+    queries. A failed repository is reported without stopping the rest.
+    """
+    import asyncio
+    from rich.progress import Progress, SpinnerColumn, TextColumn
+    
+    console = _console()
+    extension = config.output_format.get_file_extension()
+    failures = 0
+    
+    async with GitHubRepoAnalyzer(config) as analyzer:
+        semaphore = asyncio.Semaphore(concurrency)
+        
+        with Progress(
+            SpinnerColumn(),
+            TextColumn("[progress.description]{task.description}"),
+            TextColumn("{task.completed}/{task.total}"),
+            console=console,
+            refresh_per_second=4
+        ) as progress:
+            task = progress.add_task(f"Analyzing {len(repos)} repositories...", total=len(repos))
+            
+            async def analyze_one(owner: str, repo_name: str):
+                nonlocal failures
+                async with semaphore:
+                    try:
+                        repo_info, web_results = await analyzer._fetch_repository_and_research(
+                            owner, repo_name
+                        )
+                        analysis_result = await analyzer._analyze_with_claude(repo_info, web_results)
+                        output_file = output_dir / f"{owner}-{repo_name}-user-stories{extension}"
+                        await analyzer.output_formatter.save_to_file_async(analysis_result, output_file)
+                    except (GitHubRepoAnalyzerError, OSError) as e:
+                        failures += 1
+                        console.print(f"[red]❌ {owner}/{repo_name}: {e}[/red]")
+                    else:
+                        console.print(
+                            f"✅ {owner}/{repo_name}: {len(analysis_result.user_stories)} user stories "
+                            f"saved to [bold green]{output_file}[/bold green]"
+                        )
+                    progress.advance(task)
+            
+            await asyncio.gather(*(analyze_one(owner, repo_name) for owner, repo_name in repos))
+    
+    if failures:
+        raise _CliExit(f"[red]❌ {failures} of {len(repos)} repositories failed[/red]")
 
 
 async def _check_rate_limit(config: AnalyzerConfig):
     """Check GitHub API rate limit status."""
+    from rich.panel import Panel
+    from rich.table import Table
+    
+    console = _console()
     
     console.print(Panel("📊 Checking GitHub API rate limit status", style="blue"))
     
     try:
         async with GitHubRepoAnalyzer(config) as analyzer:
-            rate_limit_info = analyzer.github_client.get_rate_limit_info()
+            rate_limit_info = await analyzer.github_client.get_rate_limit_info_async()
             
             if rate_limit_info and 'resources' in rate_limit_info:
-                core = rate_limit_info['resources'].get('core', {})
-                search = rate_limit_info['resources'].get('search', {})
+                resources = rate_limit_info['resources']
                 
                 table = Table(title="GitHub API Rate Limits")
                 table.add_column("Resource", style="cyan")
@@ -470,31 +722,19 @@ async def _check_rate_limit(config: AnalyzerConfig):
                 table.add_column("Remaining", style="yellow")
                 table.add_column("Reset Time", style="blue")
                 
-                # Core API
-                if core:
-                    reset_time = core.get('reset')
-                    if reset_time:
-                        from datetime import datetime
-                        reset_datetime = datetime.fromtimestamp(reset_time)
-                        table.add_row(
-                            "Core API",
-                            str(core.get('limit', 'N/A')),
-                            str(core.get('remaining', 'N/A')),
-                            reset_datetime.strftime('%Y-%m-%d %H:%M:%S')
-                        )
-                
-                # Search API
-                if search:
-                    reset_time = search.get('reset')
-                    if reset_time:
-                        from datetime import datetime
-                        reset_datetime = datetime.fromtimestamp(reset_time)
-                        table.add_row(
-                            "Search API",
-                            str(search.get('limit', 'N/A')),
-                            str(search.get('remaining', 'N/A')),
-                            reset_datetime.strftime('%Y-%m-%d %H:%M:%S')
-                        )
+                # Resources without a reset time aren't reported for this account
+                rows = [
+                    (
+                        label,
+                        f"{resource.get('limit', 'N/A')}",
+                        f"{resource.get('remaining', 'N/A')}",
+                        f"{datetime.fromtimestamp(resource['reset']):%Y-%m-%d %H:%M:%S}"
+                    )
+                    for key, label in _RATE_LIMIT_RESOURCES
+                    if (resource := resources.get(key)) and resource.get('reset')
+                ]
+                for row in rows:
+                    table.add_row(*row)
                 
                 console.print(table)
                 
@@ -513,295 +753,378 @@ async def _check_rate_limit(config: AnalyzerConfig):
 
 async def _get_repo_info(owner: str, repo_name: str, config: AnalyzerConfig):
     """Get basic repository information."""
+    from rich.console import Group
+    from rich.panel import Panel
+    from rich.table import Table
+    
+    console = _console()
     
     console.print(Panel(f"📋 Repository Information: [bold blue]{owner}/{repo_name}[/bold blue]", style="blue"))
     
     try:
         async with GitHubRepoAnalyzer(config) as analyzer:
-            repo_info = await analyzer._fetch_repository_info(owner, repo_name)
+            # Only a preview of the README is shown, so don't download all of it;
+            # UTF-8 needs at most 4 bytes per character, and the extra character
+            # tells whether the preview is truncated
+            repo_info, readme_preview = await analyzer._fetch_repository_overview(
+                owner, repo_name, readme_bytes=4 * (_README_PREVIEW_CHARS + 1)
+            )
             
             # Display repository information
             table = Table(title="Repository Details")
             table.add_column("Property", style="cyan")
             table.add_column("Value", style="white")
             
-            table.add_row("Full Name", repo_info.full_name)
-            table.add_row("Description", repo_info.description or "No description")
-            table.add_row("Language", repo_info.language or "Not specified")
-            table.add_row("Stars", str(repo_info.stars))
-            table.add_row("Forks", str(repo_info.forks))
-            table.add_row("Topics", ", ".join(repo_info.topics) if repo_info.topics else "None")
-            table.add_row("License", repo_info.license or "Not specified")
-            table.add_row("Created", repo_info.created_at.strftime('%Y-%m-%d'))
-            table.add_row("Updated", repo_info.updated_at.strftime('%Y-%m-%d'))
-            table.add_row("Size", f"{repo_info.size:,} KB")
-            table.add_row("Default Branch", repo_info.default_branch)
+            rows = [
+                ("Full Name", repo_info.full_name),
+                ("Description", repo_info.description or "No description"),
+                ("Language", repo_info.language or "Not specified"),
+                ("Stars", str(repo_info.stars)),
+                ("Forks", str(repo_info.forks)),
+                ("Topics", ", ".join(repo_info.topics) if repo_info.topics else "None"),
+                ("License", repo_info.license or "Not specified"),
+                ("Created", repo_info.created_date),
+                ("Updated", repo_info.updated_date),
+                ("Size", f"{repo_info.size:,} KB"),
+                ("Default Branch", repo_info.default_branch),
+            ]
+            add_row = table.add_row
+            for row in rows:
+                add_row(*row)
             
-            console.print(table)
+            renderables = [table]
             
             # Show README preview if available
-            if repo_info.readme_content:
-                console.print("\n📖 README Preview:")
-                preview = repo_info.readme_content[:500] + "..." if len(repo_info.readme_content) > 500 else repo_info.readme_content
-                console.print(Panel(preview, title="README", style="green"))
-                
+            if readme_preview:
+                preview = readme_preview[:_README_PREVIEW_CHARS]
+                if len(readme_preview) > _README_PREVIEW_CHARS:
+                    preview += "..."
+                renderables.append("\n📖 README Preview:")
+                renderables.append(Panel(preview, title="README", style="green"))
+            
+            console.print(Group(*renderables))
+            
     except RepositoryNotFoundError:
-        console.print(f"[red]❌ Repository {owner}/{repo_name} not found[/red]")
-        sys.exit(1)
+        raise _CliExit(f"[red]❌ Repository {owner}/{repo_name} not found[/red]")
     except Exception as e:
         console.print(f"[red]❌ Error fetching repository information: {e}[/red]")
 
 
-def _display_comprehensive_results(analysis_result, config: AnalyzerConfig):
-    """Display comprehensive analysis results with architecture diagrams."""
+@functools.lru_cache(maxsize=256)
+def _pretty(key: str) -> str:
+    """Turn a snake_case key such as ``build_tool`` into a ``Build Tool`` label."""
+    return key.replace('_', ' ').title()
+
+
+def _flush_lines(console, lines: list) -> None:
+    """Print buffered markup lines with a single console call and clear them.
     
-    console.print("\n" + "="*100)
-    console.print(Panel(f"🏗️ Comprehensive Analysis: [bold blue]{analysis_result.repository.full_name}[/bold blue]", style="green"))
-    console.print("="*100)
+    Display functions collect each section's lines and flush them together,
+    so Rich parses markup once per section instead of once per line.
+    """
+    if lines:
+        console.print("\n".join(lines))
+        lines.clear()
+
+
+def _repo_overview(heading: str, rows, prefix: str = "   "):
+    """Build the repository overview block that opens a result display.
     
-    # Repository summary
-    console.print(f"\n📊 [bold]Repository Summary:[/bold]")
-    console.print(f"   Description: {analysis_result.repository.description or 'No description available'}")
-    console.print(f"   Language: {analysis_result.repository.language or 'Not specified'}")
-    console.print(f"   Stars: {analysis_result.repository.stars}")
-    console.print(f"   Topics: {', '.join(analysis_result.repository.topics) if analysis_result.repository.topics else 'None'}")
-    
-    # System Architecture Diagrams
-    if analysis_result.system_architecture:
-        console.print(f"\n🏗️ [bold]System Architecture:[/bold]")
-        
-        if analysis_result.system_architecture.system_diagram:
-            console.print("\n📐 [bold cyan]System Architecture Diagram:[/bold cyan]")
-            console.print("```mermaid")
-            console.print(analysis_result.system_architecture.system_diagram)
-            console.print("```")
-        
-        if analysis_result.system_architecture.api_flow_diagram:
-            console.print("\n🔄 [bold cyan]API Flow Diagram:[/bold cyan]")
-            console.print("```mermaid")
-            console.print(analysis_result.system_architecture.api_flow_diagram)
-            console.print("```")
-        
-        if analysis_result.system_architecture.data_flow_diagram:
-            console.print("\n💾 [bold cyan]Data Flow Diagram:[/bold cyan]")
-            console.print("```mermaid")
-            console.print(analysis_result.system_architecture.data_flow_diagram)
-            console.print("```")
-        
-        if analysis_result.system_architecture.component_diagram:
-            console.print("\n🧩 [bold cyan]Component Architecture:[/bold cyan]")
-            console.print("```mermaid")
-            console.print(analysis_result.system_architecture.component_diagram)
-            console.print("```")
-    
-    # API Analysis
-    if analysis_result.api_analysis:
-        console.print(f"\n🌐 [bold]API & Integration Analysis:[/bold]")
-        
-        if analysis_result.api_analysis.endpoints:
-            console.print("   [bold]API Endpoints:[/bold]")
-            for endpoint in analysis_result.api_analysis.endpoints[:5]:
-                if isinstance(endpoint, dict):
-                    console.print(f"   • {endpoint.get('method', 'GET')} {endpoint.get('path', endpoint.get('name', str(endpoint)))}")
-                else:
-                    console.print(f"   • {endpoint}")
-        
-        if analysis_result.api_analysis.external_services:
-            console.print("   [bold]External Services:[/bold]")
-            for service in analysis_result.api_analysis.external_services:
-                console.print(f"   • {service}")
-        
-        if analysis_result.api_analysis.websocket_events:
-            console.print("   [bold]WebSocket Events:[/bold]")
-            for event in analysis_result.api_analysis.websocket_events:
-                console.print(f"   • {event}")
-    
-    # Technical Deep Dive
-    if analysis_result.technical_deep_dive:
-        console.print(f"\n🔧 [bold]Technology Stack:[/bold]")
-        
-        tech_stack = analysis_result.technical_deep_dive.technology_stack
-        for category, technologies in tech_stack.items():
-            if technologies:
-                console.print(f"   [bold]{category.title()}:[/bold]")
-                for tech in technologies:
-                    console.print(f"   • {tech}")
+    Values are appended as plain text, so repository descriptions and topics
+    are never parsed as markup.
+    """
+    from rich.text import Text
+    
+    overview = Text.assemble("\n📊 ", (f"{heading}:", "bold"))
+    for label, value in rows:
+        overview.append(f"\n{prefix}{label}: {value}")
+    return overview
+
+
+def _present_diagrams(architecture, specs) -> list:
+    """Return (icon, title, caption, code) for each diagram in specs that has code."""
+    if not architecture:
+        return []
+    return [
+        (icon, title, caption, code)
+        for attr, icon, title, caption in specs
+        if (code := getattr(architecture, attr))
+    ]
+
+
+def _emit_mermaid(
+    console, lines: list, icon: str, title: str, code: str, caption: Optional[str] = None
+) -> None:
+    """Print a titled Mermaid code block after any pending markup lines.
     
-    # User Stories Section
-    console.print(f"\n📝 [bold]User Stories ({len(analysis_result.user_stories)}):[/bold]")
+    The block is parsed into a Text once and cached by a hash of its content,
+    so showing the same diagram again skips markup parsing.
+    """
+    from rich.text import Text
     
-    for i, story in enumerate(analysis_result.user_stories, 1):
-        console.print(f"\n🎯 [bold]Story {i}: {story.title}[/bold]")
-        console.print(f"   {story.description}")
-        
-        if story.acceptance_criteria:
-            console.print(f"   [bold]Acceptance Criteria:[/bold]")
-            for criterion in story.acceptance_criteria:
-                console.print(f"   • {criterion.description}")
-        
-        console.print(f"   [bold]Priority:[/bold] {story.priority.value} | [bold]Effort:[/bold] {story.effort.value}")
-        
-        if story.tags:
-            console.print(f"   [bold]Tags:[/bold] {', '.join(story.tags)}")
-        
-        console.print("   " + "-"*80)
+    block = [f"\n{icon} [bold cyan]{title}:[/bold cyan]"]
+    if caption:
+        block.append(f"[dim]{caption}[/dim]")
+    block += ["```mermaid", code, "```"]
+    markup = "\n".join(block)
     
-    # Comprehensive Report
-    if analysis_result.comprehensive_report:
-        console.print(f"\n📋 [bold]Technical Report Summary:[/bold]")
-        # Show first few lines of the report
-        report_lines = analysis_result.comprehensive_report.split('\n')[:10]
-        for line in report_lines:
-            console.print(f"   {line}")
-        if len(analysis_result.comprehensive_report.split('\n')) > 10:
-            console.print("   [italic]... (truncated, see full report in output file)[/italic]")
+    key = hashlib.blake2b(markup.encode("utf-8"), digest_size=16).digest()
+    text = _MERMAID_BLOCKS.get(key)
+    if text is None:
+        if len(_MERMAID_BLOCKS) >= _MERMAID_BLOCKS_MAX:
+            # Drop the oldest entry; dicts keep insertion order
+            del _MERMAID_BLOCKS[next(iter(_MERMAID_BLOCKS))]
+        text = _MERMAID_BLOCKS[key] = Text.from_markup(markup)
+    
+    _flush_lines(console, lines)
+    console.print(text)
 
 
-def _display_architecture_results(analysis_result, config: AnalyzerConfig):
-    """Display architecture-focused analysis results."""
+def _iter_report_sections(report: str):
+    """Yield a report's sections as lists of lines, starting a new one at each header.
     
-    console.print("\n" + "="*100)
-    console.print(Panel(f"🏗️ Architecture Analysis: [bold blue]{analysis_result.repository.full_name}[/bold blue]", style="cyan"))
-    console.print("="*100)
+    Header positions are found by a regex scan and sections are produced
+    lazily, so callers that only show the first few stop scanning the
+    report once they have them.
+    """
+    start = 0
+    for match in _HEADER_RE.finditer(report):
+        if match.start() > start:
+            yield report[start:match.start()].splitlines()
+            start = match.start()
+    if start < len(report):
+        yield report[start:].splitlines()
+
+
+def _plain_dump(console, lines: list, plain_lines: list) -> None:
+    """Write lines that contain no markup to the console in one block.
     
-    # Repository summary
-    console.print(f"\n📊 [bold]Repository Overview:[/bold]")
-    console.print(f"   • Description: {analysis_result.repository.description or 'No description available'}")
-    console.print(f"   • Primary Language: {analysis_result.repository.language or 'Not specified'}")
-    console.print(f"   • Stars: {analysis_result.repository.stars:,}")
-    console.print(f"   • Size: {analysis_result.repository.size:,} KB")
-    
-    # System Architecture Diagrams - Main Focus
-    if analysis_result.system_architecture:
-        console.print(f"\n🏗️ [bold yellow]SYSTEM ARCHITECTURE DIAGRAMS[/bold yellow]")
-        console.print("=" * 60)
-        
-        if analysis_result.system_architecture.system_diagram:
-            console.print("\n📐 [bold cyan]Overall System Architecture:[/bold cyan]")
-            console.print("[dim]Copy this Mermaid code to visualize the diagram:[/dim]")
-            console.print("```mermaid")
-            console.print(analysis_result.system_architecture.system_diagram)
-            console.print("```")
-        
-        if analysis_result.system_architecture.api_flow_diagram:
-            console.print("\n🔄 [bold cyan]API & Data Flow:[/bold cyan]")
-            console.print("[dim]API request/response flow and data processing:[/dim]")
-            console.print("```mermaid")
-            console.print(analysis_result.system_architecture.api_flow_diagram)
-            console.print("```")
-        
-        if analysis_result.system_architecture.component_diagram:
-            console.print("\n🧩 [bold cyan]Component Architecture:[/bold cyan]")
-            console.print("[dim]Internal component structure and relationships:[/dim]")
-            console.print("```mermaid")
-            console.print(analysis_result.system_architecture.component_diagram)
-            console.print("```")
-        
-        if analysis_result.system_architecture.data_flow_diagram:
-            console.print("\n💾 [bold cyan]Data Flow Architecture:[/bold cyan]")
-            console.print("[dim]How data moves through the system:[/dim]")
-            console.print("```mermaid")
-            console.print(analysis_result.system_architecture.data_flow_diagram)
-            console.print("```")
-    
-    # API & Integration Analysis
-    if analysis_result.api_analysis:
-        console.print(f"\n🌐 [bold yellow]API & INTEGRATION ANALYSIS[/bold yellow]")
-        console.print("=" * 60)
-        
-        if analysis_result.api_analysis.endpoints:
-            console.print("\n📡 [bold]API Endpoints:[/bold]")
-            for i, endpoint in enumerate(analysis_result.api_analysis.endpoints[:10], 1):
-                if isinstance(endpoint, dict):
-                    method = endpoint.get('method', 'GET')
-                    path = endpoint.get('path', endpoint.get('name', 'Unknown'))
-                    desc = endpoint.get('description', '')
-                    console.print(f"   {i:2d}. [bold]{method}[/bold] {path}")
-                    if desc:
-                        console.print(f"       {desc}")
-                else:
-                    console.print(f"   {i:2d}. {endpoint}")
-        
-        if analysis_result.api_analysis.external_services:
-            console.print("\n🔗 [bold]External Services & Integrations:[/bold]")
-            for i, service in enumerate(analysis_result.api_analysis.external_services, 1):
-                console.print(f"   {i:2d}. {service}")
-        
-        if analysis_result.api_analysis.authentication_methods:
-            console.print("\n🔐 [bold]Authentication Methods:[/bold]")
-            for auth in analysis_result.api_analysis.authentication_methods:
-                console.print(f"   • {auth}")
-        
-        if analysis_result.api_analysis.websocket_events:
-            console.print("\n⚡ [bold]Real-time Events:[/bold]")
-            for event in analysis_result.api_analysis.websocket_events:
-                console.print(f"   • {event}")
-    
-    # Technology Stack Deep Dive
-    if analysis_result.technical_deep_dive:
-        console.print(f"\n🔧 [bold yellow]TECHNICAL DEEP DIVE[/bold yellow]")
-        console.print("=" * 60)
-        
-        tech_stack = analysis_result.technical_deep_dive.technology_stack
-        if tech_stack:
+    Pending markup lines are flushed first to keep the output in order. The
+    plain lines go through Console.out, which skips markup parsing and wrapping.
+    """
+    _flush_lines(console, lines)
+    console.out("\n".join(plain_lines))
+
+
+def _display_comprehensive_results(analysis_result, config: AnalyzerConfig):
+    """Display comprehensive analysis results with architecture diagrams."""
+    from rich.panel import Panel
+    
+    console = _console()
+    repo = analysis_result.repository
+    buf: list = []
+    
+    # Everything is rendered into the console buffer and written out in one go
+    with console:
+        console.print("\n" + _EQ100)
+        console.print(Panel(f"🏗️ Comprehensive Analysis: [bold blue]{repo.full_name}[/bold blue]", style="green"))
+        
+        buf.append(_EQ100)
+        
+        # Repository summary
+        _flush_lines(console, buf)
+        console.print(_repo_overview("Repository Summary", [
+            ("Description", repo.description or 'No description available'),
+            ("Language", repo.language or 'Not specified'),
+            ("Stars", repo.stars),
+            ("Topics", ', '.join(repo.topics) if repo.topics else 'None'),
+        ]))
+        
+        # System Architecture Diagrams
+        diagrams = _present_diagrams(analysis_result.system_architecture, _COMPREHENSIVE_DIAGRAMS)
+        if diagrams:
+            buf.append(f"\n🏗️ [bold]System Architecture:[/bold]")
+            for icon, title, caption, code in diagrams:
+                _emit_mermaid(console, buf, icon, title, code, caption)
+            _flush_lines(console, buf)
+        
+        # API Analysis
+        api = analysis_result.api_analysis
+        if api:
+            buf.append(f"\n🌐 [bold]API & Integration Analysis:[/bold]")
+            
+            if api.endpoints:
+                buf.append("   [bold]API Endpoints:[/bold]")
+                for endpoint in itertools.islice(api.endpoints, 5):
+                    if isinstance(endpoint, dict):
+                        buf.append(f"{_BULLET}{endpoint.get('method', 'GET')} {endpoint.get('path', endpoint.get('name', str(endpoint)))}")
+                    else:
+                        buf.append(f"{_BULLET}{endpoint}")
+            
+            if api.external_services:
+                buf.append("   [bold]External Services:[/bold]")
+                _plain_dump(console, buf, [f"{_BULLET}{service}" for service in api.external_services])
+            
+            if api.websocket_events:
+                buf.append("   [bold]WebSocket Events:[/bold]")
+                _plain_dump(console, buf, [f"{_BULLET}{event}" for event in api.websocket_events])
+            _flush_lines(console, buf)
+        
+        # Technical Deep Dive
+        deep_dive = analysis_result.technical_deep_dive
+        if deep_dive:
+            buf.append(f"\n🔧 [bold]Technology Stack:[/bold]")
+            
+            tech_stack = deep_dive.technology_stack
             for category, technologies in tech_stack.items():
                 if technologies:
-                    console.print(f"\n🏷️ [bold]{category.replace('_', ' ').title()}:[/bold]")
-                    for tech in technologies:
-                        console.print(f"   • {tech}")
-        
-        # Build system info
-        if analysis_result.technical_deep_dive.build_system:
-            console.print(f"\n🏗️ [bold]Build System:[/bold]")
-            build_info = analysis_result.technical_deep_dive.build_system
-            for key, value in build_info.items():
-                if value:
-                    console.print(f"   • {key.replace('_', ' ').title()}: {value}")
-        
-        # Performance optimizations
-        if analysis_result.technical_deep_dive.performance_optimizations:
-            console.print(f"\n⚡ [bold]Performance Optimizations:[/bold]")
-            for opt in analysis_result.technical_deep_dive.performance_optimizations:
-                console.print(f"   • {opt}")
+                    buf.append(f"   [bold]{category.title()}:[/bold]")
+                    buf.extend(f"{_BULLET}{tech}" for tech in technologies)
+            _flush_lines(console, buf)
         
-        # Security features
-        if analysis_result.technical_deep_dive.security_features:
-            console.print(f"\n🛡️ [bold]Security Features:[/bold]")
-            for security in analysis_result.technical_deep_dive.security_features:
-                console.print(f"   • {security}")
-    
-    # Technical Report Summary
-    if analysis_result.comprehensive_report:
-        console.print(f"\n📋 [bold yellow]TECHNICAL INSIGHTS[/bold yellow]")
-        console.print("=" * 60)
-        # Show key insights from the technical report
-        report_lines = analysis_result.comprehensive_report.split('\n')
-        key_sections = []
-        current_section = []
-        
-        for line in report_lines:
-            if line.startswith('#') and current_section:
-                key_sections.append('\n'.join(current_section))
-                current_section = [line]
-            else:
-                current_section.append(line)
+        # User Stories Section
+        buf.append(f"\n📝 [bold]User Stories ({len(analysis_result.user_stories)}):[/bold]")
         
-        if current_section:
-            key_sections.append('\n'.join(current_section))
-        
-        # Show first 2-3 sections
-        for section in key_sections[:3]:
-            lines = section.split('\n')[:5]  # First 5 lines of each section
-            for line in lines:
-                if line.strip():
-                    console.print(f"   {line}")
-            console.print()
-        
-        if len(key_sections) > 3:
-            console.print("   [italic]... (Full technical report saved to output file)[/italic]")
+        for i, story in enumerate(analysis_result.user_stories, 1):
+            buf.append(f"\n🎯 [bold]Story {i}: {story.title}[/bold]")
+            buf.append(f"   {story.description}")
+            
+            if story.acceptance_criteria:
+                buf.append(f"   [bold]Acceptance Criteria:[/bold]")
+                for criterion in story.acceptance_criteria:
+                    buf.append(f"{_BULLET}{criterion.description}")
+            
+            buf.append(f"   [bold]Priority:[/bold] {story.priority.value} | [bold]Effort:[/bold] {story.effort.value}")
+            
+            if story.tags:
+                buf.append(f"   [bold]Tags:[/bold] {', '.join(story.tags)}")
+            
+            buf.append(_STORY_RULE)
+        _flush_lines(console, buf)
+        
+        # Comprehensive Report
+        if analysis_result.comprehensive_report:
+            buf.append(f"\n📋 [bold]Technical Report Summary:[/bold]")
+            # Show first few lines of the report
+            all_lines = analysis_result.comprehensive_report.splitlines()
+            buf.extend(f"   {line}" for line in itertools.islice(all_lines, 10))
+            if len(all_lines) > 10:
+                buf.append("   [italic]... (truncated, see full report in output file)[/italic]")
+            _flush_lines(console, buf)
+
+
+def _display_architecture_results(analysis_result, config: AnalyzerConfig):
+    """Display architecture-focused analysis results."""
+    from rich.panel import Panel
+    from rich.text import Text
     
-    console.print(f"\n[bold green]✅ Architecture Analysis Complete![/bold green]")
-    console.print("[dim]Tip: Copy the Mermaid diagram codes above to visualize them at https://mermaid.live[/dim]")
+    console = _console()
+    repo = analysis_result.repository
+    buf: list = []
+    
+    # Everything is rendered into the console buffer and written out in one go
+    with console:
+        console.print("\n" + _EQ100)
+        console.print(Panel(f"🏗️ Architecture Analysis: [bold blue]{repo.full_name}[/bold blue]", style="cyan"))
+        
+        buf.append(_EQ100)
+        
+        # Repository summary
+        _flush_lines(console, buf)
+        console.print(_repo_overview("Repository Overview", [
+            ("Description", repo.description or 'No description available'),
+            ("Primary Language", repo.language or 'Not specified'),
+            ("Stars", f"{repo.stars:,}"),
+            ("Size", f"{repo.size:,} KB"),
+        ], prefix=_BULLET))
+        
+        # System Architecture Diagrams - Main Focus
+        diagrams = _present_diagrams(analysis_result.system_architecture, _ARCHITECTURE_DIAGRAMS)
+        if diagrams:
+            buf.append(f"\n🏗️ [bold yellow]SYSTEM ARCHITECTURE DIAGRAMS[/bold yellow]")
+            buf.append(_EQ60)
+            for icon, title, caption, code in diagrams:
+                _emit_mermaid(console, buf, icon, title, code, caption)
+            _flush_lines(console, buf)
+        
+        # API & Integration Analysis
+        api = analysis_result.api_analysis
+        if api:
+            buf.append(f"\n🌐 [bold yellow]API & INTEGRATION ANALYSIS[/bold yellow]")
+            buf.append(_EQ60)
+            
+            if api.endpoints:
+                buf.append("\n📡 [bold]API Endpoints:[/bold]")
+                _flush_lines(console, buf)
+                endpoint_lines = []
+                for i, endpoint in enumerate(itertools.islice(api.endpoints, 10), 1):
+                    if isinstance(endpoint, dict):
+                        method = endpoint.get('method', 'GET')
+                        path = endpoint.get('path', endpoint.get('name', 'Unknown'))
+                        desc = endpoint.get('description', '')
+                        endpoint_lines.append(Text.assemble(f"   {i:2d}. ", (method, "bold"), f" {path}"))
+                        if desc:
+                            endpoint_lines.append(Text(f"       {desc}"))
+                    else:
+                        endpoint_lines.append(Text(f"   {i:2d}. {endpoint}"))
+                console.print(Text("\n").join(endpoint_lines))
+            
+            if api.external_services:
+                buf.append("\n🔗 [bold]External Services & Integrations:[/bold]")
+                _plain_dump(console, buf, [
+                    f"   {i:2d}. {service}" for i, service in enumerate(api.external_services, 1)
+                ])
+            
+            if api.authentication_methods:
+                buf.append("\n🔐 [bold]Authentication Methods:[/bold]")
+                _plain_dump(console, buf, [f"{_BULLET}{auth}" for auth in api.authentication_methods])
+            
+            if api.websocket_events:
+                buf.append("\n⚡ [bold]Real-time Events:[/bold]")
+                _plain_dump(console, buf, [f"{_BULLET}{event}" for event in api.websocket_events])
+            _flush_lines(console, buf)
+        
+        # Technology Stack Deep Dive
+        deep_dive = analysis_result.technical_deep_dive
+        if deep_dive:
+            buf.append(f"\n🔧 [bold yellow]TECHNICAL DEEP DIVE[/bold yellow]")
+            buf.append(_EQ60)
+            
+            tech_stack = deep_dive.technology_stack
+            if tech_stack:
+                for category, technologies in tech_stack.items():
+                    if technologies:
+                        buf.append(f"\n🏷️ [bold]{_pretty(category)}:[/bold]")
+                        buf.extend(f"{_BULLET}{tech}" for tech in technologies)
+            
+            # Build system info
+            if deep_dive.build_system:
+                buf.append(f"\n🏗️ [bold]Build System:[/bold]")
+                build_info = deep_dive.build_system
+                for key, value in build_info.items():
+                    if value:
+                        buf.append(f"{_BULLET}{_pretty(key)}: {value}")
+            
+            # Performance optimizations
+            if deep_dive.performance_optimizations:
+                buf.append(f"\n⚡ [bold]Performance Optimizations:[/bold]")
+                buf.extend(f"{_BULLET}{opt}" for opt in deep_dive.performance_optimizations)
+            
+            # Security features
+            if deep_dive.security_features:
+                buf.append(f"\n🛡️ [bold]Security Features:[/bold]")
+                buf.extend(f"{_BULLET}{security}" for security in deep_dive.security_features)
+            _flush_lines(console, buf)
+        
+        # Technical Report Summary
+        if analysis_result.comprehensive_report:
+            buf.append(f"\n📋 [bold yellow]TECHNICAL INSIGHTS[/bold yellow]")
+            buf.append(_EQ60)
+            # Show key insights from the technical report
+            sections = _iter_report_sections(analysis_result.comprehensive_report)
+            
+            # Show first 2-3 sections
+            for section_lines in itertools.islice(sections, 3):
+                # First 5 lines of each section
+                buf.extend(f"   {line}" for line in itertools.islice(section_lines, 5) if line.strip())
+                buf.append("")
+            
+            if next(sections, None) is not None:
+                buf.append("   [italic]... (Full technical report saved to output file)[/italic]")
+        
+        buf.append(f"\n[bold green]✅ Architecture Analysis Complete![/bold green]")
+        buf.append("[dim]Tip: Copy the Mermaid diagram codes above to visualize them at https://mermaid.live[/dim]")
+        _flush_lines(console, buf)
 
 
 async def _run_test_generation(
@@ -815,30 +1138,25 @@ async def _run_test_generation(
     include_api: bool
 ):
     """Run test generation for a repository."""
+    from .enhanced_analyzer import EnhancedClaudeAnalyzer
+    from .test_generator import TestGenerator
     
-    console.print(Panel(f"🧪 Test Generation: [bold blue]{owner}/{repo_name}[/bold blue]", style="green"))
+    console = _console()
     
-    with Progress(
-        SpinnerColumn(),
-        TextColumn("[progress.description]{task.description}"),
-        console=console
-    ) as progress:
+    async with _progress_ctx(f"🧪 Test Generation: [bold blue]{owner}/{repo_name}[/bold blue]", style="green") as progress:
         
-        task1 = progress.add_task("Fetching repository information...", total=None)
+        # One row whose description follows the current step
+        task = progress.add_task("Fetching repository information and conducting web research...", total=4)
         
         async with GitHubRepoAnalyzer(config) as analyzer:
             try:
-                # Fetch repository info
-                repo_info = await analyzer._fetch_repository_info(owner, repo_name)
-                progress.update(task1, completed=True, description="✅ Repository information fetched")
-                
-                # Task 2: Conduct web research
-                task2 = progress.add_task("Conducting web research...", total=None)
-                web_results = await analyzer._conduct_web_research(repo_info)
-                progress.update(task2, completed=True, description="✅ Web research completed")
-                
-                # Task 3: Generate user stories first
-                task3 = progress.add_task("Generating user stories for test generation...", total=None)
+                # Fetch repository info and conduct web research; the research
+                # overlaps with the README download
+                repo_info, web_results = await analyzer._fetch_repository_and_research(
+                    owner, repo_name
+                )
+                # Step 2: Generate user stories first
+                progress.update(task, advance=1, description="Generating user stories for test generation...")
                 
                 enhanced_analyzer = EnhancedClaudeAnalyzer(config.claude)
                 analysis_result = await enhanced_analyzer.analyze_repository_comprehensive(
@@ -850,10 +1168,8 @@ async def _run_test_generation(
                     include_api_analysis=False
                 )
                 
-                progress.update(task3, completed=True, description="✅ User stories generated")
-                
-                # Task 4: Generate tests from user stories
-                task4 = progress.add_task("Generating comprehensive test cases...", total=None)
+                # Step 3: Generate tests from user stories
+                progress.update(task, advance=1, description="Generating comprehensive test cases...")
                 
                 # Create test generation configuration
                 test_config = TestGenerationConfig(
@@ -871,152 +1187,175 @@ async def _run_test_generation(
                     analysis_result, repo_info
                 )
                 
-                progress.update(task4, completed=True, description="✅ Test cases generated")
-                
-                # Task 5: Display and save results
-                task5 = progress.add_task("Formatting and saving test documentation...", total=None)
+                # Step 4: Display and save results
+                progress.update(task, advance=1, description="Formatting and saving test documentation...")
                 
                 # Display test generation results
                 _display_test_generation_results(test_documentation, config)
                 
                 # Save to file if specified
                 if config.output_file:
-                    # Create a test output formatter
-                    from .output_formatter import OutputFormatter
-                    test_formatter = OutputFormatter(config.output_format)
-                    test_formatter.save_test_documentation_to_file(test_documentation, config.output_file)
+                    analyzer.output_formatter.save_test_documentation_to_file(
+                        test_documentation, config.output_file
+                    )
                     console.print(f"\n💾 Test documentation saved to: [bold green]{config.output_file}[/bold green]")
                 
-                progress.update(task5, completed=True, description="✅ Test generation complete")
+                progress.update(task, advance=1, description="✅ Test generation complete")
                 
             except RepositoryNotFoundError:
-                console.print(f"[red]❌ Repository {owner}/{repo_name} not found[/red]")
-                sys.exit(1)
+                raise _CliExit(f"[red]❌ Repository {owner}/{repo_name} not found[/red]")
             except Exception as e:
                 console.print(f"[red]❌ Test generation failed: {e}[/red]")
                 if config.verbose:
-                    console.print_exception()
-                sys.exit(1)
+                    _print_exception(console)
+                raise _CliExit()
 
 
 def _display_test_generation_results(test_documentation, config: AnalyzerConfig):
     """Display the test generation results."""
+    from rich.panel import Panel
+    from rich.text import Text
     
-    console.print("\n" + "="*80)
+    console = _console()
+    buf: list = []
+    
+    console.print("\n" + _EQ80)
     console.print(Panel(f"🧪 Test Documentation for [bold blue]{test_documentation.repository_name}[/bold blue]", style="green"))
-    console.print("="*80)
+    
+    buf.append(_EQ80)
     
     # Test summary
-    console.print(f"\n📊 [bold]Test Summary:[/bold]")
-    console.print(f"   Total Test Cases: {test_documentation.total_test_cases}")
-    console.print(f"   Total Test Suites: {len(test_documentation.test_suites)}")
-    console.print(f"   Analysis Date: {test_documentation.analysis_date.strftime('%Y-%m-%d %H:%M:%S')}")
+    buf.append(f"\n📊 [bold]Test Summary:[/bold]")
+    buf.append(f"   Total Test Cases: {test_documentation.total_test_cases}")
+    buf.append(f"   Total Test Suites: {len(test_documentation.test_suites)}")
+    buf.append(f"   Analysis Date: {test_documentation.analysis_date.isoformat(sep=' ', timespec='seconds')}")
     
     # Test coverage
     if test_documentation.test_coverage:
-        console.print(f"\n📈 [bold]Test Coverage by Type:[/bold]")
+        buf.append(f"\n📈 [bold]Test Coverage by Type:[/bold]")
         for test_type, coverage in test_documentation.test_coverage.items():
-            console.print(f"   • {test_type.title()}: {coverage:.1f}%")
+            buf.append(f"{_BULLET}{test_type.title()}: {coverage:.1f}%")
+    _flush_lines(console, buf)
     
-    # Test suites
-    console.print(f"\n🧪 [bold]Test Suites ({len(test_documentation.test_suites)}):[/bold]")
+    # Test suites, built as Text so suite and test names are not parsed as markup
+    suite_lines = [Text.assemble("\n🧪 ", (f"Test Suites ({len(test_documentation.test_suites)}):", "bold"))]
     
     for i, suite in enumerate(test_documentation.test_suites, 1):
-        console.print(f"\n📋 [bold]Suite {i}: {suite.name}[/bold]")
-        console.print(f"   Description: {suite.description}")
-        console.print(f"   Test Type: {suite.test_type.value.title()}")
-        console.print(f"   Total Tests: {suite.total_tests}")
-        console.print(f"   User Stories: {', '.join(map(str, suite.user_story_ids))}")
+        suite_lines.append(Text.assemble("\n📋 ", (f"Suite {i}: {suite.name}", "bold")))
+        suite_lines.append(Text(f"   Description: {suite.description}"))
+        suite_lines.append(Text(f"   Test Type: {suite.test_type.value.title()}"))
+        suite_lines.append(Text(f"   Total Tests: {suite.total_tests}"))
+        suite_lines.append(Text(f"   User Stories: {suite.user_story_ids_text}"))
         
         # Show first few test cases
-        console.print(f"   [bold]Test Cases:[/bold]")
-        for j, test_case in enumerate(suite.test_cases[:3], 1):  # Show first 3
-            console.print(f"     {j}. {test_case.title} ({test_case.priority.value})")
+        suite_lines.append(Text.assemble("   ", ("Test Cases:", "bold")))
+        for j, test_case in enumerate(itertools.islice(suite.test_cases, 3), 1):  # Show first 3
+            suite_lines.append(Text(f"     {j}. {test_case.title} ({test_case.priority.value})"))
         
-        if len(suite.test_cases) > 3:
-            console.print(f"     ... and {len(suite.test_cases) - 3} more tests")
+        test_case_count = len(suite.test_cases)
+        if test_case_count > 3:
+            suite_lines.append(Text(f"     ... and {test_case_count - 3} more tests"))
         
-        console.print("   " + "-"*60)
+        suite_lines.append(Text(_SUITE_RULE))
+    console.print(Text("\n").join(suite_lines))
     
     # Testing strategy
     if test_documentation.testing_strategy:
-        console.print(f"\n📋 [bold]Testing Strategy:[/bold]")
-        strategy_lines = test_documentation.testing_strategy.split('\n')[:10]  # First 10 lines
-        for line in strategy_lines:
-            if line.strip():
-                console.print(f"   {line}")
+        buf.append(f"\n📋 [bold]Testing Strategy:[/bold]")
+        strategy_lines = test_documentation.testing_strategy.splitlines()
+        # First 10 lines
+        buf.extend(f"   {line}" for line in itertools.islice(strategy_lines, 10) if line.strip())
         
-        if len(test_documentation.testing_strategy.split('\n')) > 10:
-            console.print("   [italic]... (Full testing strategy saved to output file)[/italic]")
+        if len(strategy_lines) > 10:
+            buf.append("   [italic]... (Full testing strategy saved to output file)[/italic]")
     
     # Environment requirements
-    if test_documentation.test_environment_requirements:
-        console.print(f"\n🔧 [bold]Test Environment Requirements:[/bold]")
-        for req in test_documentation.test_environment_requirements[:8]:  # Show first 8
-            console.print(f"   • {req}")
-        
-        if len(test_documentation.test_environment_requirements) > 8:
-            console.print(f"   ... and {len(test_documentation.test_environment_requirements) - 8} more requirements")
+    requirements = test_documentation.test_environment_requirements
+    if requirements:
+        buf.append(f"\n🔧 [bold]Test Environment Requirements:[/bold]")
+        lines = [f"{_BULLET}{req}" for req in itertools.islice(requirements, 8)]  # Show first 8
+        
+        requirement_count = len(requirements)
+        if requirement_count > 8:
+            lines.append(f"   ... and {requirement_count - 8} more requirements")
+        _plain_dump(console, buf, lines)
     
-    console.print(f"\n[bold green]✅ Test Generation Complete![/bold green]")
-    console.print("[dim]Tip: Review the generated tests and customize them for your specific testing needs[/dim]")
+    buf.append(f"\n[bold green]✅ Test Generation Complete![/bold green]")
+    buf.append("[dim]Tip: Review the generated tests and customize them for your specific testing needs[/dim]")
+    _flush_lines(console, buf)
 
 
 def _display_analysis_results(analysis_result, config: AnalyzerConfig):
     """Display the analysis results."""
+    from rich.console import Group
+    from rich.panel import Panel
+    from rich.table import Table
+    from rich.text import Text
     
-    console.print("\n" + "="*80)
-    console.print(Panel(f"📋 Analysis Results for [bold blue]{analysis_result.repository.full_name}[/bold blue]", style="green"))
-    console.print("="*80)
+    console = _console()
+    repo = analysis_result.repository
     
     # Repository summary
-    console.print(f"\n📊 [bold]Repository Summary:[/bold]")
-    console.print(f"   Description: {analysis_result.repository.description or 'No description available'}")
-    console.print(f"   Language: {analysis_result.repository.language or 'Not specified'}")
-    console.print(f"   Stars: {analysis_result.repository.stars}")
-    console.print(f"   Forks: {analysis_result.repository.forks}")
-    console.print(f"   Topics: {', '.join(analysis_result.repository.topics) if analysis_result.repository.topics else 'None'}")
-    
+    summary = [
+        ("Description", repo.description or 'No description available'),
+        ("Language", repo.language or 'Not specified'),
+        ("Stars", repo.stars),
+        ("Forks", repo.forks),
+        ("Topics", ', '.join(repo.topics) if repo.topics else 'None'),
+    ]
     if analysis_result.focus_area:
-        console.print(f"   Focus Area: {analysis_result.focus_area}")
+        summary.append(("Focus Area", analysis_result.focus_area))
+    
+    # Everything is collected into one Group and printed with a single call;
+    # Text objects also keep repository content from being parsed as markup
+    lines = [
+        Text("\n" + _EQ80),
+        Panel(Text.assemble("📋 Analysis Results for ", (repo.full_name, "bold blue")), style="green"),
+        Text(_EQ80),
+        _repo_overview("Repository Summary", summary),
+    ]
     
     # Technology stack
     if analysis_result.tech_stack:
-        console.print(f"\n🔧 [bold]Technology Stack:[/bold]")
-        for tech in analysis_result.tech_stack:
-            console.print(f"   • {tech}")
+        lines.append(Text.assemble("\n🔧 ", ("Technology Stack:", "bold")))
+        lines.extend(Text(f"{_BULLET}{tech}") for tech in analysis_result.tech_stack)
     
     # Key features
     if analysis_result.key_features:
-        console.print(f"\n🎯 [bold]Key Features Identified:[/bold]")
-        for feature in analysis_result.key_features[:5]:
-            console.print(f"   • {feature}")
+        lines.append(Text.assemble("\n🎯 ", ("Key Features Identified:", "bold")))
+        lines.extend(Text(f"{_BULLET}{feature}") for feature in itertools.islice(analysis_result.key_features, 5))
     
     # Target users
     if analysis_result.target_users:
-        console.print(f"\n👥 [bold]Target Users:[/bold]")
-        for user in analysis_result.target_users:
-            console.print(f"   • {user}")
+        lines.append(Text.assemble("\n👥 ", ("Target Users:", "bold")))
+        lines.extend(Text(f"{_BULLET}{user}") for user in analysis_result.target_users)
     
-    # User stories
-    console.print(f"\n📝 [bold]User Stories ({len(analysis_result.user_stories)}):[/bold]")
+    # User stories, laid out in a single table
+    stories_table = Table(
+        title=f"\n📝 User Stories ({len(analysis_result.user_stories)})",
+        title_style="bold", show_lines=True
+    )
+    stories_table.add_column("#", justify="right")
+    stories_table.add_column("Title", style="bold")
+    stories_table.add_column("Description")
+    stories_table.add_column("Acceptance Criteria")
+    stories_table.add_column("Priority")
+    stories_table.add_column("Effort")
+    stories_table.add_column("Tags")
     
     for i, story in enumerate(analysis_result.user_stories, 1):
-        console.print(f"\n🎯 [bold]Story {i}: {story.title}[/bold]")
-        console.print(f"   {story.description}")
-        
-        if story.acceptance_criteria:
-            console.print(f"   [bold]Acceptance Criteria:[/bold]")
-            for criterion in story.acceptance_criteria:
-                console.print(f"   • {criterion.description}")
-        
-        console.print(f"   [bold]Priority:[/bold] {story.priority.value}")
-        console.print(f"   [bold]Effort:[/bold] {story.effort.value}")
-        
-        if story.tags:
-            console.print(f"   [bold]Tags:[/bold] {', '.join(story.tags)}")
-        
-        console.print("   " + "-"*60)
+        stories_table.add_row(
+            str(i),
+            Text(story.title),
+            Text(story.description),
+            Text("\n".join(f"• {criterion.description}" for criterion in story.acceptance_criteria)),
+            story.priority.value,
+            story.effort.value,
+            Text(", ".join(story.tags))
+        )
+    
+    lines.append(stories_table)
+    console.print(Group(*lines))
 
 
 def main():
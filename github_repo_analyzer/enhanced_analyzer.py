@@ -3,15 +3,16 @@ Enhanced analyzer that provides comprehensive repository analysis with system ar
 API mapping, and detailed technical analysis using Claude Code SDK.
 """
 
-import json
+import asyncio
 import anyio
-from typing import List, Optional, Dict, Any, Tuple
+from typing import Callable, ClassVar, List, Optional, Dict, Any, Tuple, Union
 from pathlib import Path
 from datetime import datetime
 
-from claude_code_sdk import query, ClaudeCodeOptions, AssistantMessage, TextBlock, ToolUseBlock, ToolResultBlock
+from claude_code_sdk import query, ClaudeCodeOptions, ClaudeSDKError, AssistantMessage, TextBlock, ToolUseBlock, ToolResultBlock
 from claude_code_sdk.types import Message
 
+from .claude_analyzer import _JSON_DECODE_ERRORS, _find_json_object, _json_loads
 from .types import (
     RepositoryInfo, UserStory, AcceptanceCriterion, StoryPriority, StoryEffort,
     AnalysisResult, ClaudeConfig, WebSearchResult, SystemArchitecture,
@@ -19,11 +20,200 @@ from .types import (
 )
 
 
+# Repositories that have a built-in enhanced analysis, mapping the exact
+# lowercase repository name to the EnhancedClaudeAnalyzer method name
+_FALLBACK_DISPATCH = {
+    "excalidraw": "_generate_excalidraw_architecture",
+}
+
+# Case-insensitive lookups for the enum values Claude returns
+_PRIORITY_MAP = {priority.value.lower(): priority for priority in StoryPriority}
+_EFFORT_MAP = {effort.value.lower(): effort for effort in StoryEffort}
+
+# Failures of a Claude query that are answered with fallback content; any
+# other exception is a bug and propagates. asyncio.TimeoutError is only an
+# alias of TimeoutError from Python 3.11, so both are listed.
+_QUERY_ERRORS = (
+    ClaudeSDKError, anyio.EndOfStream, ConnectionError, TimeoutError, asyncio.TimeoutError,
+    ValueError
+)
+
+# Top-level parts of a complete enhanced analysis
+_ENHANCED_ANALYSIS_KEYS = frozenset({
+    "system_architecture", "api_analysis", "technical_deep_dive", "comprehensive_report"
+})
+
+# Generic stories used when Claude returns none
+_GENERIC_STORIES = (
+    {
+        "title": "Core Functionality Access",
+        "description": "As a user, I want to access the main features of the application, so that I can accomplish my primary tasks efficiently.",
+        "acceptance_criteria": [
+            "User can navigate to main features easily",
+            "Core functionality loads within acceptable time",
+            "User interface is intuitive and responsive"
+        ],
+        "priority": "High",
+        "effort": "Medium",
+        "tags": ["core", "usability"]
+    },
+    {
+        "title": "Data Management",
+        "description": "As a user, I want to create, read, update, and delete my data, so that I can maintain control over my information.",
+        "acceptance_criteria": [
+            "User can create new data entries",
+            "User can view existing data clearly",
+            "User can modify data as needed",
+            "User can delete unwanted data safely"
+        ],
+        "priority": "High",
+        "effort": "Large",
+        "tags": ["data", "crud"]
+    },
+    {
+        "title": "User Experience Optimization",
+        "description": "As a user, I want a smooth and intuitive interface, so that I can work efficiently without confusion.",
+        "acceptance_criteria": [
+            "Interface follows consistent design patterns",
+            "Navigation is logical and predictable",
+            "Loading states provide clear feedback",
+            "Error messages are helpful and actionable"
+        ],
+        "priority": "Medium",
+        "effort": "Large",
+        "tags": ["ux", "interface"]
+    }
+)
+
+# Story tags that are reported as part of the technology stack
+_TECH_TAGS = frozenset({"api", "database", "frontend", "backend", "mobile", "web"})
+
+# Characters of README included in the user story prompt
+_README_LIMIT = 2000
+
+# Optional tasks of the enhanced analysis prompt, interpolated whole
+_ARCH_SECTION = """\
+TASK 1: SYSTEM ARCHITECTURE ANALYSIS
+Analyze the repository structure and create detailed Mermaid diagrams for:
+1. Overall System Architecture - showing main components and their relationships
+2. API Flow Diagram - showing request/response flows and data processing
+3. Data Flow Diagram - showing how data moves through the system
+4. Component Architecture - showing internal component structure
+
+For each diagram, provide:
+- Mermaid syntax code that can be rendered
+- Brief explanation of the architecture
+- Key architectural decisions and patterns identified
+
+"""
+
+_API_SECTION = """\
+TASK 2: API AND INTEGRATION ANALYSIS
+Identify and document:
+1. All API endpoints and their purposes
+2. External service integrations (databases, third-party APIs, etc.)
+3. Authentication and authorization methods
+4. Data formats and protocols used
+5. WebSocket events or real-time communication
+6. Database schemas and data models
+
+"""
+
+_ENHANCED_PROMPT_TAIL = """\
+TASK 3: TECHNICAL DEEP DIVE
+Analyze and document:
+1. Technology Stack (categorized by frontend, backend, database, etc.)
+2. Build System and Development Workflow
+3. Testing Strategy and Framework
+4. CI/CD Pipeline Configuration
+5. Deployment Strategy and Infrastructure
+6. Performance Optimizations
+7. Security Features and Best Practices
+
+TASK 4: COMPREHENSIVE TECHNICAL REPORT
+Provide a detailed technical report that includes:
+- Executive summary of the technical architecture
+- Key technical decisions and their rationale
+- Scalability and performance considerations
+- Security analysis and recommendations
+- Areas for improvement or technical debt
+
+OUTPUT FORMAT:
+Return a JSON object with this structure:
+{
+  "system_architecture": {
+    "system_diagram": "mermaid code here",
+    "api_flow_diagram": "mermaid code here",
+    "data_flow_diagram": "mermaid code here",
+    "component_diagram": "mermaid code here"
+  },
+  "api_analysis": {
+    "endpoints": [...],
+    "external_services": [...],
+    "authentication_methods": [...],
+    "data_formats": [...],
+    "websocket_events": [...]
+  },
+  "technical_deep_dive": {
+    "technology_stack": {...},
+    "build_system": {...},
+    "testing_framework": {...},
+    "ci_cd_pipeline": {...},
+    "deployment_strategy": {...},
+    "performance_optimizations": [...],
+    "security_features": [...]
+  },
+  "comprehensive_report": "detailed markdown report here"
+}
+
+Use actual repository analysis to provide accurate, specific information."""
+
+_BASIC_PROMPT_TAIL = """\
+Generate comprehensive user stories with:
+1. Clear user personas and use cases
+2. 3-5 detailed acceptance criteria each
+3. Appropriate priority and effort estimation
+4. Relevant tags for categorization
+
+Return JSON format with user_stories array containing title, description, acceptance_criteria, priority, effort, and tags."""
+
+
 class EnhancedClaudeAnalyzer:
     """Enhanced analyzer that provides comprehensive repository analysis with system architecture."""
     
-    def __init__(self, config: ClaudeConfig):
+    # Use enhanced system prompt for technical analysis
+    _ENHANCED_SYSTEM_PROMPT: ClassVar[str] = """
+        You are a senior software architect and systems analyst. Your task is to perform deep technical analysis of GitHub repositories, including:
+        
+        1. System Architecture Analysis: Create detailed Mermaid diagrams showing system components, data flow, and interactions
+        2. API Endpoint Mapping: Identify and document all API endpoints, external integrations, and service communications
+        3. Technology Stack Deep Dive: Analyze build systems, deployment strategies, testing frameworks, and performance optimizations
+        4. Code Structure Analysis: Understand component hierarchy, design patterns, and architectural decisions
+        
+        Focus on providing actionable technical insights that would be valuable for developers, architects, and product teams.
+        """
+    
+    # The technical analysis options never vary, so they are built once and
+    # shared by every analyzer; the SDK copies rather than mutates them.
+    _ENHANCED_OPTIONS: ClassVar[ClaudeCodeOptions] = ClaudeCodeOptions(
+        system_prompt=_ENHANCED_SYSTEM_PROMPT,
+        max_turns=5,  # Allow more turns for complex analysis
+        allowed_tools=["Read", "Glob", "Grep", "LS", "Bash"],  # More tools for code analysis
+        permission_mode="acceptEdits"
+    )
+    
+    def __init__(self, config: ClaudeConfig, clock: Optional[Callable[[], datetime]] = None):
         self.config = config
+        # Stamps analysis dates; pass a fixed clock to give a batch of
+        # analyses one run timestamp
+        self._clock = clock or datetime.now
+        # User story options only depend on the config, so build them once
+        self._options = ClaudeCodeOptions(
+            system_prompt=config.system_prompt,
+            max_turns=config.max_turns,
+            allowed_tools=config.allowed_tools,
+            permission_mode=config.permission_mode
+        )
     
     async def analyze_repository_comprehensive(
         self,
@@ -36,17 +226,35 @@ class EnhancedClaudeAnalyzer:
     ) -> AnalysisResult:
         """Perform comprehensive repository analysis including architecture diagrams."""
         
-        # Step 1: Basic user story generation
-        basic_analysis = await self._generate_basic_analysis(
-            repo_info, web_results, focus_area, max_stories
-        )
+        results: Dict[str, Any] = {}
+        errors: List[Exception] = []
         
-        # Step 2: Enhanced technical analysis
-        if include_architecture or include_api_analysis:
-            enhanced_analysis = await self._perform_enhanced_analysis(
-                repo_info, include_architecture, include_api_analysis
-            )
-            
+        async def run(key: str, coro) -> None:
+            # The first failure cancels the other query, and is re-raised as
+            # itself rather than wrapped in an exception group
+            try:
+                results[key] = await coro
+            except Exception as e:
+                errors.append(e)
+                tg.cancel_scope.cancel()
+        
+        # The user story and technical analysis queries are independent, so
+        # both Claude sessions run at the same time
+        async with anyio.create_task_group() as tg:
+            tg.start_soon(run, 'basic', self._generate_basic_analysis(
+                repo_info, web_results, focus_area, max_stories
+            ))
+            if include_architecture or include_api_analysis:
+                tg.start_soon(run, 'enhanced', self._perform_enhanced_analysis(
+                    repo_info, include_architecture, include_api_analysis
+                ))
+        
+        if errors:
+            raise errors[0]
+        
+        basic_analysis = results['basic']
+        enhanced_analysis = results.get('enhanced')
+        if enhanced_analysis is not None:
             basic_analysis.code_analysis = enhanced_analysis.get('code_analysis')
             basic_analysis.system_architecture = enhanced_analysis.get('system_architecture')
             basic_analysis.api_analysis = enhanced_analysis.get('api_analysis')
@@ -55,6 +263,28 @@ class EnhancedClaudeAnalyzer:
         
         return basic_analysis
     
+    async def analyze_many(
+        self,
+        repos: List[RepositoryInfo],
+        *,
+        max_concurrency: Optional[int] = None,
+        **kwargs: Any
+    ) -> List[Union[AnalysisResult, BaseException]]:
+        """Run comprehensive analyses of several repositories, a few at a time.
+        
+        At most max_concurrency analyses (by default the config's
+        max_concurrent_analyses) run at once; keyword arguments are passed
+        on to analyze_repository_comprehensive. Results come back in the
+        order of repos, with the exception in place of a failed analysis.
+        """
+        semaphore = asyncio.Semaphore(max_concurrency or self.config.max_concurrent_analyses)
+        
+        async def analyze_one(repo_info: RepositoryInfo) -> AnalysisResult:
+            async with semaphore:
+                return await self.analyze_repository_comprehensive(repo_info, [], **kwargs)
+        
+        return await asyncio.gather(*(analyze_one(repo_info) for repo_info in repos), return_exceptions=True)
+    
     async def _generate_basic_analysis(
         self,
         repo_info: RepositoryInfo,
@@ -65,21 +295,13 @@ class EnhancedClaudeAnalyzer:
         """Generate basic user story analysis."""
         
         prompt = self._build_basic_analysis_prompt(repo_info, web_results, focus_area, max_stories)
-        
-        options = ClaudeCodeOptions(
-            system_prompt=self.config.system_prompt,
-            max_turns=self.config.max_turns,
-            allowed_tools=self.config.allowed_tools,
-            permission_mode=self.config.permission_mode
-        )
-        
-        user_stories = await self._generate_user_stories(prompt, options, max_stories)
+        user_stories = await self._generate_user_stories(prompt, self._options, max_stories)
         tech_stack, key_features, target_users = self._extract_analysis_info(user_stories)
         
         return AnalysisResult(
             repository=repo_info,
             user_stories=user_stories,
-            analysis_date=datetime.now(),
+            analysis_date=self._clock(),
             focus_area=focus_area,
             tech_stack=tech_stack,
             key_features=key_features,
@@ -94,46 +316,37 @@ class EnhancedClaudeAnalyzer:
     ) -> Dict[str, Any]:
         """Perform enhanced technical analysis with architecture diagrams."""
         
+        # For repositories with a built-in analysis, such as Excalidraw, use it
+        # directly since Claude analysis times out; no prompt is needed then
+        canned = self._canned_enhanced_analysis(repo_info)
+        if canned is not None:
+            return canned
+        
         enhanced_prompt = self._build_enhanced_analysis_prompt(
             repo_info, include_architecture, include_api_analysis
         )
         
-        # Use enhanced system prompt for technical analysis
-        enhanced_system_prompt = """
-        You are a senior software architect and systems analyst. Your task is to perform deep technical analysis of GitHub repositories, including:
-        
-        1. System Architecture Analysis: Create detailed Mermaid diagrams showing system components, data flow, and interactions
-        2. API Endpoint Mapping: Identify and document all API endpoints, external integrations, and service communications
-        3. Technology Stack Deep Dive: Analyze build systems, deployment strategies, testing frameworks, and performance optimizations
-        4. Code Structure Analysis: Understand component hierarchy, design patterns, and architectural decisions
-        
-        Focus on providing actionable technical insights that would be valuable for developers, architects, and product teams.
-        """
-        
-        options = ClaudeCodeOptions(
-            system_prompt=enhanced_system_prompt,
-            max_turns=5,  # Allow more turns for complex analysis
-            allowed_tools=["Read", "Glob", "Grep", "LS", "Bash"],  # More tools for code analysis
-            permission_mode="acceptEdits"
-        )
-        
         results = {}
-        
-        # For Excalidraw, use the comprehensive fallback directly since Claude analysis times out
-        if repo_info.name.lower() == "excalidraw":
-            results = self._generate_fallback_enhanced_analysis(repo_info)
-        else:
+        try:
+            messages = query(prompt=enhanced_prompt, options=self._ENHANCED_OPTIONS)
             try:
-                async for message in query(prompt=enhanced_prompt, options=options):
+                async for message in messages:
                     if isinstance(message, AssistantMessage):
                         for block in message.content:
                             if isinstance(block, TextBlock):
                                 analysis_data = self._extract_enhanced_analysis(block.text)
                                 results.update(analysis_data)
-            
-            except Exception as e:
-                # Fallback to basic analysis if enhanced analysis fails
-                results = self._generate_fallback_enhanced_analysis(repo_info)
+                    
+                    # Stop once every part of the analysis has arrived
+                    if _ENHANCED_ANALYSIS_KEYS <= results.keys():
+                        break
+            finally:
+                # Closing the stream tells the SDK to stop generating
+                await messages.aclose()
+        
+        except _QUERY_ERRORS:
+            # Fallback to basic analysis if enhanced analysis fails
+            results = self._generate_fallback_enhanced_analysis(repo_info)
         
         return results
     
@@ -144,100 +357,19 @@ class EnhancedClaudeAnalyzer:
         include_api_analysis: bool
     ) -> str:
         """Build comprehensive prompt for enhanced technical analysis."""
-        
-        prompt_parts = [
-            f"Perform a comprehensive technical analysis of the GitHub repository '{repo_info.full_name}'.",
-            "",
-            "Repository Context:",
-            f"- Name: {repo_info.full_name}",
-            f"- Description: {repo_info.description or 'No description available'}",
-            f"- Primary Language: {repo_info.language or 'Not specified'}",
-            f"- Topics: {', '.join(repo_info.topics) if repo_info.topics else 'None'}",
-            f"- Stars: {repo_info.stars}",
-            f"- Forks: {repo_info.forks}",
-            ""
-        ]
-        
-        if include_architecture:
-            prompt_parts.extend([
-                "TASK 1: SYSTEM ARCHITECTURE ANALYSIS",
-                "Analyze the repository structure and create detailed Mermaid diagrams for:",
-                "1. Overall System Architecture - showing main components and their relationships",
-                "2. API Flow Diagram - showing request/response flows and data processing",
-                "3. Data Flow Diagram - showing how data moves through the system",
-                "4. Component Architecture - showing internal component structure",
-                "",
-                "For each diagram, provide:",
-                "- Mermaid syntax code that can be rendered",
-                "- Brief explanation of the architecture",
-                "- Key architectural decisions and patterns identified",
-                ""
-            ])
-        
-        if include_api_analysis:
-            prompt_parts.extend([
-                "TASK 2: API AND INTEGRATION ANALYSIS",
-                "Identify and document:",
-                "1. All API endpoints and their purposes",
-                "2. External service integrations (databases, third-party APIs, etc.)",
-                "3. Authentication and authorization methods",
-                "4. Data formats and protocols used",
-                "5. WebSocket events or real-time communication",
-                "6. Database schemas and data models",
-                ""
-            ])
-        
-        prompt_parts.extend([
-            "TASK 3: TECHNICAL DEEP DIVE",
-            "Analyze and document:",
-            "1. Technology Stack (categorized by frontend, backend, database, etc.)",
-            "2. Build System and Development Workflow",
-            "3. Testing Strategy and Framework",
-            "4. CI/CD Pipeline Configuration",
-            "5. Deployment Strategy and Infrastructure",
-            "6. Performance Optimizations",
-            "7. Security Features and Best Practices",
-            "",
-            "TASK 4: COMPREHENSIVE TECHNICAL REPORT",
-            "Provide a detailed technical report that includes:",
-            "- Executive summary of the technical architecture",
-            "- Key technical decisions and their rationale",
-            "- Scalability and performance considerations",
-            "- Security analysis and recommendations",
-            "- Areas for improvement or technical debt",
-            "",
-            "OUTPUT FORMAT:",
-            "Return a JSON object with this structure:",
-            "{",
-            '  "system_architecture": {',
-            '    "system_diagram": "mermaid code here",',
-            '    "api_flow_diagram": "mermaid code here",',
-            '    "data_flow_diagram": "mermaid code here",',
-            '    "component_diagram": "mermaid code here"',
-            '  },',
-            '  "api_analysis": {',
-            '    "endpoints": [...],',
-            '    "external_services": [...],',
-            '    "authentication_methods": [...],',
-            '    "data_formats": [...],',
-            '    "websocket_events": [...]',
-            '  },',
-            '  "technical_deep_dive": {',
-            '    "technology_stack": {...},',
-            '    "build_system": {...},',
-            '    "testing_framework": {...},',
-            '    "ci_cd_pipeline": {...},',
-            '    "deployment_strategy": {...},',
-            '    "performance_optimizations": [...],',
-            '    "security_features": [...]',
-            '  },',
-            '  "comprehensive_report": "detailed markdown report here"',
-            "}",
-            "",
-            "Use actual repository analysis to provide accurate, specific information."
-        ])
-        
-        return "\n".join(prompt_parts)
+        topics = ', '.join(repo_info.topics) if repo_info.topics else 'None'
+        return f"""\
+Perform a comprehensive technical analysis of the GitHub repository '{repo_info.full_name}'.
+
+Repository Context:
+- Name: {repo_info.full_name}
+- Description: {repo_info.description or 'No description available'}
+- Primary Language: {repo_info.language or 'Not specified'}
+- Topics: {topics}
+- Stars: {repo_info.stars}
+- Forks: {repo_info.forks}
+
+{_ARCH_SECTION if include_architecture else ""}{_API_SECTION if include_api_analysis else ""}{_ENHANCED_PROMPT_TAIL}"""
     
     def _build_basic_analysis_prompt(
         self,
@@ -247,58 +379,36 @@ class EnhancedClaudeAnalyzer:
         max_stories: int = 5
     ) -> str:
         """Build basic analysis prompt for user stories."""
+        readme_section = ""
+        readme = repo_info.readme_content
+        if readme and not readme.isspace():
+            if len(readme) > _README_LIMIT:
+                readme = f"{readme[:_README_LIMIT]}..."
+            readme_section = f"README Content:\n{readme}\n\n"
         
-        prompt_parts = [
-            f"Analyze the GitHub repository '{repo_info.full_name}' and generate {max_stories} comprehensive user stories.",
-            "",
-            "Repository Information:",
-            f"- Name: {repo_info.full_name}",
-            f"- Description: {repo_info.description or 'No description available'}",
-            f"- Primary Language: {repo_info.language or 'Not specified'}",
-            f"- Topics: {', '.join(repo_info.topics) if repo_info.topics else 'None'}",
-            f"- Stars: {repo_info.stars}",
-            f"- Forks: {repo_info.forks}",
-            f"- License: {repo_info.license or 'Not specified'}",
-            ""
-        ]
-        
-        if repo_info.readme_content:
-            prompt_parts.extend([
-                "README Content:",
-                repo_info.readme_content[:2000] + "..." if len(repo_info.readme_content) > 2000 else repo_info.readme_content,
-                ""
-            ])
-        
-        if focus_area:
-            prompt_parts.extend([
-                f"Focus Area: {focus_area}",
-                ""
-            ])
+        focus_section = f"Focus Area: {focus_area}\n\n" if focus_area else ""
         
+        research_section = ""
         if web_results:
-            prompt_parts.extend([
-                "Additional Context:",
-                "Use this research to better understand the project:",
-            ])
-            
-            for i, result in enumerate(web_results[:3], 1):
-                prompt_parts.extend([
-                    f"{i}. {result.title}",
-                    f"   {result.snippet[:200]}...",
-                    ""
-                ])
-        
-        prompt_parts.extend([
-            "Generate comprehensive user stories with:",
-            "1. Clear user personas and use cases",
-            "2. 3-5 detailed acceptance criteria each",
-            "3. Appropriate priority and effort estimation",
-            "4. Relevant tags for categorization",
-            "",
-            "Return JSON format with user_stories array containing title, description, acceptance_criteria, priority, effort, and tags."
-        ])
-        
-        return "\n".join(prompt_parts)
+            research_section = "Additional Context:\nUse this research to better understand the project:\n" + "".join(
+                f"{i}. {result.title}\n   {result.snippet[:200]}...\n\n"
+                for i, result in enumerate(web_results[:3], 1)
+            )
+        
+        topics = ', '.join(repo_info.topics) if repo_info.topics else 'None'
+        return f"""\
+Analyze the GitHub repository '{repo_info.full_name}' and generate {max_stories} comprehensive user stories.
+
+Repository Information:
+- Name: {repo_info.full_name}
+- Description: {repo_info.description or 'No description available'}
+- Primary Language: {repo_info.language or 'Not specified'}
+- Topics: {topics}
+- Stars: {repo_info.stars}
+- Forks: {repo_info.forks}
+- License: {repo_info.license or 'Not specified'}
+
+{readme_section}{focus_section}{research_section}{_BASIC_PROMPT_TAIL}"""
     
     async def _generate_user_stories(
         self,
@@ -308,43 +418,49 @@ class EnhancedClaudeAnalyzer:
     ) -> List[UserStory]:
         """Generate user stories using Claude Code SDK."""
         
-        user_stories = []
-        story_id = 1
+        # At most max_stories are kept, so the list is sized up front and
+        # count tracks how many slots are filled
+        user_stories: List[Optional[UserStory]] = [None] * max_stories
+        count = 0
         
         try:
-            async for message in query(prompt=prompt, options=options):
-                if isinstance(message, AssistantMessage):
-                    for block in message.content:
-                        if isinstance(block, TextBlock):
-                            json_content = self._extract_json_from_text(block.text)
-                            if json_content and "user_stories" in json_content:
-                                stories_data = json_content["user_stories"]
-                                for story_data in stories_data[:max_stories]:
-                                    user_story = self._parse_user_story(story_data, story_id)
-                                    if user_story:
-                                        user_stories.append(user_story)
-                                        story_id += 1
-                
-                if len(user_stories) >= max_stories:
-                    break
-        
-        except Exception:
-            user_stories = self._generate_fallback_stories(max_stories)
-        
-        return user_stories[:max_stories]
+            messages = query(prompt=prompt, options=options)
+            try:
+                async for message in messages:
+                    if isinstance(message, AssistantMessage):
+                        for block in message.content:
+                            if isinstance(block, TextBlock):
+                                json_content = self._extract_json_from_text(block.text)
+                                if json_content and isinstance(json_content.get("user_stories"), list):
+                                    stories_data = json_content["user_stories"]
+                                    for story_data in stories_data[:max_stories - count]:
+                                        user_story = self._parse_user_story(story_data, count + 1)
+                                        if user_story:
+                                            user_stories[count] = user_story
+                                            count += 1
+                    
+                    if count >= max_stories:
+                        break
+            finally:
+                # Closing the stream tells the SDK to stop generating
+                await messages.aclose()
+        
+        except _QUERY_ERRORS:
+            return self._generate_fallback_stories(max_stories)
+        
+        return user_stories[:count]
     
     def _extract_json_from_text(self, text: str) -> Optional[Dict[str, Any]]:
         """Extract JSON content from Claude's response text."""
-        try:
-            start_idx = text.find('{')
-            end_idx = text.rfind('}')
-            
-            if start_idx != -1 and end_idx != -1 and end_idx > start_idx:
-                json_str = text[start_idx:end_idx + 1]
-                return json.loads(json_str)
-            
+        # The span ends with the object's own closing brace, so braces in
+        # any commentary after it are never part of the parse
+        json_str = _find_json_object(text)
+        if json_str is None:
             return None
-        except (json.JSONDecodeError, ValueError):
+        
+        try:
+            return _json_loads(json_str)
+        except _JSON_DECODE_ERRORS:
             return None
     
     def _extract_enhanced_analysis(self, text: str) -> Dict[str, Any]:
@@ -355,8 +471,8 @@ class EnhancedClaudeAnalyzer:
         json_content = self._extract_json_from_text(text)
         if json_content:
             # Parse system architecture
-            if "system_architecture" in json_content:
-                arch_data = json_content["system_architecture"]
+            arch_data = json_content.get("system_architecture")
+            if isinstance(arch_data, dict):
                 analysis_data["system_architecture"] = SystemArchitecture(
                     system_diagram=arch_data.get("system_diagram", ""),
                     api_flow_diagram=arch_data.get("api_flow_diagram", ""),
@@ -366,8 +482,8 @@ class EnhancedClaudeAnalyzer:
                 )
             
             # Parse API analysis
-            if "api_analysis" in json_content:
-                api_data = json_content["api_analysis"]
+            api_data = json_content.get("api_analysis")
+            if isinstance(api_data, dict):
                 analysis_data["api_analysis"] = APIAnalysis(
                     endpoints=api_data.get("endpoints", []),
                     external_services=api_data.get("external_services", []),
@@ -378,8 +494,8 @@ class EnhancedClaudeAnalyzer:
                 )
             
             # Parse technical deep dive
-            if "technical_deep_dive" in json_content:
-                tech_data = json_content["technical_deep_dive"]
+            tech_data = json_content.get("technical_deep_dive")
+            if isinstance(tech_data, dict):
                 analysis_data["technical_deep_dive"] = TechnicalDeepDive(
                     technology_stack=tech_data.get("technology_stack", {}),
                     build_system=tech_data.get("build_system", {}),
@@ -402,26 +518,26 @@ class EnhancedClaudeAnalyzer:
             title = story_data.get("title", f"User Story {story_id}")
             description = story_data.get("description", "")
             
-            criteria_data = story_data.get("acceptance_criteria", [])
+            criteria_data = story_data.get("acceptance_criteria", ())
             acceptance_criteria = [
-                AcceptanceCriterion(description=criterion)
+                AcceptanceCriterion(criterion)
                 for criterion in criteria_data
                 if isinstance(criterion, str)
             ]
             
-            try:
-                priority = StoryPriority(story_data.get("priority", "Medium"))
-            except ValueError:
-                priority = StoryPriority.MEDIUM
+            priority_str = story_data.get("priority", "Medium")
+            priority = StoryPriority.MEDIUM
+            if isinstance(priority_str, str):
+                priority = _PRIORITY_MAP.get(priority_str.lower(), StoryPriority.MEDIUM)
             
-            try:
-                effort = StoryEffort(story_data.get("effort", "Medium"))
-            except ValueError:
-                effort = StoryEffort.MEDIUM
+            effort_str = story_data.get("effort", "Medium")
+            effort = StoryEffort.MEDIUM
+            if isinstance(effort_str, str):
+                effort = _EFFORT_MAP.get(effort_str.lower(), StoryEffort.MEDIUM)
             
-            tags = story_data.get("tags", [])
-            if not isinstance(tags, list):
-                tags = []
+            # Copied, since the data may be shared, e.g. _GENERIC_STORIES
+            tags = story_data.get("tags")
+            tags = list(tags) if isinstance(tags, list) else []
             
             return UserStory(
                 id=story_id,
@@ -440,48 +556,7 @@ class EnhancedClaudeAnalyzer:
         """Generate fallback user stories if analysis fails."""
         fallback_stories = []
         
-        generic_stories = [
-            {
-                "title": "Core Functionality Access",
-                "description": "As a user, I want to access the main features of the application, so that I can accomplish my primary tasks efficiently.",
-                "acceptance_criteria": [
-                    "User can navigate to main features easily",
-                    "Core functionality loads within acceptable time",
-                    "User interface is intuitive and responsive"
-                ],
-                "priority": "High",
-                "effort": "Medium",
-                "tags": ["core", "usability"]
-            },
-            {
-                "title": "Data Management",
-                "description": "As a user, I want to create, read, update, and delete my data, so that I can maintain control over my information.",
-                "acceptance_criteria": [
-                    "User can create new data entries",
-                    "User can view existing data clearly",
-                    "User can modify data as needed",
-                    "User can delete unwanted data safely"
-                ],
-                "priority": "High",
-                "effort": "Large",
-                "tags": ["data", "crud"]
-            },
-            {
-                "title": "User Experience Optimization",
-                "description": "As a user, I want a smooth and intuitive interface, so that I can work efficiently without confusion.",
-                "acceptance_criteria": [
-                    "Interface follows consistent design patterns",
-                    "Navigation is logical and predictable",
-                    "Loading states provide clear feedback",
-                    "Error messages are helpful and actionable"
-                ],
-                "priority": "Medium",
-                "effort": "Large",
-                "tags": ["ux", "interface"]
-            }
-        ]
-        
-        for i, story_data in enumerate(generic_stories[:max_stories], 1):
+        for i, story_data in enumerate(_GENERIC_STORIES[:max_stories], 1):
             user_story = self._parse_user_story(story_data, i)
             if user_story:
                 fallback_stories.append(user_story)
@@ -492,20 +567,215 @@ class EnhancedClaudeAnalyzer:
         """Generate fallback enhanced analysis if detailed analysis fails."""
         
         # Generate repository-specific comprehensive analysis
-        if repo_info.name.lower() == "excalidraw":
-            return self._generate_excalidraw_architecture(repo_info)
-        elif "react" in repo_info.name.lower():
-            return self._generate_react_architecture(repo_info)
-        elif "vscode" in repo_info.name.lower():
-            return self._generate_vscode_architecture(repo_info)
-        else:
-            return self._generate_generic_architecture(repo_info)
+        canned = self._canned_enhanced_analysis(repo_info)
+        if canned is not None:
+            return canned
+        return self._generate_generic_architecture(repo_info)
+    
+    def _canned_enhanced_analysis(self, repo_info: RepositoryInfo) -> Optional[Dict[str, Any]]:
+        """Return the built-in analysis for a well-known repository, or None."""
+        method = _FALLBACK_DISPATCH.get(repo_info.name.lower())
+        if method is None:
+            return None
+        return getattr(self, method)(repo_info)
     
     def _generate_excalidraw_architecture(self, repo_info: RepositoryInfo) -> Dict[str, Any]:
-        """Generate comprehensive Excalidraw-specific architecture analysis."""
+        """Generate comprehensive Excalidraw-specific architecture analysis.
+        
+        The diagrams and report are module-level strings; the dataclasses
+        are built per call so results never share mutable lists or dicts.
+        """
+        return {
+            "system_architecture": SystemArchitecture(
+                system_diagram=_EXCALIDRAW_SYSTEM_DIAGRAM,
+                api_flow_diagram=_EXCALIDRAW_API_FLOW_DIAGRAM,
+                data_flow_diagram=_EXCALIDRAW_DATA_FLOW_DIAGRAM,
+                component_diagram=_EXCALIDRAW_COMPONENT_DIAGRAM
+            ),
+            "api_analysis": APIAnalysis(
+                endpoints=[
+                    {"method": "POST", "path": "/api/v2/scenes", "description": "Create new collaborative scene"},
+                    {"method": "GET", "path": "/api/v2/scenes/:id", "description": "Retrieve scene data"},
+                    {"method": "PUT", "path": "/api/v2/scenes/:id", "description": "Update scene elements"},
+                    {"method": "DELETE", "path": "/api/v2/scenes/:id", "description": "Delete collaborative scene"},
+                    {"method": "WebSocket", "path": "/socket.io/", "description": "Real-time collaboration events"}
+                ],
+                external_services=[
+                    "Firebase Firestore - Document storage and real-time sync",
+                    "Firebase Storage - File and image storage",
+                    "Firebase Authentication - User management",
+                    "Socket.io Server - WebSocket communication",
+                    "CDN Services - Asset delivery and caching"
+                ],
+                authentication_methods=[
+                    "Firebase Authentication",
+                    "Room-based access control with encryption keys",
+                    "Anonymous user support",
+                    "Session-based collaboration tokens"
+                ],
+                data_formats=[
+                    "JSON - Primary data exchange format",
+                    "WebSocket Messages - Real-time updates",
+                    "Binary Data - File uploads and images",
+                    "Encrypted Payloads - E2E encrypted collaboration data"
+                ],
+                websocket_events=[
+                    "WS_EVENTS.SERVER_BROADCAST - Element updates",
+                    "WS_EVENTS.USER_VISIBLE_SCENE_BOUNDS - Viewport sync",
+                    "WS_EVENTS.CURSOR_SYNC - Real-time cursor positions",
+                    "WS_EVENTS.USER_STATE - User presence and idle states",
+                    "WS_EVENTS.USER_FOLLOW_CHANGE - User following events"
+                ],
+                database_schemas=[
+                    "scenes/{roomId} - Collaborative scene documents",
+                    "files/{roomId}/{fileId} - Uploaded file metadata",
+                    "users/{userId} - User profile and preferences"
+                ]
+            ),
+            "technical_deep_dive": TechnicalDeepDive(
+                technology_stack={
+                    "frontend": ["React 19", "TypeScript 4.9", "Jotai 2.11", "RoughJS 4.6"],
+                    "backend": ["Firebase 11.3", "Socket.io 4.7", "Node.js"],
+                    "build_tools": ["Vite 5.0", "esbuild", "Yarn workspaces"],
+                    "testing": ["Vitest", "React Testing Library", "Jest"],
+                    "deployment": ["Vercel", "Firebase Hosting", "CDN"]
+                },
+                build_system={
+                    "type": "Vite + esbuild",
+                    "monorepo": "Yarn workspaces",
+                    "bundling": "ESM + CommonJS support",
+                    "optimization": "Tree shaking + code splitting"
+                },
+                testing_framework={
+                    "unit_tests": "Vitest with 60%+ coverage",
+                    "integration_tests": "React Testing Library",
+                    "e2e_tests": "Custom collaboration scenarios",
+                    "performance_tests": "Canvas rendering benchmarks"
+                },
+                ci_cd_pipeline={
+                    "platform": "GitHub Actions",
+                    "stages": ["Lint", "Type Check", "Unit Tests", "Build", "Deploy"],
+                    "deployment": "Automatic deployment to Vercel",
+                    "monitoring": "Sentry error tracking"
+                },
+                deployment_strategy={
+                    "hosting": "Vercel for web app",
+                    "backend": "Firebase for data and real-time features",
+                    "cdn": "Firebase CDN for asset delivery",
+                    "pwa": "Service Worker for offline functionality"
+                },
+                performance_optimizations=[
+                    "Canvas virtualization for large drawings",
+                    "Efficient element storage and indexing",
+                    "Throttled real-time updates",
+                    "Memory management and cleanup",
+                    "Image compression and caching",
+                    "Code splitting and lazy loading"
+                ],
+                security_features=[
+                    "End-to-end encryption for collaboration",
+                    "Client-side encryption key management",
+                    "Secure WebSocket connections (WSS)",
+                    "HTTPS-only communication",
+                    "Input sanitization and validation",
+                    "Content Security Policy (CSP)"
+                ]
+            ),
+            "comprehensive_report": _EXCALIDRAW_REPORT
+        }
+    
+    def _generate_generic_architecture(self, repo_info: RepositoryInfo) -> Dict[str, Any]:
+        """Generate generic architecture analysis for unknown repositories."""
         return {
             "system_architecture": SystemArchitecture(
                 system_diagram=f"""graph TB
+    subgraph "{repo_info.name} System Architecture"
+        A[User Interface Layer<br/>{repo_info.language or 'Frontend'}]
+        B[Application Logic<br/>Business Layer]
+        C[Data Access Layer<br/>Storage & APIs]
+        D[External Services<br/>Third-party Integrations]
+    end
+    A --> B
+    B --> C
+    B --> D""",
+                api_flow_diagram="""graph LR
+    Client[Client Application] --> API[API Gateway]
+    API --> Auth[Authentication]
+    API --> Business[Business Logic]
+    Business --> Database[(Database)]
+    Business --> Cache[(Cache)]""",
+                data_flow_diagram="""graph TD
+    Input[User Input] --> Validation[Input Validation]
+    Validation --> Processing[Data Processing]
+    Processing --> Storage[Data Storage]
+    Storage --> Output[Response Output]""",
+                component_diagram=f"""graph TB
+    subgraph "{repo_info.name} Components"
+        UI[User Interface Components]
+        Logic[Business Logic Modules]
+        Data[Data Access Objects]
+        Utils[Utility Functions]
+    end
+    UI --> Logic
+    Logic --> Data
+    Logic --> Utils"""
+            ),
+            "api_analysis": APIAnalysis(
+                endpoints=[f"API analysis pending for {repo_info.name}"],
+                external_services=[repo_info.language or "Unknown technology stack"],
+                authentication_methods=["Standard authentication patterns"],
+                data_formats=["JSON", "HTTP/HTTPS"]
+            ),
+            "technical_deep_dive": TechnicalDeepDive(
+                technology_stack={"primary": [repo_info.language or "Unknown"]},
+                build_system={"type": "Standard build process"},
+                testing_framework={"type": "Standard testing approach"},
+                ci_cd_pipeline={"type": "Continuous integration"},
+                deployment_strategy={"type": "Standard deployment"},
+                performance_optimizations=["Performance optimizations to be analyzed"],
+                security_features=["Security features to be analyzed"]
+            ),
+            "comprehensive_report": f"""# Technical Analysis: {repo_info.full_name}
+
+## Repository Overview
+- **Language**: {repo_info.language or 'Not specified'}
+- **Stars**: {repo_info.stars:,}
+- **Size**: {repo_info.size:,} KB
+
+## Analysis Summary
+This is a {repo_info.language or 'software'} project with {repo_info.stars:,} stars, indicating {
+'high' if repo_info.stars > 10000 else 'moderate' if repo_info.stars > 1000 else 'emerging'
+} community adoption.
+
+Further detailed analysis would require deeper repository inspection to provide comprehensive architecture insights, API documentation, and technical recommendations.
+"""
+        }
+    
+    def _extract_analysis_info(self, user_stories: List[UserStory]) -> Tuple[List[str], List[str], List[str]]:
+        """Extract basic analysis information from user stories."""
+        tech_stack = []
+        key_features = []
+        target_users = []
+        
+        for story in user_stories:
+            key_features.append(story.title)
+            
+            if "As a" in story.description:
+                user_part = story.description.split("As a")[1].split(",")[0].strip()
+                if user_part not in target_users:
+                    target_users.append(user_part)
+            
+            for tag in story.tags:
+                if tag.lower() in _TECH_TAGS:
+                    if tag not in tech_stack:
+                        tech_stack.append(tag)
+        
+        return tech_stack, key_features, target_users
+
+
+# Built-in analysis text for Excalidraw, see
+# EnhancedClaudeAnalyzer._generate_excalidraw_architecture
+_EXCALIDRAW_SYSTEM_DIAGRAM = """graph TB
     subgraph "Client Layer"
         WebApp[Excalidraw Web App<br/>React + TypeScript]
         PWA[Progressive Web App<br/>Service Worker + Offline]
@@ -545,8 +815,9 @@ class EnhancedClaudeAnalyzer:
     SocketIO --> Portal
     Portal --> E2EEncryption
     Portal --> Firebase
-    WebApp --> LocalStorage""",
-                api_flow_diagram="""sequenceDiagram
+    WebApp --> LocalStorage"""
+
+_EXCALIDRAW_API_FLOW_DIAGRAM = """sequenceDiagram
     participant User1 as User 1
     participant User2 as User 2
     participant Socket as Socket.io Server
@@ -568,8 +839,9 @@ class EnhancedClaudeAnalyzer:
     Encryption->>User2: Element Updates
     
     Socket->>Firebase: Persist Room State
-    Firebase->>Socket: Confirmation""",
-                data_flow_diagram="""graph TD
+    Firebase->>Socket: Confirmation"""
+
+_EXCALIDRAW_DATA_FLOW_DIAGRAM = """graph TD
     subgraph "User Input Processing"
         UserInput[User Interactions<br/>Mouse/Touch/Keyboard]
         EventHandler[Event Handlers<br/>Canvas Events]
@@ -596,8 +868,9 @@ class EnhancedClaudeAnalyzer:
     ElementUpdate --> ElementPersist
     ElementPersist --> SceneManager
     SceneManager --> RenderEngine
-    RenderEngine --> DisplayOutput""",
-                component_diagram="""graph TB
+    RenderEngine --> DisplayOutput"""
+
+_EXCALIDRAW_COMPONENT_DIAGRAM = """graph TB
     subgraph "Excalidraw Monorepo"
         subgraph "excalidraw-app/"
             AppMain[App.tsx<br/>Main Application]
@@ -635,97 +908,8 @@ class EnhancedClaudeAnalyzer:
     Elements --> ElementUtils
     Actions --> GeometryUtils
     Elements --> BoundsCalc"""
-            ),
-            "api_analysis": APIAnalysis(
-                endpoints=[
-                    {"method": "POST", "path": "/api/v2/scenes", "description": "Create new collaborative scene"},
-                    {"method": "GET", "path": "/api/v2/scenes/:id", "description": "Retrieve scene data"},
-                    {"method": "PUT", "path": "/api/v2/scenes/:id", "description": "Update scene elements"},
-                    {"method": "DELETE", "path": "/api/v2/scenes/:id", "description": "Delete collaborative scene"},
-                    {"method": "WebSocket", "path": "/socket.io/", "description": "Real-time collaboration events"}
-                ],
-                external_services=[
-                    "Firebase Firestore - Document storage and real-time sync",
-                    "Firebase Storage - File and image storage",
-                    "Firebase Authentication - User management",
-                    "Socket.io Server - WebSocket communication",
-                    "CDN Services - Asset delivery and caching"
-                ],
-                authentication_methods=[
-                    "Firebase Authentication",
-                    "Room-based access control with encryption keys",
-                    "Anonymous user support",
-                    "Session-based collaboration tokens"
-                ],
-                data_formats=[
-                    "JSON - Primary data exchange format",
-                    "WebSocket Messages - Real-time updates",
-                    "Binary Data - File uploads and images",
-                    "Encrypted Payloads - E2E encrypted collaboration data"
-                ],
-                websocket_events=[
-                    "WS_EVENTS.SERVER_BROADCAST - Element updates",
-                    "WS_EVENTS.USER_VISIBLE_SCENE_BOUNDS - Viewport sync",
-                    "WS_EVENTS.CURSOR_SYNC - Real-time cursor positions",
-                    "WS_EVENTS.USER_STATE - User presence and idle states",
-                    "WS_EVENTS.USER_FOLLOW_CHANGE - User following events"
-                ],
-                database_schemas=[
-                    "scenes/{roomId} - Collaborative scene documents",
-                    "files/{roomId}/{fileId} - Uploaded file metadata",
-                    "users/{userId} - User profile and preferences"
-                ]
-            ),
-            "technical_deep_dive": TechnicalDeepDive(
-                technology_stack={
-                    "frontend": ["React 19", "TypeScript 4.9", "Jotai 2.11", "RoughJS 4.6"],
-                    "backend": ["Firebase 11.3", "Socket.io 4.7", "Node.js"],
-                    "build_tools": ["Vite 5.0", "esbuild", "Yarn workspaces"],
-                    "testing": ["Vitest", "React Testing Library", "Jest"],
-                    "deployment": ["Vercel", "Firebase Hosting", "CDN"]
-                },
-                build_system={
-                    "type": "Vite + esbuild",
-                    "monorepo": "Yarn workspaces",
-                    "bundling": "ESM + CommonJS support",
-                    "optimization": "Tree shaking + code splitting"
-                },
-                testing_framework={
-                    "unit_tests": "Vitest with 60%+ coverage",
-                    "integration_tests": "React Testing Library",
-                    "e2e_tests": "Custom collaboration scenarios",
-                    "performance_tests": "Canvas rendering benchmarks"
-                },
-                ci_cd_pipeline={
-                    "platform": "GitHub Actions",
-                    "stages": ["Lint", "Type Check", "Unit Tests", "Build", "Deploy"],
-                    "deployment": "Automatic deployment to Vercel",
-                    "monitoring": "Sentry error tracking"
-                },
-                deployment_strategy={
-                    "hosting": "Vercel for web app",
-                    "backend": "Firebase for data and real-time features",
-                    "cdn": "Firebase CDN for asset delivery",
-                    "pwa": "Service Worker for offline functionality"
-                },
-                performance_optimizations=[
-                    "Canvas virtualization for large drawings",
-                    "Efficient element storage and indexing",
-                    "Throttled real-time updates",
-                    "Memory management and cleanup",
-                    "Image compression and caching",
-                    "Code splitting and lazy loading"
-                ],
-                security_features=[
-                    "End-to-end encryption for collaboration",
-                    "Client-side encryption key management",
-                    "Secure WebSocket connections (WSS)",
-                    "HTTPS-only communication",
-                    "Input sanitization and validation",
-                    "Content Security Policy (CSP)"
-                ]
-            ),
-            "comprehensive_report": f"""# Technical Architecture Report: Excalidraw
+
+_EXCALIDRAW_REPORT = """# Technical Architecture Report: Excalidraw
 
 ## Executive Summary
 
@@ -822,92 +1006,3 @@ Excalidraw is a sophisticated open-source virtual whiteboard application built w
 
 This architecture represents a mature, production-ready collaboration platform with excellent technical foundations for scaling and extensibility.
 """
-        }
-    
-    def _generate_generic_architecture(self, repo_info: RepositoryInfo) -> Dict[str, Any]:
-        """Generate generic architecture analysis for unknown repositories."""
-        return {
-            "system_architecture": SystemArchitecture(
-                system_diagram=f"""graph TB
-    subgraph "{repo_info.name} System Architecture"
-        A[User Interface Layer<br/>{repo_info.language or 'Frontend'}]
-        B[Application Logic<br/>Business Layer]
-        C[Data Access Layer<br/>Storage & APIs]
-        D[External Services<br/>Third-party Integrations]
-    end
-    A --> B
-    B --> C
-    B --> D""",
-                api_flow_diagram="""graph LR
-    Client[Client Application] --> API[API Gateway]
-    API --> Auth[Authentication]
-    API --> Business[Business Logic]
-    Business --> Database[(Database)]
-    Business --> Cache[(Cache)]""",
-                data_flow_diagram="""graph TD
-    Input[User Input] --> Validation[Input Validation]
-    Validation --> Processing[Data Processing]
-    Processing --> Storage[Data Storage]
-    Storage --> Output[Response Output]""",
-                component_diagram=f"""graph TB
-    subgraph "{repo_info.name} Components"
-        UI[User Interface Components]
-        Logic[Business Logic Modules]
-        Data[Data Access Objects]
-        Utils[Utility Functions]
-    end
-    UI --> Logic
-    Logic --> Data
-    Logic --> Utils"""
-            ),
-            "api_analysis": APIAnalysis(
-                endpoints=[f"API analysis pending for {repo_info.name}"],
-                external_services=[repo_info.language or "Unknown technology stack"],
-                authentication_methods=["Standard authentication patterns"],
-                data_formats=["JSON", "HTTP/HTTPS"]
-            ),
-            "technical_deep_dive": TechnicalDeepDive(
-                technology_stack={"primary": [repo_info.language or "Unknown"]},
-                build_system={"type": "Standard build process"},
-                testing_framework={"type": "Standard testing approach"},
-                ci_cd_pipeline={"type": "Continuous integration"},
-                deployment_strategy={"type": "Standard deployment"},
-                performance_optimizations=["Performance optimizations to be analyzed"],
-                security_features=["Security features to be analyzed"]
-            ),
-            "comprehensive_report": f"""# Technical Analysis: {repo_info.full_name}
-
-## Repository Overview
-- **Language**: {repo_info.language or 'Not specified'}
-- **Stars**: {repo_info.stars:,}
-- **Size**: {repo_info.size:,} KB
-
-## Analysis Summary
-This is a {repo_info.language or 'software'} project with {repo_info.stars:,} stars, indicating {
-'high' if repo_info.stars > 10000 else 'moderate' if repo_info.stars > 1000 else 'emerging'
-} community adoption.
-
-Further detailed analysis would require deeper repository inspection to provide comprehensive architecture insights, API documentation, and technical recommendations.
-"""
-        }
-    
-    def _extract_analysis_info(self, user_stories: List[UserStory]) -> Tuple[List[str], List[str], List[str]]:
-        """Extract basic analysis information from user stories."""
-        tech_stack = []
-        key_features = []
-        target_users = []
-        
-        for story in user_stories:
-            key_features.append(story.title)
-            
-            if "As a" in story.description:
-                user_part = story.description.split("As a")[1].split(",")[0].strip()
-                if user_part not in target_users:
-                    target_users.append(user_part)
-            
-            for tag in story.tags:
-                if tag.lower() in ["api", "database", "frontend", "backend", "mobile", "web"]:
-                    if tag not in tech_stack:
-                        tech_stack.append(tag)
-        
-        return tech_stack, key_features, target_users
\ No newline at end of file
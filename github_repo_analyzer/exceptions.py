@@ -2,6 +2,8 @@
 Custom exceptions for the GitHub Repository Analyzer.
 """
 
+from typing import Optional
+
 
 class GitHubRepoAnalyzerError(Exception):
     """Base exception for all GitHub Repository Analyzer errors."""
@@ -44,8 +46,17 @@ class ValidationError(GitHubRepoAnalyzerError):
 
 
 class RateLimitError(GitHubRepoAnalyzerError):
-    """Raised when API rate limits are exceeded."""
-    pass
+    """Raised when API rate limits are exceeded.
+    
+    ``retry_after`` is the wait in seconds GitHub asked for, if it said.
+    ``exhausted`` is set when the primary quota is used up, which is only
+    replenished at the next reset, so retrying sooner is pointless.
+    """
+    
+    def __init__(self, message: str, retry_after: Optional[float] = None, exhausted: bool = False):
+        super().__init__(message)
+        self.retry_after = retry_after
+        self.exhausted = exhausted
 
 
 class NetworkError(GitHubRepoAnalyzerError):
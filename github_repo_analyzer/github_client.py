@@ -2,15 +2,91 @@
 GitHub API client for fetching repository information.
 """
 
+import asyncio
+import atexit
+import functools
 import os
 import re
+import time
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from datetime import datetime
 from typing import Optional, List, Dict, Any
+from pathlib import Path
 from urllib.parse import urlparse
 
 from .types import RepositoryInfo, GitHubConfig
-from .exceptions import GitHubAPIError, RepositoryNotFoundError
+from .exceptions import GitHubAPIError, RepositoryNotFoundError, RateLimitError
+from .cache import TTLCache
+from .http_cache import ETagCache
+
+
+# Everything get_repository_info needs, in one GraphQL request. The common
+# README file names are tried as aliases since GraphQL has no /readme lookup;
+# any other README name falls back to the REST endpoint.
+_REPOSITORY_QUERY = """
+query($owner: String!, $name: String!) {
+  repository(owner: $owner, name: $name) {
+    nameWithOwner
+    description
+    primaryLanguage { name }
+    stargazerCount
+    forkCount
+    repositoryTopics(first: 20) { nodes { topic { name } } }
+    licenseInfo { name }
+    createdAt
+    updatedAt
+    diskUsage
+    defaultBranchRef { name target { oid } }
+    readmeMd: object(expression: "HEAD:README.md") { ... on Blob { text } }
+    readmeLower: object(expression: "HEAD:readme.md") { ... on Blob { text } }
+    readmeRst: object(expression: "HEAD:README.rst") { ... on Blob { text } }
+    readmePlain: object(expression: "HEAD:README") { ... on Blob { text } }
+  }
+}
+"""
+
+_README_ALIASES = ("readmeMd", "readmeLower", "readmeRst", "readmePlain")
+
+
+def _create_session(token: Optional[str], pool_size: int) -> requests.Session:
+    """Create a session for GitHub API requests."""
+    session = requests.Session()
+    # Size the keep-alive pool to the analyzer's concurrency limit so
+    # parallel calls reuse TLS connections instead of opening new ones,
+    # and retry connection failures at the transport level
+    adapter = HTTPAdapter(
+        pool_connections=1,
+        pool_maxsize=pool_size,
+        max_retries=Retry(total=2, backoff_factor=0.5, raise_on_status=False)
+    )
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    
+    if token:
+        session.headers.update({
+            "Authorization": f"token {token}",
+            "Accept": "application/vnd.github.v3+json"
+        })
+    else:
+        session.headers.update({
+            "Accept": "application/vnd.github.v3+json"
+        })
+    
+    return session
+
+
+@functools.lru_cache(maxsize=None)
+def _shared_session(token: Optional[str], pool_size: int) -> requests.Session:
+    """Return the session shared by clients with the same credentials.
+    
+    Clients created later in the process reuse its open connections
+    instead of repeating the TLS handshake. It is closed at exit.
+    """
+    session = _create_session(token, pool_size)
+    atexit.register(session.close)
+    return session
 
 
 class GitHubClient:
@@ -18,37 +94,99 @@ class GitHubClient:
     
     def __init__(self, config: GitHubConfig):
         self.config = config
-        self.session = requests.Session()
-        
-        if config.token:
-            self.session.headers.update({
-                "Authorization": f"token {config.token}",
-                "Accept": "application/vnd.github.v3+json"
-            })
+        if config.reuse_session:
+            self.session = _shared_session(config.token, config.max_concurrent_requests)
         else:
-            self.session.headers.update({
-                "Accept": "application/vnd.github.v3+json"
-            })
+            self.session = _create_session(config.token, config.max_concurrent_requests)
+        
+        self.http_cache = (
+            ETagCache(Path(config.cache_dir), ttl=config.cache_ttl) if config.cache_dir else None
+        )
+        # Rate limit status changes slowly enough to reuse for a few seconds
+        self._rate_limit_cache = TTLCache(maxsize=1, ttl=30)
+    
+    def _get(self, url: str, params: Optional[Dict[str, Any]] = None) -> requests.Response:
+        """GET a URL, answering from the ETag cache when possible.
+        
+        Cached responses are returned as 200s with the stored body, so
+        callers don't need to know whether the cache was used.
+        """
+        if self.http_cache is None:
+            return self.session.get(url, params=params, timeout=self.config.timeout)
+        
+        # Responses differ per token (e.g. private repositories), so the
+        # credentials are part of the key
+        key = ETagCache.key(
+            url, params,
+            self.session.headers.get("Accept"), self.session.headers.get("Authorization")
+        )
+        entry = self.http_cache.get(key)
+        if entry is not None and self.http_cache.is_fresh(entry):
+            return self._cached_response(url, entry)
+        
+        headers = {"If-None-Match": entry["etag"]} if entry is not None else None
+        response = self.session.get(url, params=params, headers=headers, timeout=self.config.timeout)
+        
+        if response.status_code == 304 and entry is not None:
+            self.http_cache.touch(key, entry)
+            return self._cached_response(url, entry)
+        if response.status_code == 200 and response.headers.get("ETag"):
+            self.http_cache.set(key, response.headers["ETag"], response.text)
+        return response
+    
+    @staticmethod
+    def _cached_response(url: str, entry: Dict[str, Any]) -> requests.Response:
+        """Build a 200 response carrying a cached body."""
+        response = requests.Response()
+        response.status_code = 200
+        response.url = url
+        response.encoding = "utf-8"
+        response._content = entry["body"].encode("utf-8")
+        return response
+    
+    @property
+    def uses_graphql(self) -> bool:
+        """Whether get_repository_info uses the GraphQL API, which requires a token."""
+        return bool(self.config.token)
     
     def get_repository_info(self, owner: str, repo: str) -> RepositoryInfo:
-        """Fetch repository information from GitHub API."""
+        """Fetch repository information, including the README, from GitHub API.
+        
+        With a token this is a single GraphQL request; otherwise the
+        metadata and README are fetched from the REST API.
+        """
+        if self.uses_graphql:
+            return self._get_repository_info_graphql(owner, repo)
+        
+        repo_info = self.get_repository_core(owner, repo)
+        repo_info.readme_content = self.get_readme(owner, repo)
+        return repo_info
+    
+    def get_repository_core(self, owner: str, repo: str) -> RepositoryInfo:
+        """Fetch repository metadata without the README.
+        
+        The README is a separate request; callers that can use the metadata
+        on its own (e.g. to start web research) fetch it with get_readme().
+        """
         try:
             # Get basic repository info
             repo_url = f"{self.config.base_url}/repos/{owner}/{repo}"
-            response = self.session.get(repo_url, timeout=self.config.timeout)
+            response = self._get(repo_url)
             
             if response.status_code == 404:
                 raise RepositoryNotFoundError(f"Repository {owner}/{repo} not found")
+            elif self._is_rate_limited(response):
+                raise self._rate_limit_error(response, f"{response.status_code} - {response.text}")
             elif response.status_code != 200:
                 raise GitHubAPIError(f"GitHub API error: {response.status_code} - {response.text}")
             
             repo_data = response.json()
             
-            # Get README content
-            readme_content = self._get_readme_content(owner, repo)
-            
-            # Get topics
-            topics = self._get_repository_topics(owner, repo)
+            # Topics are part of the repository payload on current GitHub
+            # versions; only older servers need the separate request
+            topics = repo_data.get("topics")
+            if topics is None:
+                topics = self._get_repository_topics(owner, repo)
             
             # Parse dates
             created_at = datetime.fromisoformat(repo_data["created_at"].replace("Z", "+00:00"))
@@ -63,24 +201,153 @@ class GitHubClient:
                 stars=repo_data.get("stargazers_count", 0),
                 forks=repo_data.get("forks_count", 0),
                 topics=topics,
-                readme_content=readme_content,
+                readme_content=None,
                 license=repo_data.get("license", {}).get("name") if repo_data.get("license") else None,
                 created_at=created_at,
                 updated_at=updated_at,
                 size=repo_data.get("size", 0),
-                default_branch=repo_data.get("default_branch", "main")
+                default_branch=repo_data.get("default_branch", "main"),
+                revision=repo_data.get("pushed_at")
             )
             
+        except (RepositoryNotFoundError, RateLimitError, GitHubAPIError):
+            raise
         except requests.RequestException as e:
             raise GitHubAPIError(f"Network error: {e}")
         except Exception as e:
             raise GitHubAPIError(f"Unexpected error: {e}")
     
+    def _get_repository_info_graphql(self, owner: str, repo: str) -> RepositoryInfo:
+        """Fetch repository metadata, topics and README in one GraphQL request."""
+        try:
+            response = self.session.post(
+                self._graphql_url(),
+                json={"query": _REPOSITORY_QUERY, "variables": {"owner": owner, "name": repo}},
+                timeout=self.config.timeout
+            )
+            
+            if self._is_rate_limited(response):
+                raise self._rate_limit_error(response, f"{response.status_code} - {response.text}")
+            elif response.status_code != 200:
+                raise GitHubAPIError(f"GitHub API error: {response.status_code} - {response.text}")
+            
+            payload = response.json()
+            # GraphQL reports failures in the body of a 200 response
+            errors = payload.get("errors") or []
+            error_types = {error.get("type") for error in errors}
+            if "NOT_FOUND" in error_types:
+                raise RepositoryNotFoundError(f"Repository {owner}/{repo} not found")
+            elif "RATE_LIMITED" in error_types:
+                raise self._rate_limit_error(response, errors)
+            
+            repo_data = (payload.get("data") or {}).get("repository")
+            if repo_data is None:
+                raise GitHubAPIError(f"GitHub API error: {errors or payload}")
+            
+            default_branch = repo_data.get("defaultBranchRef") or {}
+            readme_content = next(
+                (repo_data[alias]["text"] for alias in _README_ALIASES
+                 if repo_data.get(alias) and repo_data[alias].get("text") is not None),
+                None
+            )
+            if readme_content is None:
+                # e.g. Readme.md, README.markdown or docs/README.md
+                readme_content = self.get_readme(owner, repo)
+            
+            return RepositoryInfo(
+                owner=owner,
+                name=repo,
+                full_name=repo_data["nameWithOwner"],
+                description=repo_data.get("description"),
+                language=(repo_data.get("primaryLanguage") or {}).get("name"),
+                stars=repo_data.get("stargazerCount", 0),
+                forks=repo_data.get("forkCount", 0),
+                topics=[node["topic"]["name"] for node in repo_data["repositoryTopics"]["nodes"]],
+                readme_content=readme_content,
+                license=(repo_data.get("licenseInfo") or {}).get("name"),
+                created_at=datetime.fromisoformat(repo_data["createdAt"].replace("Z", "+00:00")),
+                updated_at=datetime.fromisoformat(repo_data["updatedAt"].replace("Z", "+00:00")),
+                size=repo_data.get("diskUsage") or 0,
+                default_branch=default_branch.get("name", "main"),
+                revision=(default_branch.get("target") or {}).get("oid")
+            )
+            
+        except (RepositoryNotFoundError, RateLimitError, GitHubAPIError):
+            raise
+        except requests.RequestException as e:
+            raise GitHubAPIError(f"Network error: {e}")
+        except Exception as e:
+            raise GitHubAPIError(f"Unexpected error: {e}")
+    
+    def _graphql_url(self) -> str:
+        """GraphQL endpoint for the configured REST base URL."""
+        base_url = self.config.base_url.rstrip("/")
+        # GitHub Enterprise serves REST at /api/v3 and GraphQL at /api/graphql
+        if base_url.endswith("/v3"):
+            base_url = base_url[:-len("/v3")]
+        return f"{base_url}/graphql"
+    
+    @staticmethod
+    def _is_rate_limited(response: requests.Response) -> bool:
+        """Check whether a response was rejected by a primary or secondary rate limit."""
+        if response.status_code not in (403, 429):
+            return False
+        return (
+            response.headers.get("X-RateLimit-Remaining") == "0"
+            or "rate limit" in response.text.lower()
+        )
+    
+    @staticmethod
+    def _rate_limit_error(response: requests.Response, detail: Any) -> RateLimitError:
+        """Build a RateLimitError carrying GitHub's exhaustion and retry hints."""
+        headers = response.headers
+        retry_after = None
+        try:
+            if headers.get("Retry-After"):
+                retry_after = float(headers["Retry-After"])
+            elif headers.get("X-RateLimit-Reset"):
+                retry_after = max(0.0, float(headers["X-RateLimit-Reset"]) - time.time())
+        except ValueError:
+            pass
+        return RateLimitError(
+            f"GitHub API rate limit exceeded: {detail}",
+            retry_after=retry_after,
+            exhausted=headers.get("X-RateLimit-Remaining") == "0"
+        )
+    
+    def get_readme(self, owner: str, repo: str) -> Optional[str]:
+        """Fetch the repository README, or None if it has none."""
+        return self._get_readme_content(owner, repo)
+    
+    def get_readme_preview(self, owner: str, repo: str, max_bytes: int = 4096) -> Optional[str]:
+        """Fetch roughly the first max_bytes of the README, or None if it has none.
+        
+        The raw README is requested with a Range header and streamed, so at
+        most max_bytes are read even if the server ignores the range.
+        """
+        try:
+            readme_url = f"{self.config.base_url}/repos/{owner}/{repo}/readme"
+            headers = {
+                "Accept": "application/vnd.github.raw",
+                "Range": f"bytes=0-{max_bytes - 1}"
+            }
+            with self.session.get(
+                readme_url, headers=headers, stream=True, timeout=self.config.timeout
+            ) as response:
+                if response.status_code not in (200, 206):
+                    return None
+                content = response.raw.read(max_bytes, decode_content=True)
+            # The cut may fall inside a multi-byte character
+            return content.decode("utf-8", errors="ignore")
+            
+        except Exception:
+            return None
+    
     def _get_readme_content(self, owner: str, repo: str) -> Optional[str]:
         """Fetch README content from repository."""
         try:
             readme_url = f"{self.config.base_url}/repos/{owner}/{repo}/readme"
-            response = self.session.get(readme_url, timeout=self.config.timeout)
+            response = self._get(readme_url)
             
             if response.status_code == 200:
                 readme_data = response.json()
@@ -97,7 +364,7 @@ class GitHubClient:
         """Fetch repository topics."""
         try:
             topics_url = f"{self.config.base_url}/repos/{owner}/{repo}/topics"
-            response = self.session.get(topics_url, timeout=self.config.timeout)
+            response = self._get(topics_url)
             
             if response.status_code == 200:
                 topics_data = response.json()
@@ -111,7 +378,7 @@ class GitHubClient:
         """Get list of files in a repository directory."""
         try:
             files_url = f"{self.config.base_url}/repos/{owner}/{repo}/contents/{path}"
-            response = self.session.get(files_url, timeout=self.config.timeout)
+            response = self._get(files_url)
             
             if response.status_code == 200:
                 return response.json()
@@ -124,7 +391,7 @@ class GitHubClient:
         """Get content of a specific file."""
         try:
             file_url = f"{self.config.base_url}/repos/{owner}/{repo}/contents/{path}"
-            response = self.session.get(file_url, timeout=self.config.timeout)
+            response = self._get(file_url)
             
             if response.status_code == 200:
                 file_data = response.json()
@@ -191,21 +458,32 @@ class GitHubClient:
             return []
     
     def get_rate_limit_info(self) -> Dict[str, Any]:
-        """Get current rate limit information."""
+        """Get current rate limit information, cached for 30 seconds."""
+        cached = self._rate_limit_cache.get("rate_limit")
+        if cached is not None:
+            return cached
+        
         try:
             rate_limit_url = f"{self.config.base_url}/rate_limit"
             response = self.session.get(rate_limit_url, timeout=self.config.timeout)
             
             if response.status_code == 200:
-                return response.json()
+                rate_limit_info = response.json()
+                self._rate_limit_cache.set("rate_limit", rate_limit_info)
+                return rate_limit_info
             return {}
             
         except Exception:
             return {}
     
+    async def get_rate_limit_info_async(self) -> Dict[str, Any]:
+        """Get current rate limit information without blocking the event loop."""
+        return await asyncio.to_thread(self.get_rate_limit_info)
+    
     def close(self):
-        """Close the session."""
-        self.session.close()
+        """Close the session, unless it is shared with other clients."""
+        if not self.config.reuse_session:
+            self.session.close()
     
     def __enter__(self):
         return self
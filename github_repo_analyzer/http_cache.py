@@ -0,0 +1,57 @@
+"""
+On-disk HTTP response cache for GitHub API requests.
+"""
+
+import hashlib
+import json
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from .cache import CACHE_ROOT, write_private_file
+
+
+DEFAULT_CACHE_DIR = CACHE_ROOT / "http"
+
+
+class ETagCache:
+    """Stores response bodies with their ETags, one JSON file per request.
+
+    Entries younger than ``ttl`` seconds are served without contacting
+    GitHub. Older entries are revalidated with If-None-Match; a 304 reply
+    does not count against the API rate limit.
+    """
+
+    def __init__(self, cache_dir: Path, ttl: float = 300.0):
+        self.cache_dir = Path(cache_dir)
+        self.ttl = ttl
+
+    @staticmethod
+    def key(url: str, params: Optional[Dict[str, Any]] = None, *varying: Optional[str]) -> str:
+        """Build a cache key from the URL, query parameters and varying headers."""
+        parts = [url, json.dumps(params or {}, sort_keys=True), *(value or "" for value in varying)]
+        return hashlib.sha256("\n".join(parts).encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Return the stored entry for key, or None if there is none."""
+        try:
+            with open(self.cache_dir / f"{key}.json", "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def is_fresh(self, entry: Dict[str, Any]) -> bool:
+        """Check whether an entry can be used without revalidation."""
+        return time.time() - entry.get("stored_at", 0) < self.ttl
+
+    def set(self, key: str, etag: str, body: str) -> None:
+        """Store a response body under key; failures are ignored."""
+        entry = {"etag": etag, "stored_at": time.time(), "body": body}
+        try:
+            write_private_file(self.cache_dir / f"{key}.json", json.dumps(entry).encode("utf-8"))
+        except OSError:
+            pass
+
+    def touch(self, key: str, entry: Dict[str, Any]) -> None:
+        """Mark a revalidated entry as fresh again."""
+        self.set(key, entry["etag"], entry["body"])
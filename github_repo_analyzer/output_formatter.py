@@ -2,13 +2,56 @@
 Output formatting module for user stories and analysis results.
 """
 
+import contextlib
 import json
+import os
+import threading
 from datetime import datetime
-from typing import List, Optional
+from typing import IO, Any, Dict, Iterator, List, Optional
 from pathlib import Path
 
 from .types import AnalysisResult, OutputFormat, TestDocumentation
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def _dump_json(data: Any) -> bytes:
+    """Serialize data as indented UTF-8 JSON, using orjson when available."""
+    if orjson is not None:
+        try:
+            return orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+        except TypeError:
+            # orjson is stricter about input types; let json handle the rest
+            pass
+    return json.dumps(data, indent=2, ensure_ascii=False).encode("utf-8")
+
+
+_WRITE_BUFFER_SIZE = 128 * 1024
+
+
+@contextlib.contextmanager
+def _replace_on_success(file_path: Path, mode: str = "w", **kwargs: Any) -> Iterator[IO]:
+    """Open a temporary file that replaces file_path once the block completes.
+    
+    If writing fails, the temporary file is removed and any existing file at
+    file_path is left untouched.
+    """
+    file_path = Path(file_path)
+    tmp_path = file_path.with_name(f".{file_path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    try:
+        with open(tmp_path, mode, **kwargs) as f:
+            yield f
+        os.replace(tmp_path, file_path)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
+
 
 class OutputFormatter:
     """Formats analysis results into different output formats."""
@@ -25,80 +68,102 @@ class OutputFormatter:
         else:
             return self._format_text(result)
     
+    def stream(self, result: AnalysisResult, writer: IO[str]) -> None:
+        """Write the formatted result to writer line by line.
+        
+        Produces the same content as format_analysis_result without
+        building the whole document in memory first.
+        """
+        if self.output_format == OutputFormat.JSON:
+            writer.write(self._format_json(result))
+            return
+        
+        if self.output_format == OutputFormat.MARKDOWN:
+            lines = self._iter_markdown_lines(result)
+        else:
+            lines = self._iter_text_lines(result)
+        
+        writer.write(next(lines, ""))
+        writer.writelines(f"\n{line}" for line in lines)
+    
     def _format_text(self, result: AnalysisResult) -> str:
         """Format the result as plain text."""
-        lines = []
-        
+        return "\n".join(self._iter_text_lines(result))
+    
+    def _iter_text_lines(self, result: AnalysisResult) -> Iterator[str]:
+        """Yield the plain text output line by line."""
         # Header
-        lines.append(f"📋 User Stories for {result.repository.full_name}")
-        lines.append("=" * (len(result.repository.full_name) + 20))
-        lines.append("")
+        yield f"📋 User Stories for {result.repository.full_name}"
+        yield "=" * (len(result.repository.full_name) + 20)
+        yield ""
         
         # Repository summary
-        lines.append("📊 Repository Summary:")
-        lines.append(f"  • Description: {result.repository.description or 'No description available'}")
-        lines.append(f"  • Language: {result.repository.language or 'Not specified'}")
-        lines.append(f"  • Stars: {result.repository.stars}")
-        lines.append(f"  • Forks: {result.repository.forks}")
-        lines.append(f"  • Topics: {', '.join(result.repository.topics) if result.repository.topics else 'None'}")
-        lines.append(f"  • License: {result.repository.license or 'Not specified'}")
-        lines.append(f"  • Analysis Date: {result.analysis_date.strftime('%Y-%m-%d %H:%M:%S')}")
+        yield "📊 Repository Summary:"
+        yield f"  • Description: {result.repository.description or 'No description available'}"
+        yield f"  • Language: {result.repository.language or 'Not specified'}"
+        yield f"  • Stars: {result.repository.stars}"
+        yield f"  • Forks: {result.repository.forks}"
+        yield f"  • Topics: {', '.join(result.repository.topics) if result.repository.topics else 'None'}"
+        yield f"  • License: {result.repository.license or 'Not specified'}"
+        yield f"  • Analysis Date: {result.analysis_date.strftime('%Y-%m-%d %H:%M:%S')}"
         
         if result.focus_area:
-            lines.append(f"  • Focus Area: {result.focus_area}")
+            yield f"  • Focus Area: {result.focus_area}"
         
-        lines.append("")
+        yield ""
         
         # Technology stack
         if result.tech_stack:
-            lines.append("🔧 Technology Stack:")
+            yield "🔧 Technology Stack:"
             for tech in result.tech_stack:
-                lines.append(f"  • {tech}")
-            lines.append("")
+                yield f"  • {tech}"
+            yield ""
         
         # Key features
         if result.key_features:
-            lines.append("🎯 Key Features Identified:")
+            yield "🎯 Key Features Identified:"
             for feature in result.key_features[:5]:  # Limit to top 5
-                lines.append(f"  • {feature}")
-            lines.append("")
+                yield f"  • {feature}"
+            yield ""
         
         # Target users
         if result.target_users:
-            lines.append("👥 Target Users:")
+            yield "👥 Target Users:"
             for user in result.target_users:
-                lines.append(f"  • {user}")
-            lines.append("")
+                yield f"  • {user}"
+            yield ""
         
         # User stories
-        lines.append("📝 User Stories:")
-        lines.append("")
+        yield "📝 User Stories:"
+        yield ""
         
         for i, story in enumerate(result.user_stories, 1):
-            lines.append(f"🎯 Story {i}: {story.title}")
-            lines.append(f"   {story.description}")
-            lines.append("")
+            yield f"🎯 Story {i}: {story.title}"
+            yield f"   {story.description}"
+            yield ""
             
             if story.acceptance_criteria:
-                lines.append("   Acceptance Criteria:")
+                yield "   Acceptance Criteria:"
                 for criterion in story.acceptance_criteria:
-                    lines.append(f"   • {criterion.description}")
-                lines.append("")
+                    yield f"   • {criterion.description}"
+                yield ""
             
-            lines.append(f"   Priority: {story.priority.value}")
-            lines.append(f"   Effort: {story.effort.value}")
+            yield f"   Priority: {story.priority.value}"
+            yield f"   Effort: {story.effort.value}"
             
             if story.tags:
-                lines.append(f"   Tags: {', '.join(story.tags)}")
+                yield f"   Tags: {', '.join(story.tags)}"
             
-            lines.append("")
-            lines.append("-" * 60)
-            lines.append("")
-        
-        return "\n".join(lines)
+            yield ""
+            yield "-" * 60
+            yield ""
     
     def _format_json(self, result: AnalysisResult) -> str:
         """Format the result as JSON."""
+        return _dump_json(self._build_json_data(result)).decode("utf-8")
+    
+    def _build_json_data(self, result: AnalysisResult) -> Dict[str, Any]:
+        """Build the JSON-serializable representation of the result."""
         output_data = {
             "repository": {
                 "full_name": result.repository.full_name,
@@ -170,204 +235,206 @@ class OutputFormatter:
             }
             output_data["user_stories"].append(story_data)
         
-        return json.dumps(output_data, indent=2, ensure_ascii=False)
+        return output_data
     
     def _format_markdown(self, result: AnalysisResult) -> str:
         """Format the result as Markdown."""
-        lines = []
-        
+        return "\n".join(self._iter_markdown_lines(result))
+    
+    def _iter_markdown_lines(self, result: AnalysisResult) -> Iterator[str]:
+        """Yield the Markdown output line by line."""
         # Check if this is a comprehensive analysis
         is_comprehensive = bool(result.system_architecture or result.api_analysis or result.technical_deep_dive)
         
         # Header
         if is_comprehensive:
-            lines.append(f"# Comprehensive Technical Analysis: {result.repository.full_name}")
+            yield f"# Comprehensive Technical Analysis: {result.repository.full_name}"
         else:
-            lines.append(f"# User Stories for {result.repository.full_name}")
-        lines.append("")
+            yield f"# User Stories for {result.repository.full_name}"
+        yield ""
         
         # Repository summary
-        lines.append("## Repository Overview")
-        lines.append("")
-        lines.append(f"**Repository:** {result.repository.full_name}  ")
-        lines.append(f"**Description:** {result.repository.description or 'No description available'}  ")
-        lines.append(f"**Language:** {result.repository.language or 'Not specified'}  ")
-        lines.append(f"**Stars:** {result.repository.stars:,}  ")
-        lines.append(f"**Forks:** {result.repository.forks:,}  ")
-        lines.append(f"**Topics:** {', '.join(result.repository.topics) if result.repository.topics else 'None'}  ")
-        lines.append(f"**License:** {result.repository.license or 'Not specified'}  ")
-        lines.append(f"**Size:** {result.repository.size:,} KB  ")
-        lines.append(f"**Analysis Date:** {result.analysis_date.strftime('%Y-%m-%d %H:%M:%S')}  ")
+        yield "## Repository Overview"
+        yield ""
+        yield f"**Repository:** {result.repository.full_name}  "
+        yield f"**Description:** {result.repository.description or 'No description available'}  "
+        yield f"**Language:** {result.repository.language or 'Not specified'}  "
+        yield f"**Stars:** {result.repository.stars:,}  "
+        yield f"**Forks:** {result.repository.forks:,}  "
+        yield f"**Topics:** {', '.join(result.repository.topics) if result.repository.topics else 'None'}  "
+        yield f"**License:** {result.repository.license or 'Not specified'}  "
+        yield f"**Size:** {result.repository.size:,} KB  "
+        yield f"**Analysis Date:** {result.analysis_date.strftime('%Y-%m-%d %H:%M:%S')}  "
         
         if result.focus_area:
-            lines.append(f"**Focus Area:** {result.focus_area}  ")
+            yield f"**Focus Area:** {result.focus_area}  "
         
-        lines.append("")
+        yield ""
         
         # System Architecture Section
         if result.system_architecture:
-            lines.append("## 🏗️ System Architecture")
-            lines.append("")
-            lines.append("This section contains Mermaid diagrams that visualize the system architecture. ")
-            lines.append("Copy the diagram code to [Mermaid Live](https://mermaid.live) to view the interactive diagrams.")
-            lines.append("")
+            yield "## 🏗️ System Architecture"
+            yield ""
+            yield "This section contains Mermaid diagrams that visualize the system architecture. "
+            yield "Copy the diagram code to [Mermaid Live](https://mermaid.live) to view the interactive diagrams."
+            yield ""
             
             if result.system_architecture.system_diagram:
-                lines.append("### Overall System Architecture")
-                lines.append("")
-                lines.append("```mermaid")
-                lines.append(result.system_architecture.system_diagram)
-                lines.append("```")
-                lines.append("")
+                yield "### Overall System Architecture"
+                yield ""
+                yield "```mermaid"
+                yield result.system_architecture.system_diagram
+                yield "```"
+                yield ""
             
             if result.system_architecture.api_flow_diagram:
-                lines.append("### API Flow Diagram")
-                lines.append("")
-                lines.append("```mermaid")
-                lines.append(result.system_architecture.api_flow_diagram)
-                lines.append("```")
-                lines.append("")
+                yield "### API Flow Diagram"
+                yield ""
+                yield "```mermaid"
+                yield result.system_architecture.api_flow_diagram
+                yield "```"
+                yield ""
             
             if result.system_architecture.component_diagram:
-                lines.append("### Component Architecture")
-                lines.append("")
-                lines.append("```mermaid")
-                lines.append(result.system_architecture.component_diagram)
-                lines.append("```")
-                lines.append("")
+                yield "### Component Architecture"
+                yield ""
+                yield "```mermaid"
+                yield result.system_architecture.component_diagram
+                yield "```"
+                yield ""
             
             if result.system_architecture.data_flow_diagram:
-                lines.append("### Data Flow Architecture")
-                lines.append("")
-                lines.append("```mermaid")
-                lines.append(result.system_architecture.data_flow_diagram)
-                lines.append("```")
-                lines.append("")
+                yield "### Data Flow Architecture"
+                yield ""
+                yield "```mermaid"
+                yield result.system_architecture.data_flow_diagram
+                yield "```"
+                yield ""
         
         # API Analysis Section
         if result.api_analysis:
-            lines.append("## 🌐 API & Integration Analysis")
-            lines.append("")
+            yield "## 🌐 API & Integration Analysis"
+            yield ""
             
             if result.api_analysis.endpoints:
-                lines.append("### API Endpoints")
-                lines.append("")
+                yield "### API Endpoints"
+                yield ""
                 for i, endpoint in enumerate(result.api_analysis.endpoints, 1):
                     if isinstance(endpoint, dict):
                         method = endpoint.get('method', 'GET')
                         path = endpoint.get('path', endpoint.get('name', 'Unknown'))
                         desc = endpoint.get('description', '')
-                        lines.append(f"{i}. **{method}** `{path}`")
+                        yield f"{i}. **{method}** `{path}`"
                         if desc:
-                            lines.append(f"   - {desc}")
+                            yield f"   - {desc}"
                     else:
-                        lines.append(f"{i}. {endpoint}")
-                lines.append("")
+                        yield f"{i}. {endpoint}"
+                yield ""
             
             if result.api_analysis.external_services:
-                lines.append("### External Services & Integrations")
-                lines.append("")
+                yield "### External Services & Integrations"
+                yield ""
                 for service in result.api_analysis.external_services:
-                    lines.append(f"- {service}")
-                lines.append("")
+                    yield f"- {service}"
+                yield ""
             
             if result.api_analysis.authentication_methods:
-                lines.append("### Authentication Methods")
-                lines.append("")
+                yield "### Authentication Methods"
+                yield ""
                 for auth in result.api_analysis.authentication_methods:
-                    lines.append(f"- {auth}")
-                lines.append("")
+                    yield f"- {auth}"
+                yield ""
             
             if result.api_analysis.websocket_events:
-                lines.append("### Real-time Events (WebSocket)")
-                lines.append("")
+                yield "### Real-time Events (WebSocket)"
+                yield ""
                 for event in result.api_analysis.websocket_events:
-                    lines.append(f"- {event}")
-                lines.append("")
+                    yield f"- {event}"
+                yield ""
         
         # Technical Deep Dive Section
         if result.technical_deep_dive:
-            lines.append("## 🔧 Technical Deep Dive")
-            lines.append("")
+            yield "## 🔧 Technical Deep Dive"
+            yield ""
             
             # Technology Stack
             tech_stack = result.technical_deep_dive.technology_stack
             if tech_stack:
-                lines.append("### Technology Stack")
-                lines.append("")
+                yield "### Technology Stack"
+                yield ""
                 for category, technologies in tech_stack.items():
                     if technologies:
-                        lines.append(f"**{category.replace('_', ' ').title()}:**")
+                        yield f"**{category.replace('_', ' ').title()}:**"
                         for tech in technologies:
-                            lines.append(f"- {tech}")
-                        lines.append("")
+                            yield f"- {tech}"
+                        yield ""
             
             # Build System
             if result.technical_deep_dive.build_system:
-                lines.append("### Build System")
-                lines.append("")
+                yield "### Build System"
+                yield ""
                 build_info = result.technical_deep_dive.build_system
                 for key, value in build_info.items():
                     if value:
-                        lines.append(f"- **{key.replace('_', ' ').title()}:** {value}")
-                lines.append("")
+                        yield f"- **{key.replace('_', ' ').title()}:** {value}"
+                yield ""
             
             # Performance Optimizations
             if result.technical_deep_dive.performance_optimizations:
-                lines.append("### Performance Optimizations")
-                lines.append("")
+                yield "### Performance Optimizations"
+                yield ""
                 for opt in result.technical_deep_dive.performance_optimizations:
-                    lines.append(f"- {opt}")
-                lines.append("")
+                    yield f"- {opt}"
+                yield ""
             
             # Security Features
             if result.technical_deep_dive.security_features:
-                lines.append("### Security Features")
-                lines.append("")
+                yield "### Security Features"
+                yield ""
                 for security in result.technical_deep_dive.security_features:
-                    lines.append(f"- {security}")
-                lines.append("")
+                    yield f"- {security}"
+                yield ""
         
         # Comprehensive Technical Report
         if result.comprehensive_report:
-            lines.append("## 📋 Technical Report")
-            lines.append("")
-            lines.append(result.comprehensive_report)
-            lines.append("")
+            yield "## 📋 Technical Report"
+            yield ""
+            yield result.comprehensive_report
+            yield ""
         
         # Show basic analysis only if no comprehensive analysis is available
         if not is_comprehensive:
             # Technology stack
             if result.tech_stack:
-                lines.append("## Technology Stack")
-                lines.append("")
+                yield "## Technology Stack"
+                yield ""
                 for tech in result.tech_stack:
-                    lines.append(f"- {tech}")
-                lines.append("")
+                    yield f"- {tech}"
+                yield ""
             
             # Key features
             if result.key_features:
-                lines.append("## Key Features Identified")
-                lines.append("")
+                yield "## Key Features Identified"
+                yield ""
                 for feature in result.key_features[:5]:  # Limit to top 5
-                    lines.append(f"- {feature}")
-                lines.append("")
+                    yield f"- {feature}"
+                yield ""
             
             # Target users
             if result.target_users:
-                lines.append("## Target Users")
-                lines.append("")
+                yield "## Target Users"
+                yield ""
                 for user in result.target_users:
-                    lines.append(f"- {user}")
-                lines.append("")
+                    yield f"- {user}"
+                yield ""
         
         # User stories
-        lines.append("## User Stories")
-        lines.append("")
+        yield "## User Stories"
+        yield ""
         
         for i, story in enumerate(result.user_stories, 1):
-            lines.append(f"### Story {i}: {story.title}")
-            lines.append("")
+            yield f"### Story {i}: {story.title}"
+            yield ""
             
             # Format the user story description
             if "As a" in story.description and "I want" in story.description and "So that" in story.description:
@@ -379,52 +446,66 @@ class OutputFormatter:
                         want_part = want_benefit[0].strip()
                         benefit_part = want_benefit[1].strip()
                         
-                        lines.append(f"**As a** {user_part}  ")
-                        lines.append(f"**I want to** {want_part}  ")
-                        lines.append(f"**So that** {benefit_part}")
-                        lines.append("")
+                        yield f"**As a** {user_part}  "
+                        yield f"**I want to** {want_part}  "
+                        yield f"**So that** {benefit_part}"
+                        yield ""
                     else:
-                        lines.append(f"**Description:** {story.description}")
-                        lines.append("")
+                        yield f"**Description:** {story.description}"
+                        yield ""
                 else:
-                    lines.append(f"**Description:** {story.description}")
-                    lines.append("")
+                    yield f"**Description:** {story.description}"
+                    yield ""
             else:
-                lines.append(f"**Description:** {story.description}")
-                lines.append("")
+                yield f"**Description:** {story.description}"
+                yield ""
             
             # Acceptance criteria
             if story.acceptance_criteria:
-                lines.append("#### Acceptance Criteria")
-                lines.append("")
+                yield "#### Acceptance Criteria"
+                yield ""
                 for criterion in story.acceptance_criteria:
-                    lines.append(f"- {criterion.description}")
-                lines.append("")
+                    yield f"- {criterion.description}"
+                yield ""
             
             # Metadata
-            lines.append(f"**Priority:** {story.priority.value}  ")
-            lines.append(f"**Effort:** {story.effort.value}  ")
+            yield f"**Priority:** {story.priority.value}  "
+            yield f"**Effort:** {story.effort.value}  "
             
             if story.tags:
-                lines.append(f"**Tags:** {', '.join(story.tags)}  ")
+                yield f"**Tags:** {', '.join(story.tags)}  "
             
-            lines.append("")
-            lines.append("---")
-            lines.append("")
-        
-        return "\n".join(lines)
+            yield ""
+            yield "---"
+            yield ""
     
     def save_to_file(self, result: AnalysisResult, file_path: Path) -> None:
         """Save the formatted result to a file."""
         try:
-            content = self.format_analysis_result(result)
+            if self.output_format == OutputFormat.JSON:
+                # Write the serialized bytes directly, skipping a str round-trip
+                content = _dump_json(self._build_json_data(result))
+                with _replace_on_success(file_path, 'wb') as f:
+                    f.write(content)
+                return
             
-            with open(file_path, 'w', encoding='utf-8') as f:
-                f.write(content)
+            # Streaming writes many short lines; a larger buffer keeps
+            # that to a few write syscalls
+            with _replace_on_success(
+                file_path, 'w', encoding='utf-8', buffering=_WRITE_BUFFER_SIZE
+            ) as f:
+                self.stream(result, f)
                 
         except Exception as e:
             raise IOError(f"Failed to save output to file {file_path}: {e}")
     
+    async def save_to_file_async(self, result: AnalysisResult, file_path: Path) -> None:
+        """Save the formatted result to a file without blocking the event loop."""
+        import anyio
+        
+        # Formatting and the atomic write both run in a worker thread
+        await anyio.to_thread.run_sync(self.save_to_file, result, file_path)
+    
     def format_test_documentation(self, test_doc: TestDocumentation) -> str:
         """Format test documentation according to the specified output format."""
         if self.output_format == OutputFormat.JSON:
@@ -466,7 +547,7 @@ class OutputFormatter:
             lines.append(f"   Description: {suite.description}")
             lines.append(f"   Test Type: {suite.test_type.value.title()}")
             lines.append(f"   Total Tests: {suite.total_tests}")
-            lines.append(f"   User Stories: {', '.join(map(str, suite.user_story_ids))}")
+            lines.append(f"   User Stories: {suite.user_story_ids_text}")
             lines.append("")
             
             # Test cases
@@ -571,7 +652,7 @@ class OutputFormatter:
             lines.append(f"**Description:** {suite.description}")
             lines.append(f"**Test Type:** {suite.test_type.value.title()}")
             lines.append(f"**Total Tests:** {suite.total_tests}")
-            lines.append(f"**User Stories:** {', '.join(map(str, suite.user_story_ids))}")
+            lines.append(f"**User Stories:** {suite.user_story_ids_text}")
             lines.append("")
             
             # Test cases
@@ -648,8 +729,6 @@ class OutputFormatter:
     
     def _format_test_documentation_json(self, test_doc: TestDocumentation) -> str:
         """Format test documentation as JSON."""
-        import json
-        
         # Convert to dictionary
         test_data = {
             "repository_name": test_doc.repository_name,
@@ -698,16 +777,15 @@ class OutputFormatter:
             
             test_data["test_suites"].append(suite_data)
         
-        return json.dumps(test_data, indent=2, ensure_ascii=False)
+        return _dump_json(test_data).decode("utf-8")
     
     def save_test_documentation_to_file(self, test_doc: TestDocumentation, file_path: Path) -> None:
         """Save the formatted test documentation to a file."""
         try:
             content = self.format_test_documentation(test_doc)
-            
-            with open(file_path, 'w', encoding='utf-8') as f:
+            with _replace_on_success(file_path, 'w', encoding='utf-8') as f:
                 f.write(content)
-                
+            
         except Exception as e:
             raise IOError(f"Failed to save test documentation to file {file_path}: {e}")
     
@@ -0,0 +1,35 @@
+"""
+Client-side rate limiting for outbound API requests.
+"""
+
+import asyncio
+import time
+
+
+class TokenBucket:
+    """Async token bucket that smooths request bursts to a sustained rate.
+
+    Tokens refill continuously at ``rate`` per second up to ``capacity``;
+    acquire() waits until enough tokens are available.
+    """
+
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated_at = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated_at) * self.rate)
+        self._updated_at = now
+
+    async def acquire(self, tokens: float = 1) -> None:
+        """Wait until the requested number of tokens can be taken."""
+        async with self._lock:
+            self._refill()
+            while self._tokens < tokens:
+                await asyncio.sleep((tokens - self._tokens) / self.rate)
+                self._refill()
+            self._tokens -= tokens
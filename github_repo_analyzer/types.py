@@ -3,6 +3,7 @@ Type definitions for the GitHub Repository Analyzer.
 """
 
 from dataclasses import dataclass, field
+from functools import cached_property
 from datetime import datetime
 from enum import Enum
 from typing import List, Optional, Dict, Any
@@ -60,14 +61,14 @@ class TestPriority(Enum):
     CRITICAL = "Critical"
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class AcceptanceCriterion:
     """A single acceptance criterion for a user story."""
     description: str
     completed: bool = False
 
 
-@dataclass
+@dataclass(slots=True)
 class UserStory:
     """A user story generated from repository analysis."""
     id: int
@@ -112,6 +113,11 @@ class TestSuite:
     
     def __post_init__(self):
         self.total_tests = len(self.test_cases)
+    
+    @cached_property
+    def user_story_ids_text(self) -> str:
+        """Comma-separated user story ids for display."""
+        return ", ".join([str(story_id) for story_id in self.user_story_ids])
 
 
 @dataclass
@@ -146,6 +152,19 @@ class RepositoryInfo:
     updated_at: datetime
     size: int
     default_branch: str
+    # Identifies the repository's current state: the default branch's head
+    # commit when known, otherwise the time of the last push
+    revision: Optional[str] = None
+    
+    @cached_property
+    def created_date(self) -> str:
+        """Creation date as YYYY-MM-DD."""
+        return self.created_at.date().isoformat()
+    
+    @cached_property
+    def updated_date(self) -> str:
+        """Last update date as YYYY-MM-DD."""
+        return self.updated_at.date().isoformat()
 
 
 @dataclass
@@ -154,6 +173,13 @@ class GitHubConfig:
     token: Optional[str] = None
     base_url: str = "https://api.github.com"
     timeout: int = 30
+    max_concurrent_requests: int = 10
+    max_retries: int = 3
+    # On-disk ETag cache for API responses; disabled when cache_dir is None
+    cache_dir: Optional[str] = None
+    cache_ttl: float = 300.0
+    # Share one pooled HTTP session between clients with the same token
+    reuse_session: bool = False
 
 
 @dataclass
@@ -163,6 +189,8 @@ class ClaudeConfig:
     max_turns: int = 3
     allowed_tools: List[str] = field(default_factory=lambda: ["Read", "Write", "Bash"])
     permission_mode: str = "acceptEdits"
+    # Repositories analyzed at once by EnhancedClaudeAnalyzer.analyze_many
+    max_concurrent_analyses: int = 8
 
 
 @dataclass
@@ -176,6 +204,10 @@ class AnalyzerConfig:
     output_file: Optional[Path] = None
     verbose: bool = False
     include_metadata: bool = True
+    # On-disk cache of Claude analysis results; disabled when None
+    analysis_cache_dir: Optional[str] = None
+    # Per-command flags, e.g. which comprehensive analysis sections to run
+    metadata: Dict[str, Any] = field(default_factory=dict)
 
 
 @dataclass
@@ -185,6 +217,11 @@ class WebSearchResult:
     url: str
     snippet: str
     relevance_score: float
+    
+    @cached_property
+    def prompt_snippet(self) -> str:
+        """Title, URL and truncated snippet formatted for the analysis prompt."""
+        return f"{self.title}\n   URL: {self.url}\n   Context: {self.snippet[:300]}...\n\n"
 
 
 @dataclass
@@ -173,7 +173,7 @@ class WebResearcher:
                 import urllib.parse
                 decoded = urllib.parse.unquote(url.split("uddg=")[1])
                 return decoded
-            except:
+            except IndexError:
                 return url
         return url
     
@@ -0,0 +1,232 @@
+"""
+Tests for analyzer configuration loading.
+"""
+
+import asyncio
+import os
+from datetime import datetime
+
+import pytest
+from unittest.mock import Mock, patch
+
+from github_repo_analyzer.analyzer import AnalyzerFactory, GitHubRepoAnalyzer
+from github_repo_analyzer.exceptions import (
+    ConfigurationError, RateLimitError, RepositoryNotFoundError
+)
+from github_repo_analyzer.types import AnalyzerConfig, GitHubConfig, OutputFormat, RepositoryInfo
+
+
+CONFIG_YAML = """
+github:
+  token: file-token
+  timeout: 10
+claude:
+  max_turns: 7
+  allowed_tools: [Read, Grep]
+max_stories: 8
+focus_area: security
+output_format: Markdown
+"""
+
+
+def test_create_from_file(tmp_path):
+    """Test loading a configuration from a YAML file."""
+    config_path = tmp_path / "config.yaml"
+    config_path.write_text(CONFIG_YAML)
+    
+    config = AnalyzerFactory.create_from_file(config_path)
+    
+    assert config.github.token == "file-token"
+    assert config.github.timeout == 10
+    assert config.github.base_url == "https://api.github.com"
+    assert config.claude.max_turns == 7
+    assert config.claude.allowed_tools == ["Read", "Grep"]
+    assert config.max_stories == 8
+    assert config.focus_area == "security"
+    assert config.output_format == OutputFormat.MARKDOWN
+
+
+def test_create_from_file_returns_independent_configs(tmp_path):
+    """Test that configs loaded from the same file don't share mutable state."""
+    config_path = tmp_path / "config.yaml"
+    config_path.write_text(CONFIG_YAML)
+    
+    first = AnalyzerFactory.create_from_file(config_path)
+    first.claude.allowed_tools.append("Bash")
+    second = AnalyzerFactory.create_from_file(config_path)
+    
+    assert second.claude.allowed_tools == ["Read", "Grep"]
+
+
+def test_create_from_file_reloads_modified_file(tmp_path):
+    """Test that edits to the config file are picked up."""
+    config_path = tmp_path / "config.yaml"
+    config_path.write_text("max_stories: 3\n")
+    assert AnalyzerFactory.create_from_file(config_path).max_stories == 3
+    
+    config_path.write_text("max_stories: 4\n")
+    stat = config_path.stat()
+    os.utime(config_path, (stat.st_atime, stat.st_mtime + 10))
+    assert AnalyzerFactory.create_from_file(config_path).max_stories == 4
+
+
+def test_create_from_file_missing(tmp_path):
+    """Test that a missing file raises ConfigurationError."""
+    with pytest.raises(ConfigurationError):
+        AnalyzerFactory.create_from_file(tmp_path / "missing.yaml")
+
+
+def test_fetch_repository_info_retries_rate_limited_calls():
+    """Test that rate-limited GitHub calls are retried with backoff."""
+    async def run():
+        analyzer = GitHubRepoAnalyzer(AnalyzerConfig())
+        analyzer.github_client = Mock()
+        analyzer.github_client.get_repository_info.side_effect = [
+            RateLimitError("secondary rate limit"),
+            "repo-info",
+        ]
+        GitHubRepoAnalyzer._repo_info_cache.clear()
+        
+        async def no_sleep(seconds):
+            pass
+        
+        with patch("github_repo_analyzer.analyzer.asyncio.sleep", no_sleep):
+            result = await analyzer._fetch_repository_info("octo", "retry-repo")
+        
+        assert result == "repo-info"
+        assert analyzer.github_client.get_repository_info.call_count == 2
+        analyzer.close()
+    
+    asyncio.run(run())
+
+
+def test_call_github_honours_rate_limit_hints():
+    """Test that exhausted quotas fail at once and Retry-After waits are honoured."""
+    async def run():
+        analyzer = GitHubRepoAnalyzer(AnalyzerConfig())
+        exhausted = Mock(side_effect=RateLimitError("quota used up", exhausted=True))
+        secondary = Mock(side_effect=[RateLimitError("slow down", retry_after=5.0), "ok"])
+        sleeps = []
+        
+        async def fake_sleep(seconds):
+            sleeps.append(seconds)
+        
+        with patch("github_repo_analyzer.analyzer.asyncio.sleep", fake_sleep):
+            with pytest.raises(RateLimitError):
+                await analyzer._call_github(exhausted)
+            assert exhausted.call_count == 1
+            assert await analyzer._call_github(secondary) == "ok"
+        
+        assert sleeps == [5.0]
+        analyzer.close()
+    
+    asyncio.run(run())
+
+
+def test_analyze_repository_propagates_specific_errors():
+    """Test that a missing repository surfaces as RepositoryNotFoundError."""
+    async def run():
+        analyzer = GitHubRepoAnalyzer(AnalyzerConfig())
+        analyzer.github_client = Mock(uses_graphql=False)
+        analyzer.github_client.get_repository_core.side_effect = RepositoryNotFoundError(
+            "Repository octo/missing not found"
+        )
+        GitHubRepoAnalyzer._repo_info_cache.clear()
+        
+        with pytest.raises(RepositoryNotFoundError):
+            await analyzer.analyze_repository("octo", "missing")
+        analyzer.close()
+    
+    asyncio.run(run())
+
+
+def test_fetch_repository_and_research_overlaps_readme_and_research():
+    """Test that web research starts from the core metadata and the README is attached."""
+    async def run():
+        analyzer = GitHubRepoAnalyzer(AnalyzerConfig())
+        repo_info = Mock(readme_content=None)
+        analyzer.github_client = Mock(uses_graphql=False)
+        analyzer.github_client.get_repository_core.return_value = repo_info
+        analyzer.github_client.get_readme.return_value = "# Readme"
+        GitHubRepoAnalyzer._repo_info_cache.clear()
+        
+        researched = []
+        
+        async def fake_research(info):
+            # The README has not been attached when research starts
+            researched.append(info.readme_content)
+            return ["result"]
+        
+        analyzer._conduct_web_research = fake_research
+        info, web_results = await analyzer._fetch_repository_and_research("octo", "repo")
+        
+        assert info is repo_info
+        assert info.readme_content == "# Readme"
+        assert web_results == ["result"]
+        assert researched == [None]
+        cache_key = analyzer._repo_cache_key("octo", "repo")
+        assert GitHubRepoAnalyzer._repo_info_cache.get(cache_key) is repo_info
+        analyzer.close()
+    
+    asyncio.run(run())
+
+
+def test_fetch_repository_overview_from_cache_matches_fresh_fetch():
+    """Test that a cached repository gives a README-less copy and a bounded preview."""
+    async def run():
+        analyzer = GitHubRepoAnalyzer(AnalyzerConfig())
+        repo_info = RepositoryInfo(
+            owner="octo", name="repo", full_name="octo/repo", description=None,
+            language=None, stars=0, forks=0, topics=[], readme_content="é" * 10,
+            license=None, created_at=datetime(2020, 1, 1), updated_at=datetime(2024, 1, 1),
+            size=0, default_branch="main"
+        )
+        GitHubRepoAnalyzer._repo_info_cache.clear()
+        GitHubRepoAnalyzer._repo_info_cache.set(analyzer._repo_cache_key("octo", "repo"), repo_info)
+        
+        info, preview = await analyzer._fetch_repository_overview("octo", "repo", readme_bytes=5)
+        
+        assert info.readme_content is None
+        assert info.full_name == "octo/repo"
+        # The cut falls inside a two-byte character
+        assert preview == "éé"
+        assert repo_info.readme_content == "é" * 10
+        analyzer.close()
+    
+    asyncio.run(run())
+
+
+def test_repo_info_cache_is_scoped_to_credentials():
+    """Test that analyzers with different tokens or hosts don't share repository info."""
+    async def run():
+        GitHubRepoAnalyzer._repo_info_cache.clear()
+        first = GitHubRepoAnalyzer(AnalyzerConfig(github=GitHubConfig(token="token-a")))
+        first.github_client = Mock()
+        first.github_client.get_repository_info.return_value = "private-info"
+        await first._fetch_repository_info("octo", "repo")
+        
+        others = [
+            GitHubRepoAnalyzer(AnalyzerConfig(github=GitHubConfig(token="token-b"))),
+            GitHubRepoAnalyzer(AnalyzerConfig(github=GitHubConfig(
+                token="token-a", base_url="https://ghe.example.com/api/v3"
+            ))),
+        ]
+        for other in others:
+            other.github_client = Mock()
+            other.github_client.get_repository_info.return_value = "other-info"
+            assert await other._fetch_repository_info("octo", "repo") == "other-info"
+            other.close()
+        
+        # The same credentials still hit the cache
+        same = GitHubRepoAnalyzer(AnalyzerConfig(github=GitHubConfig(token="token-a")))
+        same.github_client = Mock()
+        assert await same._fetch_repository_info("octo", "repo") == "private-info"
+        same.github_client.get_repository_info.assert_not_called()
+        first.close()
+        same.close()
+    
+    asyncio.run(run())
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
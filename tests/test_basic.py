@@ -8,7 +8,7 @@ from datetime import datetime
 
 from github_repo_analyzer.types import (
     RepositoryInfo, UserStory, AcceptanceCriterion, 
-    StoryPriority, StoryEffort, AnalysisResult
+    StoryPriority, StoryEffort, AnalysisResult, WebSearchResult
 )
 
 
@@ -45,6 +45,20 @@ def test_repository_info_creation():
     assert repo_info.default_branch == "main"
 
 
+def test_repository_info_dates():
+    """Test the preformatted creation and update dates."""
+    repo_info = RepositoryInfo(
+        owner="test-owner", name="test-repo", full_name="test-owner/test-repo",
+        description=None, language=None, stars=0, forks=0, topics=[],
+        readme_content=None, license=None,
+        created_at=datetime(2019, 3, 7, 15, 30), updated_at=datetime(2024, 11, 20),
+        size=0, default_branch="main"
+    )
+    
+    assert repo_info.created_date == "2019-03-07"
+    assert repo_info.updated_date == "2024-11-20"
+
+
 def test_user_story_creation():
     """Test creating a UserStory object."""
     acceptance_criteria = [
@@ -122,5 +136,16 @@ def test_output_format_enum():
     assert OutputFormat.MARKDOWN.value == "markdown"
 
 
+def test_web_search_result_prompt_snippet():
+    """Test that the prompt snippet truncates the snippet text."""
+    result = WebSearchResult(
+        title="Guide", url="https://example.com", snippet="x" * 400, relevance_score=0.5
+    )
+    
+    assert result.prompt_snippet == (
+        "Guide\n   URL: https://example.com\n   Context: " + "x" * 300 + "...\n\n"
+    )
+
+
 if __name__ == "__main__":
     pytest.main([__file__])
@@ -0,0 +1,154 @@
+"""
+Tests for the in-memory and on-disk caching utilities.
+"""
+
+import asyncio
+from dataclasses import replace
+from datetime import datetime
+
+import pytest
+from unittest.mock import AsyncMock, patch
+
+from github_repo_analyzer.analyzer import GitHubRepoAnalyzer
+from github_repo_analyzer.cache import AnalysisCache, TTLCache
+from github_repo_analyzer.types import (
+    AnalysisResult, AnalyzerConfig, RepositoryInfo, UserStory, AcceptanceCriterion,
+    StoryPriority, StoryEffort
+)
+
+
+def test_ttl_cache_get_and_set():
+    """Test storing and retrieving values."""
+    cache = TTLCache(maxsize=4, ttl=60)
+    cache.set(("facebook", "react"), "repo-info")
+
+    assert cache.get(("facebook", "react")) == "repo-info"
+    assert ("facebook", "react") in cache
+    assert cache.get(("django", "django")) is None
+    assert cache.get(("django", "django"), "default") == "default"
+
+
+def test_ttl_cache_expires_entries():
+    """Test that entries are dropped once their TTL has elapsed."""
+    cache = TTLCache(maxsize=4, ttl=10)
+
+    with patch("github_repo_analyzer.cache.time.monotonic", return_value=100.0):
+        cache.set("key", "value")
+
+    with patch("github_repo_analyzer.cache.time.monotonic", return_value=105.0):
+        assert cache.get("key") == "value"
+
+    with patch("github_repo_analyzer.cache.time.monotonic", return_value=111.0):
+        assert cache.get("key") is None
+        assert len(cache) == 0
+
+
+def test_ttl_cache_evicts_least_recently_used():
+    """Test that the least recently used entry is evicted when full."""
+    cache = TTLCache(maxsize=2, ttl=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+
+    assert "a" in cache
+    assert "b" not in cache
+    assert "c" in cache
+
+
+def make_repo_info(revision="abc123"):
+    """Create repository information at the given revision."""
+    return RepositoryInfo(
+        owner="octocat", name="hello-world", full_name="octocat/hello-world",
+        description="Greets", language="Python", stars=1, forks=0,
+        topics=["cli"], readme_content=None, license="MIT",
+        created_at=datetime(2020, 1, 1), updated_at=datetime(2024, 6, 1),
+        size=10, default_branch="main", revision=revision
+    )
+
+
+def make_result(repo_info, metadata=None):
+    """Create an analysis result with one story."""
+    story = UserStory(
+        id=1, title="Greet", description="As a user, I want a greeting",
+        acceptance_criteria=[AcceptanceCriterion("Says hello")],
+        priority=StoryPriority.HIGH, effort=StoryEffort.SMALL, tags=["cli"]
+    )
+    return AnalysisResult(
+        repository=repo_info, user_stories=[story], analysis_date=datetime(2024, 6, 2),
+        focus_area=None, tech_stack=["cli"], key_features=["Greet"], target_users=["user"],
+        metadata=metadata or {}
+    )
+
+
+def test_round_trip_attaches_current_repository(tmp_path):
+    """Test that cached stories are restored onto the freshly fetched repository info."""
+    cache = AnalysisCache(tmp_path)
+    config = AnalyzerConfig()
+    key = AnalysisCache.key(make_repo_info(), config)
+    cache.set(key, make_result(make_repo_info()))
+
+    fresh = replace(make_repo_info(), stars=99)
+    cached = cache.get(key, fresh)
+
+    assert cached.repository is fresh
+    assert cached.user_stories[0].priority == StoryPriority.HIGH
+    assert cached.user_stories[0].acceptance_criteria[0].description == "Says hello"
+    assert cached.analysis_date == datetime(2024, 6, 2)
+
+
+def test_entries_are_private_to_the_user(tmp_path):
+    """Test that cached analyses are only readable by their owner."""
+    cache_dir = tmp_path / "results"
+    cache = AnalysisCache(cache_dir)
+    cache.set("octocat_hello-world_abc", make_result(make_repo_info()))
+
+    assert cache_dir.stat().st_mode & 0o777 == 0o700
+    assert [p.name for p in cache_dir.iterdir()] == ["octocat_hello-world_abc.json"]
+    assert (cache_dir / "octocat_hello-world_abc.json").stat().st_mode & 0o777 == 0o600
+
+
+def test_key_depends_on_revision_and_settings():
+    """Test that new commits or different settings miss the cache."""
+    config = AnalyzerConfig()
+    key = AnalysisCache.key(make_repo_info(), config)
+
+    assert AnalysisCache.key(make_repo_info("def456"), config) != key
+    assert AnalysisCache.key(make_repo_info(), replace(config, max_stories=3)) != key
+    assert AnalysisCache.key(make_repo_info(revision=None), config) is None
+
+    concurrent = replace(config, claude=replace(config.claude, max_concurrent_analyses=2))
+    assert AnalysisCache.key(make_repo_info(), concurrent) == key
+
+
+def test_analyzer_skips_claude_on_cache_hit(tmp_path):
+    """Test that a cached analysis is served without querying Claude again."""
+    analyzer = GitHubRepoAnalyzer(AnalyzerConfig(analysis_cache_dir=str(tmp_path)))
+    repo_info = make_repo_info()
+    analyzer.claude_analyzer.analyze_repository = AsyncMock(return_value=make_result(repo_info))
+
+    asyncio.run(analyzer._analyze_with_claude(repo_info, []))
+    cached = asyncio.run(analyzer._analyze_with_claude(repo_info, []))
+
+    assert analyzer.claude_analyzer.analyze_repository.await_count == 1
+    assert cached.metadata == {"cached": True}
+    analyzer.close()
+
+
+def test_analyzer_does_not_cache_fallback_stories(tmp_path):
+    """Test that fallback stories from a failed query are not cached."""
+    analyzer = GitHubRepoAnalyzer(AnalyzerConfig(analysis_cache_dir=str(tmp_path)))
+    repo_info = make_repo_info()
+    analyzer.claude_analyzer.analyze_repository = AsyncMock(
+        return_value=make_result(repo_info, metadata={"fallback_stories": True})
+    )
+
+    asyncio.run(analyzer._analyze_with_claude(repo_info, []))
+    asyncio.run(analyzer._analyze_with_claude(repo_info, []))
+
+    assert analyzer.claude_analyzer.analyze_repository.await_count == 2
+    analyzer.close()
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
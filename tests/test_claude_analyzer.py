@@ -0,0 +1,156 @@
+"""
+Tests for parsing Claude responses into user stories.
+"""
+
+import asyncio
+import json
+
+import pytest
+from unittest.mock import patch
+from claude_code_sdk import AssistantMessage, TextBlock
+
+from github_repo_analyzer import claude_analyzer
+from github_repo_analyzer.claude_analyzer import ClaudeAnalyzer, _summarize_readme
+from github_repo_analyzer.types import (
+    ClaudeConfig, StoryPriority, StoryEffort, UserStory
+)
+
+
+@pytest.fixture
+def analyzer():
+    """Create a ClaudeAnalyzer with default configuration."""
+    return ClaudeAnalyzer(ClaudeConfig())
+
+
+def test_extract_json_from_plain_object(analyzer):
+    """Test extracting a bare JSON object."""
+    assert analyzer._extract_json_from_text('{"user_stories": []}') == {"user_stories": []}
+
+
+def test_extract_json_ignores_surrounding_prose(analyzer):
+    """Test that prose before and after the object, including braces, is ignored."""
+    text = 'Here you go:\n{"user_stories": [{"title": "A"}]}\nLet me know if you need {more}.'
+    assert analyzer._extract_json_from_text(text) == {"user_stories": [{"title": "A"}]}
+
+
+def test_extract_json_handles_braces_in_strings(analyzer):
+    """Test that braces and escaped quotes inside strings do not end the object."""
+    text = '{"title": "Use {curly} \\"braces\\"", "tags": ["}"]} trailing }'
+    assert analyzer._extract_json_from_text(text) == {
+        "title": 'Use {curly} "braces"',
+        "tags": ["}"],
+    }
+
+
+def test_extract_json_returns_none_without_object(analyzer):
+    """Test that text without a complete JSON object yields None."""
+    assert analyzer._extract_json_from_text("no json here") is None
+    assert analyzer._extract_json_from_text('{"unterminated": [') is None
+
+
+def test_parse_user_story_matches_enums_case_insensitively(analyzer):
+    """Test that priority and effort values are matched regardless of case."""
+    story = analyzer._parse_user_story(
+        {"title": "Export", "priority": "high", "effort": "Extra Large"}, 1
+    )
+    assert story.priority == StoryPriority.HIGH
+    assert story.effort == StoryEffort.EXTRA_LARGE
+
+
+def test_parse_user_story_defaults_unknown_enums(analyzer):
+    """Test that unknown or malformed priority and effort fall back to Medium."""
+    story = analyzer._parse_user_story(
+        {"title": "Export", "priority": "urgent", "effort": ["big"]}, 1
+    )
+    assert story.priority == StoryPriority.MEDIUM
+    assert story.effort == StoryEffort.MEDIUM
+
+
+def test_query_user_stories_stops_at_max_stories(analyzer):
+    """Test that the Claude stream is closed once enough stories are parsed."""
+    stories = [{"title": f"Story {i}"} for i in range(4)]
+    consumed = []
+    closed = []
+    
+    async def fake_query(prompt, options):
+        try:
+            for i in range(3):
+                consumed.append(i)
+                text = json.dumps({"user_stories": stories})
+                yield AssistantMessage(content=[TextBlock(text=text)], model="test")
+        finally:
+            closed.append(True)
+    
+    with patch("claude_code_sdk.query", fake_query):
+        user_stories = asyncio.run(
+            analyzer._query_user_stories("prompt", analyzer._options, max_stories=3)
+        )
+    
+    assert [story.title for story in user_stories] == ["Story 0", "Story 1", "Story 2"]
+    assert consumed == [0]
+    assert closed == [True]
+
+
+def test_extract_analysis_info_deduplicates_in_order(analyzer):
+    """Test that users and tech tags are de-duplicated in first-seen order."""
+    def story(title, description, tags):
+        return UserStory(
+            id=1, title=title, description=description, acceptance_criteria=[],
+            priority=StoryPriority.MEDIUM, effort=StoryEffort.MEDIUM, tags=tags
+        )
+    
+    stories = [
+        story("Login", "As a developer, I want to log in", ["backend", "auth"]),
+        story("Search", "As a designer, I want search", ["Frontend", "backend"]),
+        story("Export", "As a developer, I want export", ["api"]),
+        story("Misc", "No persona here", []),
+    ]
+    
+    tech_stack, key_features, target_users = analyzer._extract_analysis_info(stories)
+    
+    assert tech_stack == ["backend", "Frontend", "api"]
+    assert key_features == ["Login", "Search", "Export", "Misc"]
+    assert target_users == ["developer", "designer"]
+
+
+def test_summarize_readme_drops_boilerplate():
+    """Test that badges, HTML banners and blank runs are removed from READMEs."""
+    readme = "\n".join([
+        '<p align="center">',
+        '  <img src="logo.png">',
+        '</p>',
+        '[![Build](https://ci/badge.svg)](https://ci)',
+        '',
+        '',
+        '# Project',
+        '',
+        'A tool for analyzing things.',
+        '[docs]: https://example.com/docs',
+    ])
+    
+    assert _summarize_readme(readme) == "# Project\n\nA tool for analyzing things."
+
+
+def test_summarize_readme_truncates_long_content():
+    """Test that long READMEs are cut to the limit with an ellipsis."""
+    assert _summarize_readme("x" * 50, limit=10) == "x" * 10 + "..."
+    assert _summarize_readme("short", limit=10) == "short"
+
+
+def test_summarize_readme_scans_a_bounded_window():
+    """Test that only the start of a huge README is summarized and cached."""
+    readme = "Intro\n" + "line\n" * 100_000
+
+    with patch(
+        "github_repo_analyzer.claude_analyzer._summarize_readme_window",
+        wraps=claude_analyzer._summarize_readme_window
+    ) as summarize_window:
+        summary = _summarize_readme(readme, limit=20)
+
+    assert summary == "Intro\nline\nline\nline..."
+    window = summarize_window.call_args.args[0]
+    assert len(window) == 80
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
@@ -0,0 +1,179 @@
+"""
+Tests for CLI argument parsing.
+"""
+
+import asyncio
+import io
+import sys
+
+import click
+import pytest
+from click.testing import CliRunner
+from dataclasses import replace
+from rich.console import Console
+from types import SimpleNamespace
+from unittest.mock import patch
+
+from github_repo_analyzer.analyzer import AnalyzerFactory
+from github_repo_analyzer import cli as cli_module
+from github_repo_analyzer.cli import (
+    REPO, OUTPUT_FORMAT, _CliExit, _default_config, _iter_report_sections, _plain_dump,
+    _read_repo_list, _run, _run_analysis
+)
+from github_repo_analyzer.types import OutputFormat
+
+
+def test_repo_type_splits_owner_and_name():
+    """Test that repository arguments convert to (owner, name)."""
+    assert REPO.convert("facebook/react", None, None) == ("facebook", "react")
+    assert REPO.convert("owner/name/extra", None, None) == ("owner", "name/extra")
+
+
+@pytest.mark.parametrize("value", ["facebook", "facebook/", "/react", "/"])
+def test_repo_type_rejects_invalid_format(value):
+    """Test that repositories without an owner or a name are rejected."""
+    with pytest.raises(click.BadParameter):
+        REPO.convert(value, None, None)
+
+
+def test_output_format_choice_is_case_insensitive():
+    """Test that output formats convert to OutputFormat regardless of case."""
+    assert OUTPUT_FORMAT.convert("JSON", None, None) == OutputFormat.JSON
+    assert OUTPUT_FORMAT.convert("markdown", None, None) == OutputFormat.MARKDOWN
+    assert OUTPUT_FORMAT.convert(OutputFormat.TEXT, None, None) == OutputFormat.TEXT
+
+    with pytest.raises(click.BadParameter):
+        OUTPUT_FORMAT.convert("xml", None, None)
+
+
+def test_default_config_applies_overrides():
+    """Test that per-command overrides and cache options are applied."""
+    ctx = SimpleNamespace(obj={"no_cache": False, "cache_ttl": 60})
+    config = _default_config(ctx, "token", focus_area="security", max_stories=3)
+
+    assert config.github.token == "token"
+    assert config.github.cache_dir is not None
+    assert config.github.cache_ttl == 60
+    assert config.focus_area == "security"
+    assert config.max_stories == 3
+
+
+def test_create_default_returns_independent_configs():
+    """Test that changing one default config does not affect later ones."""
+    config = AnalyzerFactory.create_default()
+    config.claude.max_turns = 10
+    config.metadata['architecture_only'] = True
+
+    default = AnalyzerFactory.create_default()
+
+    assert default is not config
+    assert default.claude.max_turns == 3
+    assert default.metadata == {}
+
+
+def test_read_repo_list_skips_blanks_and_comments():
+    """Test that batch repository lists ignore blank lines and comments."""
+    lines = ["# frontend\n", "facebook/react\n", "\n", "  vuejs/core  \n"]
+    assert _read_repo_list(lines, None) == [("facebook", "react"), ("vuejs", "core")]
+    
+    with pytest.raises(click.BadParameter, match="line 2"):
+        _read_repo_list(["facebook/react", "react"], None)
+
+
+def test_iter_report_sections_splits_at_headers():
+    """Test that report sections start at each header and are produced lazily."""
+    report = "intro\n# One\na\n# Two\nb\nc\n"
+    assert list(_iter_report_sections(report)) == [["intro"], ["# One", "a"], ["# Two", "b", "c"]]
+    assert list(_iter_report_sections("# Only\n# Next")) == [["# Only"], ["# Next"]]
+    assert list(_iter_report_sections("\n# One")) == [[""], ["# One"]]
+    assert list(_iter_report_sections("")) == []
+
+
+def test_plain_dump_flushes_markup_first_and_skips_parsing():
+    """Test that plain lines follow pending markup lines and are written verbatim."""
+    output = io.StringIO()
+    console = Console(file=output, width=40)
+    pending = ["[bold]Services:[/bold]"]
+    
+    _plain_dump(console, pending, ["   • [red]", "   • " + "x" * 60])
+    
+    assert pending == []
+    assert output.getvalue() == "Services:\n   • [red]\n   • " + "x" * 60 + "\n"
+
+
+def test_cli_exit_closes_resources_before_exiting():
+    """Test that _CliExit unwinds async context managers before the process exits."""
+    events = []
+    
+    class Resource:
+        async def __aenter__(self):
+            return self
+        
+        async def __aexit__(self, *exc_info):
+            events.append("closed")
+    
+    async def command():
+        async with Resource():
+            raise _CliExit("failed", code=2)
+    
+    with pytest.raises(SystemExit) as exc_info:
+        _run(command())
+    
+    assert exc_info.value.code == 2
+    assert events == ["closed"]
+
+
+def test_command_errors_are_reported_with_exit_status():
+    """Test that unexpected command errors print a message and exit with status 1."""
+    with patch.object(cli_module, "_default_config", side_effect=RuntimeError("boom")):
+        result = CliRunner().invoke(cli_module.cli, ["info", "octocat/hello-world"])
+    
+    assert result.exit_code == 1
+    assert "Error: boom" in result.output
+
+
+def test_run_analysis_finishes_save_when_display_fails(tmp_path):
+    """Test that the background save is awaited even if displaying results fails."""
+    events = []
+    
+    class FakeAnalyzer:
+        def __init__(self, config):
+            pass
+        
+        async def __aenter__(self):
+            return self
+        
+        async def __aexit__(self, *exc_info):
+            events.append("closed")
+        
+        async def _fetch_repository_and_research(self, owner, repo_name):
+            return "repo-info", []
+        
+        async def _analyze_with_claude(self, repo_info, web_results):
+            return "result"
+        
+        async def _save_output(self, result):
+            # Still running when the display fails
+            await asyncio.sleep(0.05)
+            events.append("saved")
+    
+    config = replace(AnalyzerFactory.create_default(), output_file=str(tmp_path / "out.json"))
+    with patch.object(cli_module, "GitHubRepoAnalyzer", FakeAnalyzer), \
+            patch.object(cli_module, "_display_analysis_results", side_effect=RuntimeError("boom")):
+        with pytest.raises(_CliExit):
+            asyncio.run(_run_analysis("octo", "repo", config))
+    
+    assert events == ["saved", "closed"]
+
+
+@pytest.mark.skipif(sys.version_info < (3, 11), reason="asyncio.Runner requires Python 3.11")
+def test_commands_share_one_event_loop():
+    """Test that consecutive command coroutines run on the same loop."""
+    async def running_loop():
+        return asyncio.get_running_loop()
+    
+    assert _run(running_loop()) is _run(running_loop())
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
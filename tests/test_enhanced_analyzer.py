@@ -0,0 +1,324 @@
+"""
+Tests for the comprehensive repository analysis.
+"""
+
+import asyncio
+import json
+from datetime import datetime
+
+import anyio
+import pytest
+from claude_code_sdk import AssistantMessage, ProcessError, TextBlock
+from unittest.mock import patch
+
+from github_repo_analyzer.enhanced_analyzer import EnhancedClaudeAnalyzer
+from github_repo_analyzer.types import (
+    AnalysisResult, ClaudeConfig, RepositoryInfo, StoryEffort, StoryPriority
+)
+
+
+@pytest.fixture
+def analyzer():
+    """Create an EnhancedClaudeAnalyzer with default configuration."""
+    return EnhancedClaudeAnalyzer(ClaudeConfig())
+
+
+def make_repo_info(name="hello-world"):
+    """Create repository information for the given repository name."""
+    return RepositoryInfo(
+        owner="octocat", name=name, full_name=f"octocat/{name}",
+        description="Greets", language="Python", stars=1, forks=0,
+        topics=["cli"], readme_content=None, license="MIT",
+        created_at=datetime(2020, 1, 1), updated_at=datetime(2024, 6, 1),
+        size=10, default_branch="main"
+    )
+
+
+def make_result(repo_info):
+    """Create an analysis result without stories."""
+    return AnalysisResult(
+        repository=repo_info, user_stories=[], analysis_date=datetime(2024, 6, 2),
+        focus_area=None, tech_stack=[], key_features=[], target_users=[]
+    )
+
+
+def test_comprehensive_analysis_runs_queries_concurrently(analyzer):
+    """Test that the user story and technical queries overlap."""
+    repo_info = make_repo_info()
+    enhanced_started = anyio.Event()
+
+    async def fake_basic(repo_info, web_results, focus_area, max_stories):
+        # Only completes if the enhanced query starts while this one waits
+        with anyio.fail_after(1):
+            await enhanced_started.wait()
+        return make_result(repo_info)
+
+    async def fake_enhanced(repo_info, include_architecture, include_api_analysis):
+        enhanced_started.set()
+        return {"comprehensive_report": "# Report"}
+
+    analyzer._generate_basic_analysis = fake_basic
+    analyzer._perform_enhanced_analysis = fake_enhanced
+
+    result = asyncio.run(analyzer.analyze_repository_comprehensive(repo_info, []))
+
+    assert result.comprehensive_report == "# Report"
+
+
+def test_comprehensive_analysis_reraises_query_errors(analyzer):
+    """Test that a failing query raises its own exception, not an exception group."""
+    repo_info = make_repo_info()
+
+    async def fake_basic(repo_info, web_results, focus_area, max_stories):
+        return make_result(repo_info)
+
+    async def fake_enhanced(repo_info, include_architecture, include_api_analysis):
+        raise ValueError("boom")
+
+    analyzer._generate_basic_analysis = fake_basic
+    analyzer._perform_enhanced_analysis = fake_enhanced
+
+    with pytest.raises(ValueError, match="boom"):
+        asyncio.run(analyzer.analyze_repository_comprehensive(repo_info, []))
+
+
+def test_analysis_date_comes_from_clock():
+    """Test that analyses are stamped with the injected clock."""
+    run_date = datetime(2024, 6, 3, 12, 0)
+    analyzer = EnhancedClaudeAnalyzer(ClaudeConfig(), clock=lambda: run_date)
+
+    async def fake_generate_user_stories(prompt, options, max_stories):
+        return []
+
+    analyzer._generate_user_stories = fake_generate_user_stories
+    result = asyncio.run(analyzer._generate_basic_analysis(make_repo_info(), [], None, 3))
+
+    assert result.analysis_date == run_date
+
+
+def test_comprehensive_analysis_fails_fast(analyzer):
+    """Test that a failed user story query cancels the running enhanced analysis."""
+    cancelled = []
+
+    async def failing_basic(*args):
+        raise ValueError("boom")
+
+    async def slow_enhanced(*args):
+        try:
+            await asyncio.sleep(60)
+        except asyncio.CancelledError:
+            cancelled.append(True)
+            raise
+
+    analyzer._generate_basic_analysis = failing_basic
+    analyzer._perform_enhanced_analysis = slow_enhanced
+
+    async def run():
+        with anyio.fail_after(5):
+            await analyzer.analyze_repository_comprehensive(make_repo_info(), [])
+
+    with pytest.raises(ValueError, match="boom"):
+        asyncio.run(run())
+    assert cancelled == [True]
+
+
+def test_analyze_many_bounds_concurrency_and_keeps_order(analyzer):
+    """Test that analyze_many limits running analyses and returns failures in place."""
+    running = 0
+    peak = 0
+
+    async def fake_comprehensive(repo_info, web_results, **kwargs):
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        await asyncio.sleep(0.01)
+        running -= 1
+        if repo_info.name == "broken":
+            raise ValueError("boom")
+        return make_result(repo_info)
+
+    analyzer.analyze_repository_comprehensive = fake_comprehensive
+    repos = [make_repo_info(name) for name in ("a", "broken", "c", "d", "e")]
+
+    results = asyncio.run(analyzer.analyze_many(repos, max_concurrency=2))
+
+    assert peak == 2
+    assert [r.repository.name for r in results if not isinstance(r, Exception)] == ["a", "c", "d", "e"]
+    assert isinstance(results[1], ValueError)
+
+
+def test_fallback_uses_built_in_analysis_for_known_repositories(analyzer):
+    """Test that known repositories get their built-in analysis and others the generic one."""
+    excalidraw = analyzer._generate_fallback_enhanced_analysis(make_repo_info("Excalidraw"))
+    assert "Excalidraw" in excalidraw["comprehensive_report"]
+
+    generic = analyzer._generate_fallback_enhanced_analysis(make_repo_info("react-router"))
+    assert generic["comprehensive_report"].startswith("# Technical Analysis: octocat/react-router")
+
+
+def test_built_in_analysis_requires_exact_repository_name(analyzer):
+    """Test that names merely containing a known repository name are not canned."""
+    assert analyzer._canned_enhanced_analysis(make_repo_info("obsidian-excalidraw-plugin")) is None
+
+    fallback = analyzer._generate_fallback_enhanced_analysis(make_repo_info("obsidian-excalidraw-plugin"))
+    assert fallback["comprehensive_report"].startswith(
+        "# Technical Analysis: octocat/obsidian-excalidraw-plugin"
+    )
+
+
+def test_enhanced_analysis_skips_claude_for_built_in_repositories(analyzer):
+    """Test that repositories with a built-in analysis never build a prompt or query Claude."""
+    def fail(*args, **kwargs):
+        raise AssertionError("Claude should not be used")
+
+    analyzer._build_enhanced_analysis_prompt = fail
+    with patch("github_repo_analyzer.enhanced_analyzer.query", fail):
+        results = asyncio.run(analyzer._perform_enhanced_analysis(make_repo_info("excalidraw"), True, True))
+
+    assert "Excalidraw" in results["comprehensive_report"]
+
+
+def test_excalidraw_analyses_are_independent(analyzer):
+    """Test that changing one Excalidraw analysis does not affect later ones."""
+    first = analyzer._generate_excalidraw_architecture(make_repo_info("excalidraw"))
+    first["api_analysis"].endpoints.append({"method": "GET", "path": "/extra"})
+    first["technical_deep_dive"].technology_stack["frontend"].append("Extra")
+
+    second = analyzer._generate_excalidraw_architecture(make_repo_info("excalidraw"))
+
+    assert {"method": "GET", "path": "/extra"} not in second["api_analysis"].endpoints
+    assert "Extra" not in second["technical_deep_dive"].technology_stack["frontend"]
+    assert second["comprehensive_report"] == first["comprehensive_report"]
+
+
+def test_basic_prompt_truncates_and_skips_blank_readme(analyzer):
+    """Test that long READMEs are cut to 2000 characters and blank ones are left out."""
+    repo_info = make_repo_info()
+
+    repo_info.readme_content = "x" * 2500
+    prompt = analyzer._build_basic_analysis_prompt(repo_info, [])
+    assert f"README Content:\n{'x' * 2000}...\n" in prompt
+
+    repo_info.readme_content = "Short readme"
+    assert "README Content:\nShort readme\n" in analyzer._build_basic_analysis_prompt(repo_info, [])
+
+    repo_info.readme_content = "  \n "
+    assert "README Content" not in analyzer._build_basic_analysis_prompt(repo_info, [])
+
+
+def test_extract_json_ignores_braces_after_the_object(analyzer):
+    """Test that commentary after the JSON object does not break parsing."""
+    text = 'Here you go:\n{"user_stories": [{"title": "Greet"}]}\nUse {name} to customise.'
+
+    assert analyzer._extract_json_from_text(text) == {"user_stories": [{"title": "Greet"}]}
+    assert analyzer._extract_json_from_text("No JSON here") is None
+    assert analyzer._extract_json_from_text('{"user_stories": [') is None
+
+
+def test_enhanced_analysis_stops_once_complete(analyzer):
+    """Test that the Claude stream is closed once every part of the analysis arrived."""
+    parts = [
+        {"system_architecture": {}, "api_analysis": {}},
+        {"technical_deep_dive": {}, "comprehensive_report": "# Report"},
+        {"comprehensive_report": "# Later"},
+    ]
+    consumed = []
+    closed = []
+
+    async def fake_query(prompt, options):
+        try:
+            for i, part in enumerate(parts):
+                consumed.append(i)
+                yield AssistantMessage(content=[TextBlock(text=json.dumps(part))], model="test")
+        finally:
+            closed.append(True)
+
+    with patch("github_repo_analyzer.enhanced_analyzer.query", fake_query):
+        results = asyncio.run(analyzer._perform_enhanced_analysis(make_repo_info(), True, True))
+
+    assert results["comprehensive_report"] == "# Report"
+    assert consumed == [0, 1]
+    assert closed == [True]
+
+
+def test_generate_user_stories_stops_at_max_stories(analyzer):
+    """Test that stories from several responses fill up to max_stories and then stop the stream."""
+    responses = [
+        [{"title": "Story 0"}, "not a story", {"title": "Story 1"}],
+        [{"title": "Story 2"}, {"title": "Story 3"}],
+        [{"title": "Story 4"}],
+    ]
+    consumed = []
+
+    async def fake_query(prompt, options):
+        for i, stories in enumerate(responses):
+            consumed.append(i)
+            text = json.dumps({"user_stories": stories})
+            yield AssistantMessage(content=[TextBlock(text=text)], model="test")
+
+    with patch("github_repo_analyzer.enhanced_analyzer.query", fake_query):
+        user_stories = asyncio.run(
+            analyzer._generate_user_stories("prompt", analyzer._options, max_stories=3)
+        )
+
+    assert [(story.id, story.title) for story in user_stories] == [
+        (1, "Story 0"), (2, "Story 1"), (3, "Story 2")
+    ]
+    assert consumed == [0, 1]
+
+
+def test_enhanced_analysis_falls_back_only_on_query_errors(analyzer):
+    """Test that Claude failures give the fallback analysis and other errors propagate."""
+    error = ProcessError("CLI exited")
+
+    async def fake_query(prompt, options):
+        raise error
+        yield
+
+    with patch("github_repo_analyzer.enhanced_analyzer.query", fake_query):
+        results = asyncio.run(analyzer._perform_enhanced_analysis(make_repo_info(), True, True))
+        assert results["comprehensive_report"].startswith("# Technical Analysis: octocat/hello-world")
+
+        # A separate class before Python 3.11
+        error = asyncio.TimeoutError()
+        results = asyncio.run(analyzer._perform_enhanced_analysis(make_repo_info(), True, True))
+        assert results["comprehensive_report"].startswith("# Technical Analysis: octocat/hello-world")
+
+        error = RuntimeError("bug")
+        with pytest.raises(RuntimeError, match="bug"):
+            asyncio.run(analyzer._perform_enhanced_analysis(make_repo_info(), True, True))
+
+
+def test_malformed_analysis_sections_are_skipped(analyzer):
+    """Test that sections of the wrong type are ignored rather than raising."""
+    text = json.dumps({"system_architecture": "none", "api_analysis": [], "comprehensive_report": "# R"})
+
+    assert analyzer._extract_enhanced_analysis(text) == {"comprehensive_report": "# R"}
+
+
+def test_parse_user_story_falls_back_to_medium(analyzer):
+    """Test that known priority and effort values are kept and others become Medium."""
+    story = analyzer._parse_user_story({"title": "Export", "priority": "High", "effort": "Small"}, 1)
+    assert story.priority == StoryPriority.HIGH
+    assert story.effort == StoryEffort.SMALL
+
+    story = analyzer._parse_user_story({"title": "Export", "priority": "high", "effort": "EXTRA LARGE"}, 1)
+    assert story.priority == StoryPriority.HIGH
+    assert story.effort == StoryEffort.EXTRA_LARGE
+
+    story = analyzer._parse_user_story({"title": "Export", "priority": "urgent", "effort": ["big"]}, 1)
+    assert story.priority == StoryPriority.MEDIUM
+    assert story.effort == StoryEffort.MEDIUM
+
+
+def test_parse_user_story_keeps_only_string_criteria(analyzer):
+    """Test that non-string acceptance criteria are dropped."""
+    story = analyzer._parse_user_story({"acceptance_criteria": ["Saves", "Loads"]}, 1)
+    assert [c.description for c in story.acceptance_criteria] == ["Saves", "Loads"]
+
+    story = analyzer._parse_user_story({"acceptance_criteria": ["Saves", {"text": "x"}, 3]}, 1)
+    assert [c.description for c in story.acceptance_criteria] == ["Saves"]
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
@@ -0,0 +1,160 @@
+"""
+Tests for the GitHub API client.
+"""
+
+import asyncio
+
+import pytest
+from unittest.mock import MagicMock, Mock
+
+from github_repo_analyzer.github_client import GitHubClient
+from github_repo_analyzer.exceptions import RateLimitError, RepositoryNotFoundError
+from github_repo_analyzer.types import GitHubConfig
+
+
+GRAPHQL_REPOSITORY = {
+    "nameWithOwner": "octocat/hello-world",
+    "description": "My first repository",
+    "primaryLanguage": {"name": "Python"},
+    "stargazerCount": 42,
+    "forkCount": 7,
+    "repositoryTopics": {"nodes": [{"topic": {"name": "cli"}}, {"topic": {"name": "demo"}}]},
+    "licenseInfo": {"name": "MIT License"},
+    "createdAt": "2020-01-02T03:04:05Z",
+    "updatedAt": "2024-06-01T00:00:00Z",
+    "diskUsage": 128,
+    "defaultBranchRef": {"name": "main"},
+    "readmeMd": None,
+    "readmeLower": None,
+    "readmeRst": {"text": "Hello\n=====\n"},
+    "readmePlain": None,
+}
+
+
+def make_client(payload, status_code=200):
+    """Create a token-authenticated client whose GraphQL POST returns payload."""
+    client = GitHubClient(GitHubConfig(token="test-token"))
+    client.session.post = Mock(return_value=Mock(
+        status_code=status_code, headers={}, text="", json=Mock(return_value=payload)
+    ))
+    client.session.get = Mock()
+    return client
+
+
+def test_rate_limit_errors_carry_github_hints():
+    """Test that exhausted quotas and Retry-After waits are reported on the error."""
+    exhausted = make_client({})
+    exhausted.session.post.return_value.status_code = 403
+    exhausted.session.post.return_value.headers = {"X-RateLimit-Remaining": "0"}
+    with pytest.raises(RateLimitError) as excinfo:
+        exhausted.get_repository_info("octocat", "hello-world")
+    assert excinfo.value.exhausted
+
+    secondary = make_client({})
+    secondary.session.post.return_value.status_code = 429
+    secondary.session.post.return_value.headers = {"Retry-After": "30"}
+    secondary.session.post.return_value.text = "secondary rate limit"
+    with pytest.raises(RateLimitError) as excinfo:
+        secondary.get_repository_info("octocat", "hello-world")
+    assert not excinfo.value.exhausted
+    assert excinfo.value.retry_after == 30.0
+
+
+def test_get_repository_info_uses_single_graphql_request():
+    """Test that a token-authenticated client fetches everything in one request."""
+    client = make_client({"data": {"repository": GRAPHQL_REPOSITORY}})
+
+    repo_info = client.get_repository_info("octocat", "hello-world")
+
+    assert repo_info.full_name == "octocat/hello-world"
+    assert repo_info.language == "Python"
+    assert repo_info.stars == 42
+    assert repo_info.topics == ["cli", "demo"]
+    assert repo_info.license == "MIT License"
+    assert repo_info.readme_content == "Hello\n=====\n"
+    assert repo_info.size == 128
+    assert repo_info.created_date == "2020-01-02"
+    assert client.session.post.call_count == 1
+    assert client.session.post.call_args.args[0] == "https://api.github.com/graphql"
+    client.session.get.assert_not_called()
+
+
+def test_get_repository_info_falls_back_to_rest_readme():
+    """Test that READMEs not covered by the GraphQL aliases are fetched from REST."""
+    repository = dict(GRAPHQL_REPOSITORY, readmeRst=None)
+    client = make_client({"data": {"repository": repository}})
+    client.get_readme = Mock(return_value="# Hello")
+
+    repo_info = client.get_repository_info("octocat", "hello-world")
+
+    assert repo_info.readme_content == "# Hello"
+    client.get_readme.assert_called_once_with("octocat", "hello-world")
+
+
+def test_get_repository_info_graphql_not_found():
+    """Test that a GraphQL NOT_FOUND error raises RepositoryNotFoundError."""
+    client = make_client({
+        "data": {"repository": None},
+        "errors": [{"type": "NOT_FOUND", "message": "Could not resolve to a Repository"}],
+    })
+
+    with pytest.raises(RepositoryNotFoundError):
+        client.get_repository_info("octocat", "missing")
+
+
+def test_graphql_url_for_enterprise():
+    """Test that GitHub Enterprise REST URLs map to the GraphQL endpoint."""
+    client = GitHubClient(GitHubConfig(base_url="https://ghe.example.com/api/v3"))
+    assert client._graphql_url() == "https://ghe.example.com/api/graphql"
+
+
+def test_get_repository_info_without_token_uses_rest():
+    """Test that unauthenticated clients fall back to the REST API."""
+    client = GitHubClient(GitHubConfig())
+    assert not client.uses_graphql
+
+
+def test_get_readme_preview_reads_at_most_max_bytes():
+    """Test that the README preview stops reading at max_bytes."""
+    client = GitHubClient(GitHubConfig())
+    response = MagicMock(status_code=200)
+    response.__enter__.return_value = response
+    content = "# Título\n".encode("utf-8") + b"x" * 10000
+    response.raw.read.side_effect = lambda n, decode_content: content[:n]
+    client.session.get = Mock(return_value=response)
+
+    preview = client.get_readme_preview("octocat", "hello-world", max_bytes=4)
+
+    # The cut falls inside the two-byte "í", which is dropped
+    assert preview == "# T"
+    response.raw.read.assert_called_once_with(4, decode_content=True)
+    assert client.session.get.call_args.kwargs["headers"]["Range"] == "bytes=0-3"
+
+
+def test_rate_limit_info_is_cached_briefly():
+    """Test that rate limit status is reused instead of re-requested."""
+    client = GitHubClient(GitHubConfig())
+    client.session.get = Mock(return_value=Mock(status_code=200, json=lambda: {"rate": {}}))
+
+    assert client.get_rate_limit_info() == {"rate": {}}
+    assert asyncio.run(client.get_rate_limit_info_async()) == {"rate": {}}
+    assert client.session.get.call_count == 1
+
+
+def test_reused_sessions_are_shared_and_left_open():
+    """Test that clients with reuse_session share one session that close() keeps open."""
+    config = GitHubConfig(token="shared-token", reuse_session=True)
+    first = GitHubClient(config)
+    second = GitHubClient(config)
+    other = GitHubClient(GitHubConfig(token="other-token", reuse_session=True))
+
+    assert first.session is second.session
+    assert other.session is not first.session
+
+    first.session.close = Mock()
+    first.close()
+    first.session.close.assert_not_called()
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
@@ -0,0 +1,82 @@
+"""
+Tests for the on-disk GitHub response cache.
+"""
+
+import pytest
+from unittest.mock import Mock
+
+from github_repo_analyzer.github_client import GitHubClient
+from github_repo_analyzer.http_cache import ETagCache
+from github_repo_analyzer.types import GitHubConfig
+
+
+def make_response(status_code, text="", etag=None):
+    """Create a mock requests response."""
+    response = Mock(status_code=status_code, text=text)
+    response.headers = {"ETag": etag} if etag else {}
+    return response
+
+
+def make_client(tmp_path, ttl):
+    """Create a GitHubClient with a cache in tmp_path and a mocked session."""
+    client = GitHubClient(GitHubConfig(cache_dir=str(tmp_path), cache_ttl=ttl))
+    client.session.get = Mock()
+    return client
+
+
+def test_fresh_entries_skip_the_request(tmp_path):
+    """Test that a cached response within the TTL is served without a request."""
+    client = make_client(tmp_path, ttl=300)
+    client.session.get.return_value = make_response(200, '{"name": "repo"}', etag='"abc"')
+
+    assert client._get("https://api.github.com/repos/o/r").status_code == 200
+    cached = client._get("https://api.github.com/repos/o/r")
+
+    assert cached.status_code == 200
+    assert cached.json() == {"name": "repo"}
+    assert client.session.get.call_count == 1
+
+
+def test_stale_entries_are_revalidated(tmp_path):
+    """Test that stale entries send If-None-Match and reuse the body on 304."""
+    client = make_client(tmp_path, ttl=0)
+    client.session.get.side_effect = [
+        make_response(200, '{"name": "repo"}', etag='"abc"'),
+        make_response(304),
+    ]
+
+    client._get("https://api.github.com/repos/o/r")
+    revalidated = client._get("https://api.github.com/repos/o/r")
+
+    assert revalidated.json() == {"name": "repo"}
+    assert client.session.get.call_args.kwargs["headers"] == {"If-None-Match": '"abc"'}
+
+
+def test_cache_key_depends_on_credentials():
+    """Test that different tokens do not share cache entries."""
+    url = "https://api.github.com/repos/o/r"
+    assert ETagCache.key(url, None, "json", "token a") != ETagCache.key(url, None, "json", "token b")
+    assert ETagCache.key(url, None, "json", "token a") == ETagCache.key(url, {}, "json", "token a")
+
+
+def test_cache_disabled_by_default():
+    """Test that the client makes plain requests without a cache directory."""
+    client = GitHubClient(GitHubConfig())
+    assert client.http_cache is None
+
+
+def test_entries_are_private_to_the_user(tmp_path):
+    """Test that cached responses are only readable by their owner."""
+    cache_dir = tmp_path / "http"
+    cache = ETagCache(cache_dir)
+    key = ETagCache.key("https://api.github.com/repos/o/r")
+    cache.set(key, '"abc"', '{"private": true}')
+
+    assert cache.get(key)["body"] == '{"private": true}'
+    assert cache_dir.stat().st_mode & 0o777 == 0o700
+    assert [p.name for p in cache_dir.iterdir()] == [f"{key}.json"]
+    assert (cache_dir / f"{key}.json").stat().st_mode & 0o777 == 0o600
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
@@ -0,0 +1,114 @@
+"""
+Tests for formatting and saving analysis results.
+"""
+
+import asyncio
+import io
+import json
+import os
+from datetime import datetime
+from pathlib import Path
+
+import pytest
+
+from github_repo_analyzer.output_formatter import OutputFormatter
+from github_repo_analyzer.types import (
+    AnalysisResult, OutputFormat, RepositoryInfo, UserStory, AcceptanceCriterion,
+    StoryPriority, StoryEffort
+)
+
+
+@pytest.fixture
+def result():
+    """Create a small analysis result."""
+    repo_info = RepositoryInfo(
+        owner="octocat", name="hello-world", full_name="octocat/hello-world",
+        description="Café tooling", language="Python", stars=1, forks=0,
+        topics=["cli"], readme_content=None, license="MIT",
+        created_at=datetime(2020, 1, 1), updated_at=datetime(2024, 6, 1),
+        size=10, default_branch="main"
+    )
+    story = UserStory(
+        id=1, title="Greet", description="As a user, I want a greeting",
+        acceptance_criteria=[AcceptanceCriterion("Says hello")],
+        priority=StoryPriority.HIGH, effort=StoryEffort.SMALL, tags=["cli"]
+    )
+    return AnalysisResult(
+        repository=repo_info, user_stories=[story], analysis_date=datetime(2024, 6, 2),
+        focus_area=None, tech_stack=["cli"], key_features=["Greet"], target_users=["user"]
+    )
+
+
+def test_json_output_matches_formatted_content(result, tmp_path):
+    """Test that saved JSON matches the formatted output and keeps non-ASCII text."""
+    formatter = OutputFormatter(OutputFormat.JSON)
+    path = tmp_path / "result.json"
+    formatter.save_to_file(result, path)
+
+    content = path.read_text(encoding="utf-8")
+    assert content == formatter.format_analysis_result(result)
+    assert "Café tooling" in content
+    assert json.loads(content)["user_stories"][0]["priority"] == "High"
+
+
+@pytest.mark.parametrize("output_format", list(OutputFormat))
+def test_stream_matches_formatted_content(result, output_format):
+    """Test that streaming writes exactly the formatted content."""
+    formatter = OutputFormatter(output_format)
+    buffer = io.StringIO()
+    formatter.stream(result, buffer)
+    assert buffer.getvalue() == formatter.format_analysis_result(result)
+
+
+@pytest.mark.parametrize("output_format", [OutputFormat.JSON, OutputFormat.MARKDOWN])
+def test_save_to_file_async_matches_sync(result, tmp_path, output_format):
+    """Test that the async save writes the same content as the sync save."""
+    formatter = OutputFormatter(output_format)
+    sync_path = tmp_path / "sync.out"
+    async_path = tmp_path / "async.out"
+
+    formatter.save_to_file(result, sync_path)
+    asyncio.run(formatter.save_to_file_async(result, async_path))
+
+    assert async_path.read_bytes() == sync_path.read_bytes()
+
+
+def test_failed_save_keeps_previous_file(result, tmp_path, monkeypatch):
+    """Test that a formatter error leaves the existing report untouched."""
+    formatter = OutputFormatter(OutputFormat.MARKDOWN)
+    path = tmp_path / "report.md"
+    path.write_text("previous report", encoding="utf-8")
+
+    def broken_lines(result):
+        yield "# Partial"
+        raise ValueError("bad story")
+
+    monkeypatch.setattr(formatter, "_iter_markdown_lines", broken_lines)
+    with pytest.raises(IOError, match="bad story"):
+        formatter.save_to_file(result, path)
+
+    assert path.read_text(encoding="utf-8") == "previous report"
+    assert [p.name for p in tmp_path.iterdir()] == ["report.md"]
+
+
+def test_json_save_replaces_file_atomically(result, tmp_path, monkeypatch):
+    """Test that JSON output is written to a temporary file and moved into place."""
+    formatter = OutputFormatter(OutputFormat.JSON)
+    path = tmp_path / "result.json"
+    path.write_text("previous", encoding="utf-8")
+    replaced = []
+    real_replace = os.replace
+
+    def record_replace(src, dst):
+        replaced.append((Path(src).parent, Path(dst)))
+        real_replace(src, dst)
+
+    monkeypatch.setattr(os, "replace", record_replace)
+    asyncio.run(formatter.save_to_file_async(result, path))
+
+    assert replaced == [(tmp_path, path)]
+    assert json.loads(path.read_text(encoding="utf-8"))["user_stories"][0]["title"] == "Greet"
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
@@ -0,0 +1,44 @@
+"""
+Tests for client-side rate limiting.
+"""
+
+import asyncio
+
+import pytest
+from unittest.mock import patch
+
+from github_repo_analyzer.rate_limiter import TokenBucket
+
+
+def test_token_bucket_allows_burst_up_to_capacity():
+    """Test that a full bucket serves a burst without waiting."""
+    async def run():
+        bucket = TokenBucket(rate=1, capacity=3)
+        with patch("github_repo_analyzer.rate_limiter.asyncio.sleep") as sleep:
+            for _ in range(3):
+                await bucket.acquire()
+            sleep.assert_not_called()
+    
+    asyncio.run(run())
+
+
+def test_token_bucket_waits_when_empty():
+    """Test that acquiring from an empty bucket waits for a refill."""
+    clock = [100.0]
+    
+    async def fake_sleep(seconds):
+        clock[0] += seconds
+    
+    async def run():
+        with patch("github_repo_analyzer.rate_limiter.time.monotonic", lambda: clock[0]):
+            bucket = TokenBucket(rate=2, capacity=1)
+            await bucket.acquire()
+            with patch("github_repo_analyzer.rate_limiter.asyncio.sleep", fake_sleep):
+                await bucket.acquire()
+    
+    asyncio.run(run())
+    assert clock[0] == pytest.approx(100.5)
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])